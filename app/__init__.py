@@ -34,12 +34,18 @@ def create_app(config_class=config.Config):
     app = flask.Flask(__name__)
     app.config.from_object(config_class)
 
+    from app.models.common import json_cache
+    app.json_encoder = json_cache.JSONEncoder
+
     db.init_app(app)
     migrate.init_app(app, db)
     cors.init_app(app)
     flask_uploads.configure_uploads(app, photos)
     jwt.init_app(app)
 
+    from app import profiling
+    profiling.init_app(app)
+
     from app.security import utils as security_utils
     from app import auth
     # from app import site
@@ -55,6 +61,9 @@ def create_app(config_class=config.Config):
     from app.api import options
     from app.api import grades
     from app.api import grade_requirement_groups
+    from app.api import locations
+    from app.api import autocomplete
+    from app import internal
 
     security_utils.protect_blueprint(colleges.bp)
     app.register_blueprint(colleges.bp, url_prefix="/api/colleges")
@@ -95,15 +104,29 @@ def create_app(config_class=config.Config):
         grade_requirement_groups.bp,
         url_prefix="/api/grade_requirement_groups")
 
+    security_utils.protect_blueprint(locations.bp)
+    app.register_blueprint(locations.bp, url_prefix="/api/locations")
+
+    security_utils.protect_blueprint(autocomplete.bp)
+    app.register_blueprint(autocomplete.bp, url_prefix="/api/autocomplete")
+
+    security_utils.protect_blueprint(internal.bp)
+    app.register_blueprint(internal.bp, url_prefix="/internal")
+
     app.register_blueprint(auth.bp, url_prefix="/auth")
 
     # app.register_blueprint(site.bp)
 
-    from app.errors import error_404
+    from app.errors import error_404, invalid_cursor, InvalidCursorError
 
     app.register_error_handler(404, error_404)
+    app.register_error_handler(InvalidCursorError, invalid_cursor)
+
+    from app.security import pruning
+    pruning.init_app(app)
 
     return app
 
 
 from app import models
+from app import search
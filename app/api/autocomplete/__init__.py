@@ -0,0 +1,11 @@
+"""Handles typeahead of names
+
+Attributes:
+    bp: Flask blueprint
+"""
+
+import flask
+
+bp = flask.Blueprint("autocomplete", __name__)
+
+from . import routes
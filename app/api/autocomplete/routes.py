@@ -0,0 +1,60 @@
+import flask
+
+from app import autocomplete as autocomplete_module
+from app.api import autocomplete as autocomplete_blueprint
+from app.api import errors
+
+
+@autocomplete_blueprint.bp.route("/", strict_slashes=False)
+def get_autocomplete():
+    """Gets names starting with prefix.
+
+    Names are served from an in memory prefix index, names starting with
+    prefix come first, then names with another word starting with it.
+
+    GET:
+        Request params:
+            kind (string) (required): college, major, question, option or
+            place.
+            prefix (string) (required): name prefix, case insensitive.
+            limit (int) (optional): maximum number of names, defaults to
+            configuration constant AUTOCOMPLETE_LIMIT.
+
+    Responses:
+        200:
+            Successfully retrieves names. id is the college id, the major,
+            question or option id, or the place fips code.
+
+            Example::
+                {
+                    "items": [
+                        {
+                            "id": 1,
+                            "name": "University of Oregon"
+                        }
+                    ]
+                }
+
+            produces:
+                Application/json.
+        400:
+            Invalid kind.
+    """
+    args = flask.request.args
+    config = flask.current_app.config
+    kind = args.get("kind", "", type=str)
+    prefix = args.get("prefix", "", type=str)
+    limit = args.get("limit", config["AUTOCOMPLETE_LIMIT"], type=int)
+
+    if kind not in autocomplete_module.SOURCES:
+        return errors.bad_request(
+            "kind must be one of " + ", ".join(autocomplete_module.SOURCES))
+
+    limit = max(1, min(limit, config["AUTOCOMPLETE_MAX_LIMIT"]))
+
+    return flask.jsonify({
+        "items": [{
+            "id": key,
+            "name": name
+        } for key, name in autocomplete_module.search(kind, prefix, limit)]
+    })
@@ -0,0 +1,169 @@
+"""Bulk create requests.
+
+Bulk endpoints take a JSON array, or a stream of JSON objects one per line
+(NDJSON) when the request content type is application/x-ndjson. Items are
+validated and written in chunks of BULK_CHUNK_SIZE, each chunk in its own
+transaction, and every item gets its own result, so an invalid item
+doesn't reject the rest of the request.
+"""
+import itertools
+import json
+
+import flask
+import sqlalchemy
+
+import app
+
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/jsonl")
+
+
+class BulkRequestError(Exception):
+    """Raised when a bulk request body isn't a JSON array or NDJSON."""
+    pass
+
+
+def iter_items():
+    """Reads items of the request body.
+
+    NDJSON bodies are read from the request stream one line at a time.
+
+    Yields:
+        object: decoded item, None for NDJSON lines that aren't valid JSON.
+
+    Raises:
+        BulkRequestError: JSON body isn't an array.
+    """
+    request = flask.request
+
+    if request.mimetype in NDJSON_MIMETYPES:
+        for line in request.stream:
+            line = line.strip()
+
+            if not line:
+                continue
+
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+        return
+
+    data = request.get_json(silent=True)
+
+    if not isinstance(data, list):
+        raise BulkRequestError("request body must be a JSON array or NDJSON")
+
+    yield from data
+
+
+def chunks(iterable, size):
+    """Splits iterable in lists of at most size items."""
+    iterator = iter(iterable)
+
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def error(index, status, message):
+    """Builds failed item result.
+
+    Args:
+        index (integer): item position in the request.
+        status (integer): item status code.
+        message: error message, or dict of field errors.
+
+    Returns:
+        dict: item result.
+    """
+    return {"index": index, "status": status, "errors": message}
+
+
+def validate(schema, chunk):
+    """Validates chunk of items with schema.
+
+    Args:
+        schema (marshmallow.Schema): item schema.
+        chunk (list): (index, item) tuples.
+
+    Returns:
+        tuple: list of (index, loaded item) tuples of the valid items and
+            list of results of the invalid items.
+    """
+    results, objects = [], []
+
+    for index, item in chunk:
+        if not isinstance(item, dict):
+            results.append(error(index, 400, "item must be a JSON object"))
+        else:
+            objects.append((index, item))
+
+    messages = schema.validate([item for _, item in objects], many=True)
+    valid = [(index, item) for position, (index, item) in enumerate(objects)
+             if position not in messages]
+    results += [
+        error(objects[position][0], 400, message)
+        for position, message in messages.items()
+    ]
+    loaded = schema.load([item for _, item in valid], many=True)
+
+    return [(index, item)
+            for (index, _), item in zip(valid, loaded)], results
+
+
+def create(create_chunk):
+    """Creates the items of the request in chunked transactions.
+
+    Args:
+        create_chunk (function): takes a list of (index, item) tuples,
+            adds the valid items to the session, flushes it and returns the
+            result of every item. The chunk is committed after it returns,
+            or its items fail with 409 if it breaks a unique constraint.
+
+    Returns:
+        flask.Response: item results sorted by index, with created and
+            failed counts. 400 if the request body isn't a JSON array or
+            NDJSON, or has more than BULK_MAX_ITEMS items, in which case
+            the chunks before the limit are still created.
+    """
+    config = flask.current_app.config
+    results = []
+
+    try:
+        items = enumerate(iter_items())
+
+        for chunk in chunks(items, config["BULK_CHUNK_SIZE"]):
+            if chunk[-1][0] >= config["BULK_MAX_ITEMS"]:
+                return flask.jsonify({
+                    "message":
+                    f"more than {config['BULK_MAX_ITEMS']} items",
+                    "results": sorted(results, key=lambda r: r["index"])
+                }), 400
+
+            try:
+                chunk_results = create_chunk(chunk)
+                app.db.session.commit()
+            except sqlalchemy.exc.IntegrityError:
+                # a concurrent request created some of the items.
+                app.db.session.rollback()
+                chunk_results = [
+                    error(index, 409, "conflicts with a concurrent change")
+                    for index, _ in chunk
+                ]
+
+            results += chunk_results
+    except BulkRequestError as err:
+        return flask.jsonify({"message": str(err)}), 400
+
+    created = sum(1 for result in results if result["status"] == 201)
+
+    return flask.jsonify({
+        "created": created,
+        "failed": len(results) - created,
+        "results": sorted(results, key=lambda result: result["index"])
+    })
@@ -3,15 +3,23 @@ import marshmallow
 
 import app
 import re
+from app.api import bulk
 from app.api import colleges as colleges_module
+from app.api import conditional
+from app import geocodes
+from app import search as search_module
 from app import security, utils
 from app.api import errors
+from app.matching import location_index
+from app.models import association_tables
 from app.models import college as college_model
 from app.models import college_details as college_details_model
 from app.models import major as major_model
 from app.models import detail as detail_model
 from app.models import location as location_model
 from app.models import scholarship as scholarship_model
+from app.models.common import bulk_association
+from app.models.common import json_cache
 from app.schemas import college_schema as college_schema_class
 from app.schemas import detail_schema as detail_schema_class
 from app.api import errors
@@ -21,12 +29,18 @@ detail_schema = detail_schema_class.DetailSchema()
 
 
 @colleges_module.bp.route("/", methods=["GET"], strict_slashes=False)
+@conditional.etag(lambda: [
+    college_model.College, college_details_model.CollegeDetails
+])
 def get_colleges():
     """Gets colleges in database
 
     Retrieves paginated list of all colleges from database or colleges that 
     contains the search request parameter if defined.
 
+    Search uses the full text index of college details when the database
+    has one, ranking colleges by relevance, and falls back to matching names.
+
     GET:
         Request params:
             page (int) (optional): Page number in paginated resource, defaults 
@@ -42,6 +56,8 @@ def get_colleges():
 
             produces:
                 Application/json.
+        304:
+            Not modified since the ETag in If-None-Match.
     """
     page = flask.request.args.get("page", 1, type=int)
     per_page = flask.request.args.get(
@@ -49,11 +65,20 @@ def get_colleges():
 
     search = flask.request.args.get("search", "", type=str)
 
-    if search:
+    matches = search_module.match("college", search) if search else None
+
+    if matches is not None:
+        query = college_model.College.query.join(
+            matches, matches.c.owner_id == college_model.College.id).order_by(
+                matches.c.score, college_model.College.id)
+
+        data = college_model.College.to_collection_dict(
+            query, page, per_page, "colleges.get_colleges", search=search)
+    elif search:
         query = college_model.College.query.join(
             college_details_model.CollegeDetails,
-            college_details_model.CollegeDetails.id == college_model.College.
-            id,
+            college_details_model.CollegeDetails.college_id ==
+            college_model.College.id,
             isouter=True).filter(
                 college_details_model.CollegeDetails.name.like(f"%{search}%"))
 
@@ -128,7 +153,101 @@ def post_college():
     }), 201
 
 
+def _create_colleges(chunk):
+    items, results = bulk.validate(college_schema, chunk)
+    CollegeDetails = college_details_model.CollegeDetails
+    names = [item["name"] for _, item in items]
+    existing = {
+        name
+        for name, in app.db.session.query(CollegeDetails.name).filter(
+            CollegeDetails.name.in_(names))
+    }
+    created = []
+
+    for index, item in items:
+        if item["name"] in existing:
+            results.append(
+                bulk.error(index, 400,
+                           f"college '{item['name']}' already exists"))
+            continue
+
+        existing.add(item["name"])
+        college_details = CollegeDetails(**{
+            field: item[field]
+            for field in CollegeDetails.ATTR_FIELDS if field in item
+        })
+        college = college_model.College(college_details=college_details)
+        app.db.session.add(college)
+        created.append((index, college))
+
+    app.db.session.flush()
+
+    return results + [{
+        "index": index,
+        "status": 201,
+        "college": flask.url_for("colleges.get_college", id=college.id)
+    } for index, college in created]
+
+
+@colleges_module.bp.route("/bulk", methods=["POST"])
+def post_colleges_bulk():
+    """Creates colleges in bulk.
+
+    Validates colleges with CollegeSchema and creates them in chunks of
+    BULK_CHUNK_SIZE, one transaction per chunk.
+
+    Post:
+        Consumes:
+            Application/json, JSON array of colleges.
+            Application/x-ndjson, one college per line.
+
+        Request body:
+            colleges, same as post_college.
+
+            Example::
+                [
+                    {
+                        "name": "example name"
+                    }
+                ]
+    Responses:
+        200:
+            Result of every college, in request order.
+
+            produces:
+                Application/json.
+
+            Example::
+                {
+                    "created": 1,
+                    "failed": 1,
+                    "results": [
+                        {
+                            "index": 0,
+                            "status": 201,
+                            "college": link to get college
+                        },
+                        {
+                            "index": 1,
+                            "status": 400,
+                            "errors": {"name": ["name required"]}
+                        }
+                    ]
+                }
+        400:
+            Request body isn't a JSON array or NDJSON, or has more than
+            BULK_MAX_ITEMS colleges.
+
+            produces:
+                Application/json.
+    """
+    return bulk.create(_create_colleges)
+
+
 @colleges_module.bp.route("/<int:id>", methods=["GET"])
+@conditional.etag(lambda id: [
+    college_model.College, college_details_model.CollegeDetails
+])
 def get_college(id):
     """Gets college.
 
@@ -145,6 +264,9 @@ def get_college(id):
             produces:
                 Application/json.
         
+        304:
+            Not modified since the ETag in If-None-Match.
+
         404:
             College not found, returns message.
 
@@ -152,7 +274,7 @@ def get_college(id):
                 Application/json.
     """
     college = college_model.College.query.get_or_404(id)
-    return flask.jsonify(college.to_dict())
+    return flask.jsonify(json_cache.serialize(college))
 
 
 @colleges_module.bp.route("/<int:id>", methods=["PATCH"])
@@ -267,6 +389,11 @@ def add_majors(id):
         200:
             link to get college majors.
 
+            produces:
+                application/json.
+        400:
+            no data provided or an id is not an integer.
+
             produces:
                 application/json.
         404:
@@ -277,16 +404,23 @@ def add_majors(id):
     """
     data = flask.request.get_json()
 
-    if not data:
+    if not data or not isinstance(data, list):
         return errors.bad_request("no data provided")
 
     college = college_model.College.query.get_or_404(id)
 
-    for major_id in data:
-        major = major_model.Major.get(major_id)
-
-        if major is not None:
-            college.add_major(major)
+    try:
+        major_ids = bulk_association.parse_ids(data)
+    except ValueError:
+        return errors.bad_request("invalid id")
+
+    found = bulk_association.resolve_ids(major_model.Major.query,
+                                         major_model.Major.id, major_ids)
+    table = association_tables.college_major
+    bulk_association.add_links(
+        table.c.college_id, college.id, table.c.major_id,
+        [major_id for major_id in major_ids if major_id in found])
+    app.db.session.commit()
 
     return flask.jsonify({
         "majors": flask.url_for("colleges.get_majors", id=id)
@@ -295,6 +429,9 @@ def add_majors(id):
 
 # read majors
 @colleges_module.bp.route("/<int:id>/majors")
+@conditional.etag(lambda id: [
+    college_model.College, major_model.Major, association_tables.college_major
+])
 def get_majors(id):
     """Gets college majors in database
 
@@ -315,6 +452,8 @@ def get_majors(id):
 
             produces:
                 Application/json.
+        304:
+            Not modified since the ETag in If-None-Match.
     """
     college = college_model.College.query.get_or_404(id)
 
@@ -346,6 +485,11 @@ def remove_majors(id):
         200:
             link to get college majors.
 
+            produces:
+                application/json.
+        400:
+            no data provided or an id is not an integer.
+
             produces:
                 application/json.
         404:
@@ -356,16 +500,20 @@ def remove_majors(id):
     """
     data = flask.request.get_json()
 
-    if not data:
+    if not data or not isinstance(data, list):
         return errors.bad_request("no data provided")
 
     college = college_model.College.query.get_or_404(id)
 
-    for major_id in data:
-        major = major_model.Major.get(major_id)
+    try:
+        major_ids = bulk_association.parse_ids(data)
+    except ValueError:
+        return errors.bad_request("invalid id")
 
-        if major is not None:
-            college.remove_major(major)
+    table = association_tables.college_major
+    bulk_association.remove_links(table.c.college_id, college.id,
+                                  table.c.major_id, major_ids)
+    app.db.session.commit()
 
     return flask.jsonify({
         "majors": flask.url_for("colleges.get_majors", id=id)
@@ -672,6 +820,14 @@ def add_location_requirement(id):
             zip_code=zip_code, blacklist=blacklist)
 
     else:
+        lookup = geocodes.get_lookup()
+
+        if lookup is not None:
+            error = lookup.validate_location(state, county, place)
+
+            if error is not None:
+                return errors.bad_request(error)
+
         location = location_model.Location(
             state=state, county=county, place=place, blacklist=blacklist)
 
@@ -761,6 +917,83 @@ def get_location_requirements(id):
     })
 
 
+@colleges_module.bp.route("/<int:id>/location_requirements/status")
+def get_location_status(id):
+    """
+    Checks if college accepts or blacklists an address.
+
+    GET:
+        Args:
+            id (integer): college id.
+
+        Query params:
+            state (string): student state.
+            county (string): student county.
+            place (string): student place.
+            zip_code (string): student zip code.
+
+    Responses:
+        200:
+            Returns accepted and blacklisted flags. A college without
+            accepted locations accepts every address not blacklisted.
+
+            Produces:
+                Application/json.
+
+            Example::
+                {
+                    "accepted": true,
+                    "blacklisted": false
+                }
+
+        404:
+            college not found.
+
+            Produces:
+                Application/json.
+    """
+    college_model.College.query.get_or_404(id)
+
+    return flask.jsonify(
+        location_index.status(
+            location_index.COLLEGE, id,
+            location_index.address_from_args(flask.request.args)))
+
+
+@colleges_module.bp.route("/location_requirements/accepting")
+def get_colleges_accepting_location():
+    """
+    Gets colleges accepting an address.
+
+    GET:
+        Query params:
+            state (string): student state.
+            county (string): student county.
+            place (string): student place.
+            zip_code (string): student zip code.
+
+    Responses:
+        200:
+            Returns ids of the colleges whose accepted locations cover the
+            address and ids of the colleges excluding it, either by
+            blacklist or by not accepting it. Colleges with no
+            location requirements are in neither list.
+
+            Produces:
+                Application/json.
+
+            Example::
+                {
+                    "accepted": [college id, ...],
+                    "excluded": [college id, ...]
+                }
+    """
+    return flask.jsonify(
+        location_index.accepting(
+            location_index.COLLEGE,
+            location_index.address_from_args(flask.request.args)))
+
+
 @colleges_module.bp.route("/<int:id>/scholarships")
 def get_scholarships(id):
     """Gets college scholarships in database
@@ -0,0 +1,95 @@
+"""Conditional GET responses.
+
+GET views declare the models and tables their response is built from.
+Before the view runs, the committed versions of those tables, bumped by
+every transaction writing them, are read with one primary key lookup. They
+and the request path and params make the strong ETag of the response, and
+the latest commit to one of the tables is its Last-Modified. Requests with
+a matching If-None-Match, or with an If-Modified-Since not older than
+Last-Modified and no If-None-Match, get 304 Not Modified without running the
+view.
+
+Inserts, updates and deletes, linking rows included, change the version of
+the table they write, so the cost of a conditional GET doesn't depend on
+the size of the tables.
+"""
+import functools
+import hashlib
+
+import flask
+from werkzeug import http
+
+from app.models import table_version as table_version_model
+
+
+def version(sources):
+    """Gets version of the tables of sources.
+
+    Args:
+        sources (list): models or tables.
+
+    Returns:
+        tuple: sorted (table name, version) tuples of the tables written
+            since versions are kept, and latest commit writing one of them,
+            None if none was written.
+    """
+    TableVersion = table_version_model.TableVersion
+    names = {getattr(source, "__table__", source).name for source in sources}
+    rows = TableVersion.query.with_entities(
+        TableVersion.name, TableVersion.version,
+        TableVersion.updated_at).filter(TableVersion.name.in_(names)).all()
+    last_modified = max(
+        (updated_at for _, _, updated_at in rows if updated_at is not None),
+        default=None)
+
+    return tuple(sorted((name, version) for name, version, _ in rows)), \
+        last_modified
+
+
+def etag(get_sources):
+    """Answers GET view with 304 Not Modified when its tables didn't change.
+
+    Successful responses get an ETag, a Last-Modified and a Cache-Control
+    asking clients to revalidate them on every use.
+
+    Args:
+        get_sources (function): takes the view arguments and returns the
+            models and tables the response is built from, or None to always
+            run the view.
+    """
+
+    def etag_decorator(f):
+
+        @functools.wraps(f)
+        def f_wrapper(*args, **kwargs):
+            sources = get_sources(*args, **kwargs)
+
+            if sources is None:
+                return f(*args, **kwargs)
+
+            tables_version, last_modified = version(sources)
+            value = hashlib.sha1(
+                repr((flask.request.full_path,
+                      tables_version)).encode()).hexdigest()
+
+            if http.is_resource_modified(
+                    flask.request.environ,
+                    etag=value,
+                    last_modified=last_modified):
+                response = flask.make_response(f(*args, **kwargs))
+
+                if response.status_code != 200:
+                    return response
+            else:
+                response = flask.Response(status=304)
+
+            response.set_etag(value)
+            response.last_modified = last_modified
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+
+            return response
+
+        return f_wrapper
+
+    return etag_decorator
@@ -3,15 +3,19 @@ import app
 import marshmallow
 
 from app.api import grades as grades_module
+from app.api import conditional
 from app.models import grade as grade_model
+from app.models.common import json_cache
 from app.api import errors
 from app.schemas import grade_schema as grade_schema_class
 from app import security
+from app.matching import grade_index
 
 grade_schema = grade_schema_class.GradeSchema()
 
 
 @grades_module.bp.route("/", strict_slashes=False)
+@conditional.etag(lambda: [grade_model.Grade])
 def get_grades():
     """Gets grades in database
 
@@ -33,6 +37,8 @@ def get_grades():
 
             produces:
                 Application/json.
+        304:
+            Not modified since the ETag in If-None-Match.
     """
 
     page = flask.request.args.get("page", 1, type=int)
@@ -117,6 +123,7 @@ def create_grade():
 
 
 @grades_module.bp.route("/<int:id>")
+@conditional.etag(lambda id: [grade_model.Grade])
 def get_grade(id):
     """Gets grade.
 
@@ -133,6 +140,9 @@ def get_grade(id):
             produces:
                 Application/json.
 
+        304:
+            Not modified since the ETag in If-None-Match.
+
         404:
             College not found, returns message.
 
@@ -141,7 +151,60 @@ def get_grade(id):
     """
     grade = grade_model.Grade.query.get_or_404(id)
 
-    return flask.jsonify(grade.to_dict())
+    return flask.jsonify(json_cache.serialize(grade))
+
+
+@grades_module.bp.route("/<int:id>/grade_requirement_groups")
+def get_satisfied_grade_requirement_groups(id):
+    """Gets grade requirement groups satisfied by a grade value.
+
+    Looks up the grade's interval index instead of loading every grade
+    requirement.
+
+    GET:
+        Params:
+            id (integer): grade id.
+
+        Query params:
+            value (float) (required): grade value.
+
+    Responses:
+        200:
+            Returns ids of the grade requirement groups with a requirement
+            for the grade whose range contains value.
+
+            Produces:
+                Application/json.
+
+            Example::
+                {
+                    "grade_requirement_groups": [group id, ...]
+                }
+
+        400:
+            value missing or not a float.
+
+            Produces:
+                Application/json.
+
+        404:
+            Grade not found.
+
+            Produces:
+                Application/json.
+    """
+    grade_model.Grade.query.get_or_404(id)
+
+    try:
+        value = float(flask.request.args["value"])
+    except KeyError:
+        return errors.bad_request("missing value")
+    except ValueError:
+        return errors.bad_request("value isn't a float")
+
+    return flask.jsonify({
+        "grade_requirement_groups": grade_index.groups(id, value)
+    })
 
 
 @grades_module.bp.route("/<int:id>", methods=["PATCH"])
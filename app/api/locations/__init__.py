@@ -0,0 +1,11 @@
+"""Handles states, counties, places and consolidated cities
+
+Attributes:
+    bp: Flask blueprint
+"""
+
+import flask
+
+bp = flask.Blueprint("locations", __name__)
+
+from . import routes
@@ -0,0 +1,213 @@
+import flask
+
+from app import utils
+from app.api import locations as locations_module
+from app.models import consolidated_city as consolidated_city_model
+from app.models import county as county_model
+from app.models import place as place_model
+from app.models import state as state_model
+
+
+def cached_response(data):
+    """Builds cacheable response of census data.
+
+    Census data only changes when geocodes are imported again, so responses
+    carry an ETag of their body and may be reused for LOCATIONS_MAX_AGE
+    seconds. Requests with a matching If-None-Match get 304 Not Modified.
+
+    Args:
+        data (dict): response data.
+
+    Returns:
+        flask.Response: conditional response.
+    """
+    response = flask.jsonify(data)
+    response.add_etag()
+    response.cache_control.private = True
+    response.cache_control.max_age = int(
+        flask.current_app.config["LOCATIONS_MAX_AGE"])
+
+    return response.make_conditional(flask.request)
+
+
+def paginated_locations(query, endpoint, **kwargs):
+    """Gets keyset paginated locations ordered by fips code.
+
+    Args:
+        query (sqlalchemy.Query): locations query.
+        endpoint (string): collection endpoint for links.
+        kwargs: endpoint params.
+
+    Returns:
+        flask.Response: paginated locations, see
+            PaginatedAPIMixin.to_cursor_collection_dict.
+    """
+    args = flask.request.args
+    per_page = args.get(
+        "per_page",
+        int(flask.current_app.config["LOCATIONS_PER_PAGE"]),
+        type=int)
+    search = args.get("search", "", type=str)
+    entity = query.column_descriptions[0]["entity"]
+
+    if search:
+        query = query.filter(entity.name.like(f"{search}%"))
+        kwargs["search"] = search
+
+    # first page when there is no cursor.
+    cursor = utils.get_cursor_args() or {
+        "include_total": args.get("include_total", "").lower() in
+        ["1", "true"]
+    }
+    data = entity.to_cursor_collection_dict(query, per_page, endpoint,
+                                            **cursor, **kwargs)
+
+    return cached_response(data)
+
+
+@locations_module.bp.route("/states")
+def get_states():
+    """Gets states.
+
+    GET:
+        Request params:
+            after (string) (optional): cursor of the item preceding the
+            page, from the next link.
+            before (string) (optional): cursor of the item following the
+            page, from the prev link.
+            per_page (int) (optional): Number of items to retrieve per page,
+            defaults to configuration constant LOCATIONS_PER_PAGE.
+            search (string) (optional): name prefix.
+            include_total (bool) (optional): count items.
+
+    Responses:
+        200:
+            Successfully retrieves states ordered by fips code. Returns
+            paginated list of states, see
+            PaginatedAPIMixin.to_cursor_collection_dict.
+
+            produces:
+                Application/json.
+        304:
+            States didn't change since the ETag in If-None-Match.
+    """
+    return paginated_locations(state_model.State.query,
+                               "locations.get_states")
+
+
+@locations_module.bp.route("/states/<state_fips>")
+def get_state(state_fips):
+    """Gets state.
+
+    GET:
+        Params:
+            state_fips (string) (required): state fips code.
+
+    Responses:
+        200:
+            Successfully retrieves state.
+
+            produces:
+                Application/json.
+        304:
+            State didn't change since the ETag in If-None-Match.
+        404:
+            State not found.
+    """
+    state = state_model.State.query.filter_by(
+        fips_code=state_fips).first_or_404()
+
+    return cached_response(state.to_dict())
+
+
+def _state_locations(state_fips, model, endpoint):
+    state = state_model.State.query.filter_by(
+        fips_code=state_fips).first_or_404()
+
+    return paginated_locations(
+        model.query.filter_by(state_id=state.id),
+        endpoint,
+        state_fips=state_fips)
+
+
+@locations_module.bp.route("/states/<state_fips>/counties")
+def get_state_counties(state_fips):
+    """Gets counties of state.
+
+    GET:
+        Params:
+            state_fips (string) (required): state fips code.
+
+        Request params:
+            Same as get_states.
+
+    Responses:
+        200:
+            Successfully retrieves counties ordered by fips code. Returns
+            paginated list of counties.
+
+            produces:
+                Application/json.
+        304:
+            Counties didn't change since the ETag in If-None-Match.
+        404:
+            State not found.
+    """
+    return _state_locations(state_fips, county_model.County,
+                            "locations.get_state_counties")
+
+
+@locations_module.bp.route("/states/<state_fips>/places")
+def get_state_places(state_fips):
+    """Gets places of state.
+
+    GET:
+        Params:
+            state_fips (string) (required): state fips code.
+
+        Request params:
+            Same as get_states.
+
+    Responses:
+        200:
+            Successfully retrieves places ordered by fips code. Returns
+            paginated list of places.
+
+            produces:
+                Application/json.
+        304:
+            Places didn't change since the ETag in If-None-Match.
+        404:
+            State not found.
+    """
+    return _state_locations(state_fips, place_model.Place,
+                            "locations.get_state_places")
+
+
+@locations_module.bp.route("/states/<state_fips>/consolidated_cities")
+def get_state_consolidated_cities(state_fips):
+    """Gets consolidated cities of state.
+
+    GET:
+        Params:
+            state_fips (string) (required): state fips code.
+
+        Request params:
+            Same as get_states.
+
+    Responses:
+        200:
+            Successfully retrieves consolidated cities ordered by fips code.
+            Returns paginated list of consolidated cities.
+
+            produces:
+                Application/json.
+        304:
+            Consolidated cities didn't change since the ETag in
+            If-None-Match.
+        404:
+            State not found.
+    """
+    return _state_locations(
+        state_fips, consolidated_city_model.ConsolidatedCity,
+        "locations.get_state_consolidated_cities")
@@ -4,7 +4,9 @@ import marshmallow
 
 from app import utils
 from app.api import majors as majors_module
+from app.api import conditional
 from app.models import major as major_model
+from app.models.common import json_cache
 from app.api import errors
 from app.schemas import major_schema as major_schema_class
 from app import security
@@ -13,6 +15,7 @@ major_schema = major_schema_class.MajorSchema()
 
 
 @majors_module.bp.route("/", strict_slashes=False)
+@conditional.etag(lambda: [major_model.Major])
 def get_majors():
     """Gets majors in database
 
@@ -34,6 +37,8 @@ def get_majors():
 
             produces:
                 Application/json.
+        304:
+            Not modified since the ETag in If-None-Match.
     """
 
     page = flask.request.args.get("page", 1, type=int)
@@ -115,6 +120,7 @@ def create_major():
 
 
 @majors_module.bp.route("/<int:id>")
+@conditional.etag(lambda id: [major_model.Major])
 def get_major(id):
     """Gets major.
 
@@ -131,6 +137,9 @@ def get_major(id):
             produces:
                 Application/json.
         
+        304:
+            Not modified since the ETag in If-None-Match.
+
         404:
             College not found, returns message.
 
@@ -139,7 +148,7 @@ def get_major(id):
     """
     major = major_model.Major.query.get_or_404(id)
 
-    return flask.jsonify(major.to_dict())
+    return flask.jsonify(json_cache.serialize(major))
 
 
 @majors_module.bp.route("/<int:id>", methods=["PATCH"])
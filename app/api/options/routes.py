@@ -3,6 +3,7 @@ import app
 import marshmallow
 
 from app.api import options as options_module
+from app.api import conditional
 from app.models import option as option_model
 from app.api import errors
 from app.schemas import option_schema as option_schema_class
@@ -12,6 +13,7 @@ option_schema = option_schema_class.OptionSchema()
 
 
 @options_module.bp.route("/", strict_slashes=False)
+@conditional.etag(lambda: [option_model.Option])
 def get_options():
     """Gets options in database
 
@@ -33,6 +35,8 @@ def get_options():
 
             produces:
                 Application/json.
+        304:
+            Not modified since the ETag in If-None-Match.
     """
 
     page = flask.request.args.get("page", 1, type=int)
@@ -3,8 +3,12 @@ import app
 import marshmallow
 
 from app.api import programs as programs_module
+from app.api import conditional
+from app.models import association_tables
 from app.models import program as program_model
 from app.models import qualification_round as qualification_round_model
+from app.models.common import bulk_association
+from app.models.common import json_cache
 from app.api import errors
 from app.schemas import program_schema as program_schema_class
 from app import security
@@ -13,6 +17,7 @@ program_schema = program_schema_class.ProgramSchema()
 
 
 @programs_module.bp.route("/", strict_slashes=False)
+@conditional.etag(lambda: [program_model.Program])
 def get_programs():
     """Gets programs in database
 
@@ -34,6 +39,8 @@ def get_programs():
 
             produces:
                 Application/json.
+        304:
+            Not modified since the ETag in If-None-Match.
     """
 
     page = flask.request.args.get("page", 1, type=int)
@@ -115,6 +122,7 @@ def create_program():
 
 
 @programs_module.bp.route("/<int:id>")
+@conditional.etag(lambda id: [program_model.Program])
 def get_program(id):
     """Gets program.
 
@@ -131,6 +139,9 @@ def get_program(id):
             produces:
                 Application/json.
 
+        304:
+            Not modified since the ETag in If-None-Match.
+
         404:
             College not found, returns message.
 
@@ -139,7 +150,7 @@ def get_program(id):
     """
     program = program_model.Program.query.get_or_404(id)
 
-    return flask.jsonify(program.to_dict())
+    return flask.jsonify(json_cache.serialize(program))
 
 
 @programs_module.bp.route("/<int:id>", methods=["PATCH"])
@@ -254,27 +265,43 @@ def add_qualification_rounds(id):
         200:
             link to get program qualification_rounds.
 
+            produces:
+                application/json.
+        400:
+            no data provided or an id is not an integer.
+
             produces:
                 application/json.
         404:
-            no program found
+            no program or qualification round found
 
             produces:
                 application/json.
     """
     data = flask.request.get_json()
 
-    if not data:
+    if not data or not isinstance(data, list):
         return errors.bad_request("no data provided")
 
     program = program_model.Program.query.get_or_404(id)
 
-    for qualification_round_id in data:
-        qualification_round = qualification_round_model.QualificationRound.query.get_or_404(
-            qualification_round_id)
-
-        program.add_qualification_round(qualification_round)
-
+    try:
+        qualification_round_ids = bulk_association.parse_ids(data)
+    except ValueError:
+        return errors.bad_request("invalid id")
+
+    QualificationRound = qualification_round_model.QualificationRound
+    found = bulk_association.resolve_ids(QualificationRound.query,
+                                         QualificationRound.id,
+                                         qualification_round_ids)
+
+    if len(found) < len(qualification_round_ids):
+        return errors.not_found("resource not found")
+
+    table = association_tables.program_qualification_round
+    bulk_association.add_links(table.c.program_id, program.id,
+                               table.c.qualification_round_id,
+                               qualification_round_ids)
     app.db.session.commit()
 
     return flask.jsonify({
@@ -285,6 +312,10 @@ def add_qualification_rounds(id):
 
 # read qualification_rounds
 @programs_module.bp.route("/<int:id>/qualification_rounds")
+@conditional.etag(lambda id: [
+    program_model.Program, qualification_round_model.QualificationRound,
+    association_tables.program_qualification_round
+])
 def get_qualification_rounds(id):
     """Gets program qualification_rounds in database
 
@@ -305,6 +336,8 @@ def get_qualification_rounds(id):
 
             produces:
                 Application/json.
+        304:
+            Not modified since the ETag in If-None-Match.
     """
     program = program_model.Program.query.get_or_404(id)
 
@@ -340,6 +373,11 @@ def remove_qualification_rounds(id):
         200:
             link to get program qualification_rounds.
 
+            produces:
+                application/json.
+        400:
+            no data provided or an id is not an integer.
+
             produces:
                 application/json.
         404:
@@ -350,18 +388,20 @@ def remove_qualification_rounds(id):
     """
     data = flask.request.get_json()
 
-    if not data:
+    if not data or not isinstance(data, list):
         return errors.bad_request("no data provided")
 
     program = program_model.Program.query.get_or_404(id)
 
-    for qualification_round_id in data:
-        qualification_round = qualification_round_model.QualificationRound.get(
-            qualification_round_id)
-
-        if qualification_round is not None:
-            program.remove_qualification_round(qualification_round)
-
+    try:
+        qualification_round_ids = bulk_association.parse_ids(data)
+    except ValueError:
+        return errors.bad_request("invalid id")
+
+    table = association_tables.program_qualification_round
+    bulk_association.remove_links(table.c.program_id, program.id,
+                                  table.c.qualification_round_id,
+                                  qualification_round_ids)
     app.db.session.commit()
 
     return flask.jsonify({
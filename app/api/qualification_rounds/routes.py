@@ -3,7 +3,9 @@ import app
 import marshmallow
 
 from app.api import qualification_rounds as qualification_rounds_module
+from app.api import conditional
 from app.models import qualification_round as qualification_round_model
+from app.models.common import json_cache
 from app.api import errors
 from app.schemas import qualification_round_schema as qualification_round_schema_class
 from app import security
@@ -13,6 +15,8 @@ qualification_round_schema = qualification_round_schema_class.QualificationRound
 
 
 @qualification_rounds_module.bp.route("/", strict_slashes=False)
+@conditional.etag(
+    lambda: [qualification_round_model.QualificationRound])
 def get_qualification_rounds():
     """Gets qualification_rounds in database
 
@@ -34,6 +38,8 @@ def get_qualification_rounds():
 
             produces:
                 Application/json.
+        304:
+            Not modified since the ETag in If-None-Match.
     """
 
     page = flask.request.args.get("page", 1, type=int)
@@ -192,6 +198,8 @@ def patch_qualification_round(id):
 
 
 @qualification_rounds_module.bp.route("/<int:id>")
+@conditional.etag(
+    lambda id: [qualification_round_model.QualificationRound])
 def get_qualification_round(id):
     """Gets qualification_round.
 
@@ -208,6 +216,9 @@ def get_qualification_round(id):
             produces:
                 Application/json.
 
+        304:
+            Not modified since the ETag in If-None-Match.
+
         404:
             College not found, returns message.
 
@@ -217,7 +228,7 @@ def get_qualification_round(id):
     qualification_round = qualification_round_model.QualificationRound.query.get_or_404(
         id)
 
-    return flask.jsonify(qualification_round.to_dict())
+    return flask.jsonify(json_cache.serialize(qualification_round))
 
 
 @qualification_rounds_module.bp.route("/<int:id>", methods=["DELETE"])
@@ -3,8 +3,12 @@ import app
 import marshmallow
 
 from app.api import questions as questions_module
+from app.api import conditional
+from app.models import association_tables
 from app.models import question as question_model
 from app.models import option as option_model
+from app.models.common import bulk_association
+from app.models.common import json_cache
 from app.api import errors
 from app.schemas import question_schema as question_schema_class
 from app import security
@@ -13,6 +17,7 @@ question_schema = question_schema_class.QuestionSchema()
 
 
 @questions_module.bp.route("/", strict_slashes=False)
+@conditional.etag(lambda: [question_model.Question])
 def get_questions():
     """Gets questions in database
 
@@ -34,6 +39,8 @@ def get_questions():
 
             produces:
                 Application/json.
+        304:
+            Not modified since the ETag in If-None-Match.
     """
 
     page = flask.request.args.get("page", 1, type=int)
@@ -115,6 +122,7 @@ def create_question():
 
 
 @questions_module.bp.route("/<int:id>")
+@conditional.etag(lambda id: [question_model.Question])
 def get_question(id):
     """Gets question.
 
@@ -131,6 +139,9 @@ def get_question(id):
             produces:
                 Application/json.
 
+        304:
+            Not modified since the ETag in If-None-Match.
+
         404:
             College not found, returns message.
 
@@ -139,7 +150,7 @@ def get_question(id):
     """
     question = question_model.Question.query.get_or_404(id)
 
-    return flask.jsonify(question.to_dict())
+    return flask.jsonify(json_cache.serialize(question))
 
 
 @questions_module.bp.route("/<int:id>", methods=["DELETE"])
@@ -173,6 +184,10 @@ def delete_question(id):
 
 
 @questions_module.bp.route("/<int:id>/options")
+@conditional.etag(lambda id: [
+    question_model.Question, option_model.Option,
+    association_tables.question_option
+])
 def get_options(id):
     """Gets question options in database
 
@@ -193,6 +208,8 @@ def get_options(id):
 
             produces:
                 Application/json.
+        304:
+            Not modified since the ETag in If-None-Match.
     """
     question = question_model.Question.query.get_or_404(id)
 
@@ -238,17 +255,17 @@ def add_options(id):
 
     question = question_model.Question.query.get_or_404(id)
 
-    for option_id in data:
-        try:
-            option_id = int(option_id)
-        except ValueError:
-            return errors.bad_request("option id must be an integer")
-
-        option = option_model.Option.get(option_id)
-
-        if option is not None:
-            question.add_option(option)
-
+    try:
+        option_ids = bulk_association.parse_ids(data)
+    except ValueError:
+        return errors.bad_request("option id must be an integer")
+
+    found = bulk_association.resolve_ids(option_model.Option.query,
+                                         option_model.Option.id, option_ids)
+    table = association_tables.question_option
+    bulk_association.add_links(
+        table.c.question_id, question.id, table.c.option_id,
+        [option_id for option_id in option_ids if option_id in found])
     app.db.session.commit()
 
     return flask.jsonify({
@@ -290,18 +307,14 @@ def delete_options(id):
 
     question = question_model.Question.query.get_or_404(id)
 
-    for option_id in data:
-
-        try:
-            option_id = int(option_id)
-        except ValueError:
-            return errors.bad_request("option id must be an integer")
-
-        option = option_model.Option.get(option_id)
-
-        if option is not None:
-            question.remove_option(option)
+    try:
+        option_ids = bulk_association.parse_ids(data)
+    except ValueError:
+        return errors.bad_request("option id must be an integer")
 
+    table = association_tables.question_option
+    bulk_association.remove_links(table.c.question_id, question.id,
+                                  table.c.option_id, option_ids)
     app.db.session.commit()
 
     return flask.jsonify({
@@ -0,0 +1,202 @@
+"""Scholarship requirement tree for expanded scholarship responses.
+
+Requirement relationships are dynamic, so they can't be eager loaded from
+the scholarship. Every collection is read with one query filtered by the
+scholarship id, and every nested collection with one SELECT ... IN query
+over the ids of its parents, so the whole tree takes a bounded number of
+queries whatever its size. Each collection has the shape of the response
+of its own endpoint, with nested collections inlined.
+"""
+import collections
+
+from sqlalchemy import orm
+
+import app
+from app.models import association_tables
+from app.models import grade_requirement_group as grade_requirement_group_model
+from app.models import location as location_model
+from app.models import option as option_model
+from app.models import qualification_round as qualification_round_model
+from app.models import question as question_model
+from app.models import scholarship as scholarship_model
+from app.models.common import paginated_api_mixin
+
+
+def _children(table, parent_column, child_column, model, parent_ids):
+    """Gets models linked to parents through an association table.
+
+    Returns:
+        collections.defaultdict: parent id to list of models.
+    """
+    children = collections.defaultdict(list)
+
+    if not parent_ids:
+        return children
+
+    query = app.db.session.query(parent_column, model).join(
+        table, child_column == model.id).filter(
+            parent_column.in_(parent_ids)).order_by(model.id)
+
+    for parent_id, child in query:
+        children[parent_id].append(child)
+
+    return children
+
+
+def boolean_requirement(scholarship_id):
+    BooleanRequirement = association_tables.BooleanRequirement
+    requirements = BooleanRequirement.query.filter_by(
+        scholarship_id=scholarship_id).options(
+            orm.joinedload(BooleanRequirement.question))
+
+    return [requirement.to_dict() for requirement in requirements]
+
+
+def selection_requirements(scholarship_id):
+    SelectionRequirement = association_tables.SelectionRequirement
+    table = association_tables.selection_requirement_option
+    requirements = SelectionRequirement.query.filter_by(
+        scholarship_id=scholarship_id).all()
+    options = _children(table, table.c.selection_requirement_id,
+                        table.c.option_id, option_model.Option,
+                        [requirement.id for requirement in requirements])
+
+    return [
+        dict(
+            requirement.to_dict(),
+            options=[option.to_dict() for option in options[requirement.id]])
+        for requirement in requirements
+    ]
+
+
+def grade_requirement_groups(scholarship_id):
+    GradeRequirement = association_tables.GradeRequirement
+    groups = grade_requirement_group_model.GradeRequirementGroup.query \
+        .filter_by(scholarship_id=scholarship_id).all()
+    grade_requirements = collections.defaultdict(list)
+
+    if groups:
+        for requirement in GradeRequirement.query.filter(
+                GradeRequirement.grade_requirement_group_id.in_(
+                    [group.id for group in groups])).options(
+                        orm.joinedload(GradeRequirement.grade)):
+            grade_requirements[requirement.grade_requirement_group_id] \
+                .append(requirement)
+
+    return [
+        dict(
+            group.to_dict(),
+            grade_requirements=[
+                requirement.to_dict()
+                for requirement in grade_requirements[group.id]
+            ]) for group in groups
+    ]
+
+
+def location_requirements(scholarship_id):
+    locations = location_model.Location.query.filter_by(
+        scholarship_id=scholarship_id).all()
+
+    return {
+        "accepted": [
+            location.to_dict() for location in locations
+            if not location.blacklist
+        ],
+        "blacklisted":
+        [location.to_dict() for location in locations if location.blacklist]
+    }
+
+
+def programs_requirement(scholarship_id):
+    ProgramRequirement = association_tables.ProgramRequirement
+    table = association_tables.program_requirement_qualification_round
+    requirements = ProgramRequirement.query.filter_by(
+        scholarship_id=scholarship_id).all()
+    rounds = _children(table, table.c.program_requirement_id,
+                       table.c.qualification_round_id,
+                       qualification_round_model.QualificationRound,
+                       [requirement.id for requirement in requirements])
+
+    return [
+        dict(
+            requirement.to_dict(),
+            qualification_rounds=[
+                qualification_round.to_dict()
+                for qualification_round in rounds[requirement.id]
+            ]) for requirement in requirements
+    ]
+
+
+def chosen_college_requirement(scholarship_id):
+    table = association_tables.chosen_college_requirement
+    questions = _children(table, table.c.scholarship_id, table.c.question_id,
+                          question_model.Question, [scholarship_id])
+
+    return [question.to_dict() for question in questions[scholarship_id]]
+
+
+def scholarships_needed(scholarship_id):
+    Scholarship = scholarship_model.Scholarship
+    table = association_tables.scholarships_needed
+    needed = Scholarship.query.join(
+        table, table.c.needed_id == Scholarship.id).filter(
+            table.c.needs_id == scholarship_id).options(
+                *paginated_api_mixin.eager_load_options(
+                    Scholarship, Scholarship.EAGER_LOADS)).order_by(
+                        Scholarship.id)
+
+    return [scholarship.for_pagination() for scholarship in needed]
+
+
+# expandable collections, in response order.
+EXPANSIONS = collections.OrderedDict([
+    ("boolean_requirement", boolean_requirement),
+    ("selection_requirements", selection_requirements),
+    ("grade_requirement_groups", grade_requirement_groups),
+    ("location_requirements", location_requirements),
+    ("programs_requirement", programs_requirement),
+    ("chosen_college_requirement", chosen_college_requirement),
+    ("scholarships_needed", scholarships_needed),
+])
+
+
+def parse(expand):
+    """Parses expand request param.
+
+    Args:
+        expand (string): "all", or comma separated collection names.
+
+    Returns:
+        list: collection names, in response order.
+
+    Raises:
+        ValueError: unknown collection name.
+    """
+    if expand.strip() == "all":
+        return list(EXPANSIONS)
+
+    names = {name.strip() for name in expand.split(",") if name.strip()}
+    unknown = names - EXPANSIONS.keys()
+
+    if unknown:
+        raise ValueError(f"can't expand {', '.join(sorted(unknown))}")
+
+    return [name for name in EXPANSIONS if name in names]
+
+
+def expand(scholarship, names):
+    """Gets scholarship with its requirement collections.
+
+    Args:
+        scholarship (Scholarship): scholarship.
+        names (list): collections to include, see parse.
+
+    Returns:
+        dict: scholarship to_dict with one key per collection.
+    """
+    data = scholarship.to_dict()
+
+    for name in names:
+        data[name] = EXPANSIONS[name](scholarship.id)
+
+    return data
@@ -3,8 +3,16 @@ import marshmallow
 
 import re
 import app
+from app.api import bulk
+from app.api import conditional
 from app.api import scholarships as scholarships_module
+from app.api.scholarships import expand as expand_module
+from app import geocodes
 from app import security
+from app import matching
+from app import search as search_module
+from app.matching import dependencies
+from app.matching import location_index
 from app.models import scholarship as scholarship_model
 from app.models import scholarship_details as scholarship_details_model
 from app.models import detail as detail_model
@@ -13,22 +21,33 @@ from app.models import program as program_model
 from app.models import question as question_model
 from app.models import location as location_model
 from app.models import option as option_model
+from app.models import qualification_round as qualification_round_model
+from app.models.common import bulk_association
+from app.models.common import json_cache
 from app.schemas import scholarship_schema as scholarship_schema_class
 from app.schemas import detail_schema as detail_schema_class
 from app.api import errors
 from app.models import college as college_model
 
 scholarship_schema = scholarship_schema_class.ScholarshipSchema()
+bulk_scholarship_schema = scholarship_schema_class.BulkScholarshipSchema()
 detail_schema = detail_schema_class.DetailSchema()
 
 
 @scholarships_module.bp.route("/", methods=["GET"], strict_slashes=False)
+@conditional.etag(lambda: [
+    scholarship_model.Scholarship, scholarship_details_model.ScholarshipDetails
+])
 def get_scholarships():
     """Gets scholarships in database
 
     Retrieves paginated list of all scholarships from database or scholarships that
     contains the search request parameter if defined.
 
+    Search uses the full text index of scholarship details when the database
+    has one, ranking scholarships by relevance, and falls back to matching
+    names.
+
     GET:
         Request params:
             page (int) (optional): Page number in paginated resource, defaults
@@ -44,6 +63,8 @@ def get_scholarships():
 
             produces:
                 Application/json.
+        304:
+            Not modified since the ETag in If-None-Match.
     """
     page = flask.request.args.get("page", 1, type=int)
     per_page = flask.request.args.get(
@@ -52,10 +73,25 @@ def get_scholarships():
         type=int)
     search = flask.request.args.get("search", "", type=str)
 
-    if search:
+    matches = search_module.match("scholarship",
+                                  search) if search else None
+
+    if matches is not None:
+        query = scholarship_model.Scholarship.query.join(
+            matches,
+            matches.c.owner_id == scholarship_model.Scholarship.id).order_by(
+                matches.c.score, scholarship_model.Scholarship.id)
+
+        data = scholarship_model.Scholarship.to_collection_dict(
+            query,
+            page,
+            per_page,
+            "scholarships.get_scholarships",
+            search=search)
+    elif search:
         query = scholarship_model.Scholarship.query.join(
             scholarship_details_model.ScholarshipDetails,
-            scholarship_details_model.ScholarshipDetails.id ==
+            scholarship_details_model.ScholarshipDetails.scholarship_id ==
             scholarship_model.Scholarship.id,
             isouter=True).filter(
                 scholarship_details_model.ScholarshipDetails.name.like(
@@ -147,7 +183,270 @@ def post_scholarship():
     }), 201
 
 
+def _create_scholarships(chunk):
+    items, results = bulk.validate(bulk_scholarship_schema, chunk)
+    ScholarshipDetails = scholarship_details_model.ScholarshipDetails
+    College = college_model.College
+    names = [item["name"] for _, item in items]
+    existing = {
+        name
+        for name, in app.db.session.query(ScholarshipDetails.name).filter(
+            ScholarshipDetails.name.in_(names))
+    }
+    colleges = {
+        id
+        for id, in app.db.session.query(College.id).filter(
+            College.id.in_({item["college_id"] for _, item in items}))
+    }
+    created = []
+
+    for index, item in items:
+        if item["college_id"] not in colleges:
+            results.append(
+                bulk.error(index, 404,
+                           f"college {item['college_id']} not found"))
+            continue
+
+        if item["name"] in existing:
+            results.append(
+                bulk.error(index, 400,
+                           f"scholarship '{item['name']}' already exists"))
+            continue
+
+        existing.add(item["name"])
+        scholarship_details = ScholarshipDetails(**{
+            field: item[field]
+            for field in ScholarshipDetails.ATTR_FIELDS if field in item
+        })
+        scholarship = scholarship_model.Scholarship(
+            scholarship_details=scholarship_details,
+            college_id=item["college_id"],
+            exclude_from_match=item.get("exclude_from_match", False))
+        app.db.session.add(scholarship)
+        created.append((index, scholarship))
+
+    app.db.session.flush()
+
+    return results + [{
+        "index": index,
+        "status": 201,
+        "scholarship": flask.url_for(
+            "scholarships.get_scholarship", id=scholarship.id)
+    } for index, scholarship in created]
+
+
+@scholarships_module.bp.route("/bulk", methods=["POST"])
+def post_scholarships_bulk():
+    """Creates scholarships in bulk.
+
+    Validates scholarships with ScholarshipSchema and creates them in chunks
+    of BULK_CHUNK_SIZE, one transaction per chunk.
+
+    Post:
+        Consumes:
+            Application/json, JSON array of scholarships.
+            Application/x-ndjson, one scholarship per line.
+
+        Request body:
+            scholarships with their college id.
+
+            Example::
+                [
+                    {
+                        "college_id": college id to add,
+                        "name": "example name",
+                        "amount": "1000"
+                    }
+                ]
+    Responses:
+        200:
+            Result of every scholarship, in request order.
+
+            produces:
+                Application/json.
+
+            Example::
+                {
+                    "created": 1,
+                    "failed": 1,
+                    "results": [
+                        {
+                            "index": 0,
+                            "status": 201,
+                            "scholarship": link to get scholarship
+                        },
+                        {
+                            "index": 1,
+                            "status": 404,
+                            "errors": "college 3 not found"
+                        }
+                    ]
+                }
+        400:
+            Request body isn't a JSON array or NDJSON, or has more than
+            BULK_MAX_ITEMS scholarships.
+
+            produces:
+                Application/json.
+    """
+    return bulk.create(_create_scholarships)
+
+
+@scholarships_module.bp.route("/match", methods=["POST"])
+def match_scholarships():
+    """Matches student profile against scholarships.
+
+    Evaluates the profile against every scholarship not excluded from match.
+
+    POST:
+        Consumes:
+            Application/json.
+
+        Request body:
+            student profile, see matching.Profile.from_dict.
+
+            Example::
+                {
+                    "grades": [{"grade_id": grade id, "value": 3.5}],
+                    "answers": [{"question_id": question id, "value": 1}],
+                    "options": [option id, ...],
+                    "location": {"state": state, "zip_code": zip code},
+                    "programs": [
+                        {
+                            "program_id": program id,
+                            "qualification_rounds": [round id, ...]
+                        }
+                    ],
+                    "chosen_college": college id
+                }
+
+    Responses:
+        200:
+            Returns ids of the scholarships the student qualifies for.
+
+            Produces:
+                Application/json.
+
+            Example::
+                {
+                    "scholarships": [scholarship id, ...]
+                }
+        400:
+            no data provided or bad structure, missing fields or invalid
+            values.
+
+            Produces:
+                Application/json.
+    """
+    data = flask.request.get_json() or {}
+
+    if not data or not isinstance(data, dict):
+        return errors.bad_request("no data provided or bad structure")
+
+    try:
+        profile = matching.Profile.from_dict(data)
+    except KeyError:
+        return errors.bad_request("missing fields in profile")
+    except (ValueError, TypeError, AttributeError):
+        return errors.bad_request("invalid profile")
+
+    return flask.jsonify({"scholarships": matching.match(profile)})
+
+
+@scholarships_module.bp.route("/match/batch", methods=["POST"])
+def match_scholarships_batch():
+    """Matches many student profiles against scholarships.
+
+    Evaluates the whole batch at once against every scholarship not excluded
+    from match.
+
+    POST:
+        Consumes:
+            Application/json.
+
+        Request body:
+            profiles (list): student profiles, see
+                matching.Profile.from_dict. At most MATCH_BATCH_SIZE
+                profiles.
+
+            Example::
+                {
+                    "profiles": [
+                        {
+                            "grades": [{"grade_id": grade id, "value": 3.5}],
+                            "answers": [
+                                {"question_id": question id, "value": 1}
+                            ],
+                            "location": {"state": state}
+                        },
+                        ...
+                    ]
+                }
+
+    Responses:
+        200:
+            Returns ids of the scholarships each student qualifies for, in
+            the same order as the profiles.
+
+            Produces:
+                Application/json.
+
+            Example::
+                {
+                    "results": [
+                        {"scholarships": [scholarship id, ...]},
+                        ...
+                    ]
+                }
+        400:
+            no data provided or bad structure, too many profiles, missing
+            fields or invalid values.
+
+            Produces:
+                Application/json.
+    """
+    data = flask.request.get_json() or {}
+
+    if not data or not isinstance(data, dict) or \
+            not isinstance(data.get("profiles"), list):
+        return errors.bad_request("no data provided or bad structure")
+
+    batch_size = int(flask.current_app.config["MATCH_BATCH_SIZE"])
+
+    if len(data["profiles"]) > batch_size:
+        return errors.bad_request(
+            f"too many profiles, maximum is {batch_size}")
+
+    profiles = []
+    for index, profile in enumerate(data["profiles"]):
+        try:
+            profiles.append(matching.Profile.from_dict(profile))
+        except KeyError:
+            return errors.bad_request(
+                f"missing fields in profile at index {index}")
+        except (ValueError, TypeError, AttributeError):
+            return errors.bad_request(f"invalid profile at index {index}")
+
+    return flask.jsonify({
+        "results": [{
+            "scholarships": scholarships
+        } for scholarships in matching.match_batch(profiles)]
+    })
+
+
+def _scholarship_tables(id):
+    # expanded responses are built from every requirement table.
+    if flask.request.args.get("expand"):
+        return None
+
+    return [
+        scholarship_model.Scholarship,
+        scholarship_details_model.ScholarshipDetails
+    ]
+
+
 @scholarships_module.bp.route("/<int:id>", methods=["GET"])
+@conditional.etag(_scholarship_tables)
 def get_scholarship(id):
     """Gets scholarship.
 
@@ -157,9 +456,32 @@ def get_scholarship(id):
         Params:
             name (string) (required): scholarship name.
 
+        Request params:
+            expand (string) (optional): requirement collections to include,
+            "all" or comma separated names: boolean_requirement,
+            selection_requirements, grade_requirement_groups,
+            location_requirements, programs_requirement,
+            chosen_college_requirement, scholarships_needed. Nested options,
+            grade requirements and qualification rounds are included.
+
+            Example::
+                /api/scholarships/1?expand=boolean_requirement,
+                selection_requirements
+
     Responses:
         200:
-            Successfully retrieves scholarship. Returns scholarship.
+            Successfully retrieves scholarship. Returns scholarship, with a
+            key per expanded collection shaped like the response of its
+            endpoint.
+
+            produces:
+                Application/json.
+
+        304:
+            Not modified since the ETag in If-None-Match.
+
+        400:
+            Unknown collection in expand.
 
             produces:
                 Application/json.
@@ -170,8 +492,19 @@ def get_scholarship(id):
             produces:
                 Application/json.
     """
+    expand = flask.request.args.get("expand", "", type=str)
+
+    try:
+        names = expand_module.parse(expand) if expand else []
+    except ValueError as err:
+        return errors.bad_request(str(err))
+
     scholarship = scholarship_model.Scholarship.query.get_or_404(id)
-    return flask.jsonify(scholarship.to_dict())
+
+    if not names:
+        return flask.jsonify(json_cache.serialize(scholarship))
+
+    return flask.jsonify(expand_module.expand(scholarship, names))
 
 
 @scholarships_module.bp.route("/<int:id>", methods=["PATCH"])
@@ -442,24 +775,29 @@ def get_scholarships_needed(id):
     search = flask.request.args.get("search", "", type=str)
 
     if search:
-        query = scholarship.scholarships_needed.query.join(
+        query = scholarship.scholarships_needed.join(
             scholarship_details_model.ScholarshipDetails,
-            scholarship_details_model.ScholarshipDetails.id == scholarship.
-            scholarships_needed.id,
+            scholarship_details_model.ScholarshipDetails.scholarship_id ==
+            scholarship_model.Scholarship.id,
             isouter=True).filter(
                 scholarship_details_model.ScholarshipDetails.name.like(
                     f"%{search}%"))
 
-        data = scholarship.scholarships_needed.to_collection_dict(
+        data = scholarship_model.Scholarship.to_collection_dict(
             query,
             page,
             per_page,
-            "scholarships.get_scholarships",
+            "scholarships.get_scholarships_needed",
+            id=id,
             search=search)
     else:
         query = scholarship.scholarships_needed
         data = scholarship_model.Scholarship.to_collection_dict(
-            query, page, per_page, "scholarships.get_scholarships")
+            query,
+            page,
+            per_page,
+            "scholarships.get_scholarships_needed",
+            id=id)
 
     return flask.jsonify(data)
 
@@ -492,7 +830,9 @@ def post_scholarships_needed(id):
                 Application/json.
 
         400:
-            Empty json object. Returns message "no data provided".
+            Empty json object. Returns message "no data provided". Or an id
+            is not an integer, or a scholarship to add already needs the
+            scholarship, directly or transitively.
 
             produces:
                 Application/json.
@@ -508,19 +848,34 @@ def post_scholarships_needed(id):
         return errors.bad_request("no data provided")
 
     scholarship = scholarship_model.Scholarship.query.get_or_404(id)
-    college = scholarship.college
 
-    for scholarship_needed in data:
-        if scholarship_needed == scholarship.id:
-            continue
+    try:
+        needed_ids = [
+            needed_id for needed_id in bulk_association.parse_ids(data)
+            if needed_id != scholarship.id
+        ]
+    except ValueError:
+        return errors.bad_request("invalid id")
 
-        scholarship_to_add = college.scholarships.filter_by(
-            id=scholarship_needed).first()
+    # only scholarships of the same college can be needed.
+    found = bulk_association.resolve_ids(scholarship.college.scholarships,
+                                         scholarship_model.Scholarship.id,
+                                         needed_ids)
+    needed_ids = [needed_id for needed_id in needed_ids if needed_id in found]
 
-        if scholarship_to_add is not None:
-            scholarship.add_needed_scholarship(scholarship_to_add)
+    table = association_tables.scholarships_needed
 
+    try:
+        dependencies.check(scholarship.id, needed_ids)
+    except dependencies.CycleError as err:
+        app.db.session.rollback()
+        return errors.bad_request(str(err))
+
+    bulk_association.add_links(table.c.needs_id, scholarship.id,
+                               table.c.needed_id, needed_ids)
+    matching.mark_stale()
     app.db.session.commit()
+
     return flask.jsonify({
         "scholarships_needed":
         flask.url_for("scholarships.get_scholarships_needed", id=id)
@@ -555,7 +910,8 @@ def delete_scholarships_needed(id):
                 Application/json.
 
         400:
-            Empty json object. Returns message "no data provided".
+            Empty json object. Returns message "no data provided". Or an id
+            is not an integer.
 
             produces:
                 Application/json.
@@ -572,13 +928,15 @@ def delete_scholarships_needed(id):
 
     scholarship = scholarship_model.Scholarship.query.get_or_404(id)
 
-    for scholarship_needed in data:
-        scholarship_to_remove = scholarship.scholarships_needed.filter_by(
-            id=scholarship_needed).first()
-
-        if scholarship_to_remove is not None:
-            scholarship.remove_needed_scholarship(scholarship_to_remove)
+    try:
+        needed_ids = bulk_association.parse_ids(data)
+    except ValueError:
+        return errors.bad_request("invalid id")
 
+    table = association_tables.scholarships_needed
+    bulk_association.remove_links(table.c.needs_id, scholarship.id,
+                                  table.c.needed_id, needed_ids)
+    matching.mark_stale()
     app.db.session.commit()
     return flask.jsonify({
         "scholarships_needed":
@@ -718,22 +1076,27 @@ def add_qualification_rounds_to_program_requirement(scholarship_id,
         association_tables.ProgramRequirement.program_id ==
         program_id).first_or_404()
 
-    for qualification_round_id in data:
-
-        try:
-            qualification_round_id = int(qualification_round_id)
-        except ValueError:
-            return errors.bad_request("invalid qualification round id")
+    try:
+        qualification_round_ids = bulk_association.parse_ids(data)
+    except ValueError:
+        return errors.bad_request("invalid qualification round id")
 
-        qualification_round = program_requirement.program.qualification_rounds \
-            .filter_by(id=qualification_round_id).first()
+    found = bulk_association.resolve_ids(
+        program_requirement.program.qualification_rounds,
+        qualification_round_model.QualificationRound.id,
+        qualification_round_ids)
 
-        if qualification_round is None:
+    for qualification_round_id in qualification_round_ids:
+        if qualification_round_id not in found:
             return errors.not_found("program does not have qualification "
                                     f"round {qualification_round_id}")
 
-        program_requirement.add_qualification_round(qualification_round)
-
+    table = association_tables.program_requirement_qualification_round
+    bulk_association.add_links(table.c.program_requirement_id,
+                               program_requirement.id,
+                               table.c.qualification_round_id,
+                               qualification_round_ids)
+    matching.mark_stale()
     app.db.session.commit()
 
     return flask.jsonify({"message": "qualification rounds added"})
@@ -968,15 +1331,21 @@ def add_chosen_college_requirement(id):
     scholarship = scholarship_model.Scholarship.query.get_or_404(id)
 
     try:
-        for question_id in data:
-            question_id = int(question_id)
-            question = question_model.Question.query.get_or_404(question_id)
-
-            scholarship.add_chosen_college_requirement(question)
-
+        question_ids = bulk_association.parse_ids(data)
     except ValueError:
         return errors.bad_request("invalid id")
 
+    found = bulk_association.resolve_ids(question_model.Question.query,
+                                         question_model.Question.id,
+                                         question_ids)
+
+    if len(found) < len(question_ids):
+        return errors.not_found("resource not found")
+
+    table = association_tables.chosen_college_requirement
+    bulk_association.add_links(table.c.scholarship_id, scholarship.id,
+                               table.c.question_id, question_ids)
+    matching.mark_stale()
     app.db.session.commit()
 
     return flask.jsonify({
@@ -1030,15 +1399,21 @@ def remove_chosen_college_requirement(id):
     scholarship = scholarship_model.Scholarship.query.get_or_404(id)
 
     try:
-        for question_id in data:
-            question_id = int(question_id)
-            question = question_model.Question.query.get_or_404(question_id)
-
-            scholarship.remove_chosen_college_requirement(question)
-
+        question_ids = bulk_association.parse_ids(data)
     except ValueError:
         return errors.bad_request("invalid id")
 
+    found = bulk_association.resolve_ids(question_model.Question.query,
+                                         question_model.Question.id,
+                                         question_ids)
+
+    if len(found) < len(question_ids):
+        return errors.not_found("resource not found")
+
+    table = association_tables.chosen_college_requirement
+    bulk_association.remove_links(table.c.scholarship_id, scholarship.id,
+                                  table.c.question_id, question_ids)
+    matching.mark_stale()
     app.db.session.commit()
 
     return flask.jsonify({
@@ -1412,6 +1787,14 @@ def add_location_requirement(id):
             zip_code=zip_code, blacklist=blacklist)
 
     else:
+        lookup = geocodes.get_lookup()
+
+        if lookup is not None:
+            error = lookup.validate_location(state, county, place)
+
+            if error is not None:
+                return errors.bad_request(error)
+
         location = location_model.Location(
             state=state, county=county, place=place, blacklist=blacklist)
 
@@ -1501,6 +1884,83 @@ def get_location_requirements(id):
     })
 
 
+@scholarships_module.bp.route("/<int:id>/location_requirements/status")
+def get_location_status(id):
+    """
+    Checks if scholarship accepts or blacklists an address.
+
+    GET:
+        Args:
+            id (integer): scholarship id.
+
+        Query params:
+            state (string): student state.
+            county (string): student county.
+            place (string): student place.
+            zip_code (string): student zip code.
+
+    Responses:
+        200:
+            Returns accepted and blacklisted flags. A scholarship without
+            accepted locations accepts every address not blacklisted.
+
+            Produces:
+                Application/json.
+
+            Example::
+                {
+                    "accepted": true,
+                    "blacklisted": false
+                }
+
+        404:
+            scholarship not found.
+
+            Produces:
+                Application/json.
+    """
+    scholarship_model.Scholarship.query.get_or_404(id)
+
+    return flask.jsonify(
+        location_index.status(
+            location_index.SCHOLARSHIP, id,
+            location_index.address_from_args(flask.request.args)))
+
+
+@scholarships_module.bp.route("/location_requirements/accepting")
+def get_scholarships_accepting_location():
+    """
+    Gets scholarships accepting an address.
+
+    GET:
+        Query params:
+            state (string): student state.
+            county (string): student county.
+            place (string): student place.
+            zip_code (string): student zip code.
+
+    Responses:
+        200:
+            Returns ids of the scholarships whose accepted locations cover the
+            address and ids of the scholarships excluding it, either by
+            blacklist or by not accepting it. Scholarships with no
+            location requirements are in neither list.
+
+            Produces:
+                Application/json.
+
+            Example::
+                {
+                    "accepted": [scholarship id, ...],
+                    "excluded": [scholarship id, ...]
+                }
+    """
+    return flask.jsonify(
+        location_index.accepting(
+            location_index.SCHOLARSHIP,
+            location_index.address_from_args(flask.request.args)))
+
+
 @scholarships_module.bp.route(
     "/<int:id>/selection_requirements", methods=["POST"])
 def add_selection_requirement(id):
@@ -1692,15 +2152,18 @@ def add_options_to_selection_requirement(scholarship_id, question_id):
             "scholarship doesn't have selection requirement with question")
 
     try:
-        for option_id in data:
-            option = option_model.Option.query.get(int(option_id))
-
-            if option is not None:
-                selection_requirement.add_option(option)
-
+        option_ids = bulk_association.parse_ids(data)
     except ValueError:
         return errors.bad_request("option id must be an integer")
 
+    found = bulk_association.resolve_ids(option_model.Option.query,
+                                         option_model.Option.id, option_ids)
+    table = association_tables.selection_requirement_option
+    bulk_association.add_links(
+        table.c.selection_requirement_id, selection_requirement.id,
+        table.c.option_id,
+        [option_id for option_id in option_ids if option_id in found])
+    matching.mark_stale()
     app.db.session.commit()
 
     return flask.jsonify({
@@ -1766,13 +2229,21 @@ def delete_options_from_selection_requirement(scholarship_id, question_id):
             "scholarship doesn't have selection requirement with question")
 
     try:
-        for option_id in data:
-            option = option_model.Option.query.get_or_404(int(option_id))
-
-            selection_requirement.remove_option(option)
+        option_ids = bulk_association.parse_ids(data)
     except ValueError:
         return errors.bad_request("invalid id")
 
+    found = bulk_association.resolve_ids(option_model.Option.query,
+                                         option_model.Option.id, option_ids)
+
+    if len(found) < len(option_ids):
+        return errors.not_found("resource not found")
+
+    table = association_tables.selection_requirement_option
+    bulk_association.remove_links(table.c.selection_requirement_id,
+                                  selection_requirement.id,
+                                  table.c.option_id, option_ids)
+    matching.mark_stale()
     app.db.session.commit()
 
     return flask.jsonify({
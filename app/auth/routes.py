@@ -51,6 +51,10 @@ def login():
     if not user.check_password(password):
         return errors.unauthorized("invalid credentials")
 
+    if user.password_needs_rehash():
+        user.password = password
+        app.db.session.commit()
+
     response = flask.jsonify({"login": True})
 
     access_token = flask_jwt_extended.create_access_token(
@@ -116,6 +120,57 @@ def logout_all():
     return response
 
 
+@auth.bp.route("/logout/users", methods=["POST"])
+@flask_jwt_extended.jwt_required
+@security.role_required("administrator")
+def logout_users():
+    """Logs many users out of the application.
+
+    Revokes every token of the users with one UPDATE statement, for
+    administrators.
+
+    POST:
+        Consumes:
+            Application/json.
+
+        Request body:
+            users (list): usernames.
+
+            Example::
+                {
+                    "users": ["alice", "bob"]
+                }
+
+    Responses:
+        200:
+            Tokens revoked, returns number of tokens revoked.
+
+            Example::
+                {
+                    "revoked": 3
+                }
+        400:
+            No users provided.
+        403:
+            User is not an administrator.
+    """
+    data = flask.request.get_json() or {}
+
+    if not isinstance(data, dict):
+        return errors.bad_request("no data provided or bad structure")
+
+    users = data.get("users")
+
+    if not users or not isinstance(users, list) or not all(
+            isinstance(user, str) for user in users):
+        return errors.bad_request("no users provided")
+
+    revoked = security.revoke_all_users_tokens(users)
+    app.db.session.commit()
+
+    return flask.jsonify({"revoked": revoked})
+
+
 @auth.bp.route("/is_user_logged")
 @flask_jwt_extended.jwt_required
 def is_user_logged():
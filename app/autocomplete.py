@@ -0,0 +1,210 @@
+"""Typeahead over college, major, question, option and place names.
+
+Every kind of name gets a sorted prefix index kept in process memory, built
+from the database on first use and discarded after every commit changing
+one of its names, in this process or another one, so typeahead requests
+don't run LIKE queries. Names match from their start first, then from the
+start of any of their other words.
+"""
+import bisect
+import collections
+import itertools
+
+import app
+from app.matching import profile as profile_module
+from app.models import college_details as college_details_model
+from app.models import major as major_model
+from app.models import option as option_model
+from app.models import place as place_model
+from app.models import question as question_model
+from app.models.common import tracked_cache
+
+COLLEGE = "college"
+MAJOR = "major"
+QUESTION = "question"
+OPTION = "option"
+PLACE = "place"
+
+Source = collections.namedtuple("Source", ["model", "name", "key"])
+
+SOURCES = {
+    COLLEGE:
+    Source(college_details_model.CollegeDetails, "name", "college_id"),
+    MAJOR: Source(major_model.Major, "name", "id"),
+    QUESTION: Source(question_model.Question, "name", "id"),
+    OPTION: Source(option_model.Option, "name", "id"),
+    PLACE: Source(place_model.Place, "name", "fips_code")
+}
+
+
+class PrefixIndex(object):
+    """Sorted names searched by prefix.
+
+    Attributes:
+        names (list): sorted normalized names.
+        name_values (list): (key, name) of each entry of names.
+        words (list): sorted normalized names from their second word on,
+            one entry per word.
+        word_values (list): (key, name) of each entry of words.
+    """
+
+    __slots__ = ("names", "name_values", "words", "word_values")
+
+    def __init__(self, rows=()):
+        names, words = [], []
+
+        for key, name in rows:
+            normalized = profile_module.normalize(name)
+
+            if normalized is None:
+                continue
+
+            names.append((normalized, key, name))
+            split = normalized.split()
+
+            for i in range(1, len(split)):
+                words.append((" ".join(split[i:]), key, name))
+
+        names.sort()
+        words.sort()
+        self.names = [entry[0] for entry in names]
+        self.name_values = [entry[1:] for entry in names]
+        self.words = [entry[0] for entry in words]
+        self.word_values = [entry[1:] for entry in words]
+
+    def __repr__(self):
+        return f"<PrefixIndex {len(self.names)} names>"
+
+    @staticmethod
+    def _scan(keys, values, prefix):
+        i = bisect.bisect_left(keys, prefix)
+
+        while i < len(keys) and keys[i].startswith(prefix):
+            yield values[i]
+            i += 1
+
+    def search(self, prefix, limit=10):
+        """Gets names starting with prefix, or with a word starting with it.
+
+        Args:
+            prefix (string): prefix, case insensitive.
+            limit (integer): maximum number of names.
+
+        Returns:
+            list: (key, name) tuples, names starting with prefix first.
+        """
+        prefix = profile_module.normalize(prefix)
+
+        if prefix is None:
+            return []
+
+        results, seen = [], set()
+
+        for key, name in itertools.chain(
+                self._scan(self.names, self.name_values, prefix),
+                self._scan(self.words, self.word_values, prefix)):
+            if len(results) >= limit:
+                break
+
+            if key not in seen:
+                seen.add(key)
+                results.append((key, name))
+
+        return results
+
+
+def build_index(kind):
+    """Builds prefix index of kind names from the database.
+
+    Args:
+        kind (string): COLLEGE, MAJOR, QUESTION, OPTION or PLACE.
+
+    Returns:
+        PrefixIndex: prefix index.
+    """
+    source = SOURCES[kind]
+    query = app.db.session.query(
+        getattr(source.model, source.key), getattr(source.model, source.name))
+
+    return PrefixIndex(query.yield_per(1000))
+
+
+def get_index(kind):
+    """Gets prefix index of kind names of the current application.
+
+    Args:
+        kind (string): COLLEGE, MAJOR, QUESTION, OPTION or PLACE.
+
+    Returns:
+        PrefixIndex: prefix index, built on first use.
+    """
+    state = _cache.state()
+
+    if _cache.expired():
+        invalidate()
+
+    index = state["indexes"].get(kind)
+
+    if index is not None:
+        return index
+
+    with _cache.lock:
+        if kind not in state["indexes"]:
+            generation = state["generations"][kind]
+            index = build_index(kind)
+
+            if generation == state["generations"][kind]:
+                state["indexes"][kind] = index
+
+            return index
+
+        return state["indexes"][kind]
+
+
+def invalidate(*kinds):
+    """Discards prefix indexes of the current application.
+
+    Args:
+        kinds (string): kinds to discard, every kind if none.
+    """
+    state = _cache.state()
+
+    for kind in kinds or SOURCES:
+        state["generations"][kind] += 1
+        state["indexes"].pop(kind, None)
+
+
+def mark_stale(*kinds):
+    """Discards prefix indexes of names changed outside the ORM.
+
+    Indexes are discarded when the current transaction commits.
+
+    Args:
+        kinds (string): changed kinds.
+    """
+    _cache.mark(*kinds)
+
+
+def search(kind, prefix, limit=10):
+    """Gets kind names starting with prefix.
+
+    Args:
+        kind (string): COLLEGE, MAJOR, QUESTION, OPTION or PLACE.
+        prefix (string): prefix, case insensitive.
+        limit (integer): maximum number of names.
+
+    Returns:
+        list: (key, name) tuples, key is the college id, the major, question
+            or option id, or the place fips code.
+    """
+    return get_index(kind).search(prefix, limit)
+
+
+_MODEL_KINDS = {source.model: kind for kind, source in SOURCES.items()}
+
+_cache = tracked_cache.TrackedCache(
+    "autocomplete", tuple(_MODEL_KINDS),
+    lambda instance, change: [_MODEL_KINDS[type(instance)]],
+    lambda kinds: invalidate(*kinds),
+    lambda: {"indexes": {}, "generations": collections.Counter()},
+    [source.model.__table__.name for source in SOURCES.values()])
@@ -1,123 +1,94 @@
-# import os
+import click
 
-# from app import db
-# from app.models.consolidated_city import ConsolidatedCity
-# from app.models.county import County
-# from app.models.place import Place
-# from app.models.state import State
-# from app.scripts.us_states_prcss import process_fips_codes
+from app import geocodes, security
 
-# def _save_states(n_state):
-#     """Saves n states to database
 
-#     Saves n number states to database from spreadsheet file
+def register(app):
+    """Registers cli commands and groups
 
-#     Args:
-#         n_state (int): number of states to save to the database
-#     """
-#     GEOCODES_PATH = os.path.join(
-#         os.getcwd(), "static/files/geocodes/all-geocodes-v2016.xlsx")
+    Args:
+        app: app instance
+    """
 
-#     codes = process_fips_codes(GEOCODES_PATH)
-#     it = 0
-#     for state_code, state in codes.items():
-#         if it >= n_state:
-#             break
-#         state_instance = State(name=state["name"], fips_code=state_code)
-#         db.session.add(state_instance)
-#         for county_code, county in state["counties"].items():
-#             county_instance = County(
-#                 name=county["name"],
-#                 state=state_instance,
-#                 fips_code=state_code + county_code)
-#             db.session.add(county_instance)
-#         for place_code, place in state["places"].items():
-#             place_instance = Place(
-#                 name=place["name"],
-#                 state=state_instance,
-#                 fips_code=state_code + place_code)
-#             db.session.add(place_instance)
-#         for consolidated_city_code, consolidated_city in state[
-#                 "consolidated_cities"].items():
-#             consolidated_city_instance = ConsolidatedCity(
-#                 name=consolidated_city["name"],
-#                 state=state_instance,
-#                 fips_code=state_code + consolidated_city_code)
-#             db.session.add(consolidated_city_instance)
-#         it += 1
-#     db.session.commit()
+    @app.cli.group()
+    def tokens():
+        """Token blacklist commands group"""
+        pass
 
-# def register(app):
-#     """Registers cli commands and groups
+    @tokens.command()
+    @click.option(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="Tokens deleted per statement, defaults to "
+        "TOKEN_PRUNE_CHUNK_SIZE.")
+    def prune(chunk_size):
+        """Deletes expired tokens from the database"""
+        chunk_size = chunk_size or app.config["TOKEN_PRUNE_CHUNK_SIZE"]
+        print("MESSAGE:", " pruning expired tokens")
+        deleted = security.prune_expired_tokens(chunk_size)
+        print("SUCCESS:", f" {deleted} expired tokens deleted")
 
-#     Args:
-#         app: app instance
-#     """
+    @app.cli.group("geocodes")
+    def geocodes_group():
+        """Geocodes commands group"""
+        pass
 
-#     @app.cli.group()
-#     def geocodes():
-#         """Geocodes commands group"""
-#         pass
+    @geocodes_group.command("save_in_database")
+    @click.option(
+        "--path",
+        type=click.Path(exists=True, dir_okay=False),
+        default=None,
+        help="FIPS codes workbook, defaults to GEOCODES_PATH.")
+    @click.option(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Rows inserted per statement, defaults to GEOCODES_BATCH_SIZE.")
+    @click.option(
+        "--workers",
+        type=int,
+        default=0,
+        help="Processes saving states, 0 saves them in this process.")
+    @click.option(
+        "--resume",
+        is_flag=True,
+        help="Skip states saved by an interrupted import.")
+    def save_in_database(path, batch_size, workers, resume):
+        """Saves states and it's locations into the database"""
+        path = path or app.config["GEOCODES_PATH"]
+        batch_size = batch_size or app.config["GEOCODES_BATCH_SIZE"]
+        print("MESSAGE:", " importing geocodes from " + path)
+        counts = geocodes.import_geocodes(path, batch_size, workers, resume)
 
-#     #TODO: break function
-#     @geocodes.command()
-#     def save_in_database():
-#         """Saves states and it's locations into the database"""
+        if counts["skipped"]:
+            print("MESSAGE:",
+                  f" {counts['skipped']} states already saved, skipped")
 
-#         GEOCODES_PATH = os.path.join(
-#             os.getcwd(), "static/files/geocodes/all-geocodes-v2016.xlsx")
-#         print("MESSAGE:", " starting processing of file " + GEOCODES_PATH)
-#         codes = process_fips_codes(GEOCODES_PATH)
-#         print("MESSAGE: processing ended")
-#         print("MESSAGE: starting database data storage")
-#         for state_code, state in codes.items():
-#             print(
-#                 "MESSAGE:", "starting storage of state {} in database".format(
-#                     state["name"]))
-#             state_instance = State(name=state["name"], fips_code=state_code)
-#             db.session.add(state_instance)
-#             c_count = 0
-#             for county_code, county in state["counties"].items():
-#                 c_count += 1
-#                 print(
-#                     "MESSAGE:",
-#                     "saving county {} of {}".format(c_count,
-#                                                     len(state["counties"])),
-#                     end='\r')
-#                 county_instance = County(
-#                     name=county["name"],
-#                     state=state_instance,
-#                     fips_code=state_code + county_code)
-#                 db.session.add(county_instance)
-#             print("")
-#             p_count = 0
-#             for place_code, place in state["places"].items():
-#                 p_count += 1
-#                 print(
-#                     "MESSAGE:",
-#                     "saving place {} of {}".format(p_count,
-#                                                    len(state["places"])),
-#                     end='\r')
-#                 place_instance = Place(
-#                     name=place["name"],
-#                     state=state_instance,
-#                     fips_code=state_code + place_code)
-#                 db.session.add(place_instance)
-#             print("")
-#             cc_count = 0
-#             for consolidated_city_code, consolidated_city in state[
-#                     "consolidated_cities"].items():
-#                 cc_count += 1
-#                 print(
-#                     "MESSAGE:",
-#                     "saving consolidated city {} of {}".format(
-#                         cc_count, len(state["consolidated_cities"])),
-#                     end='\r')
-#                 consolidated_city_instance = ConsolidatedCity(
-#                     name=consolidated_city["name"],
-#                     state=state_instance,
-#                     fips_code=state_code + consolidated_city_code)
-#                 db.session.add(consolidated_city_instance)
-#             print("")
-#         db.session.commit()
-#         print("SUCCESS:", " US locations data stored in the database")
+        print(
+            "SUCCESS:", f" {counts['state']} states, {counts['county']} "
+            f"counties, {counts['place']} places and "
+            f"{counts['consolidated_city']} consolidated cities stored")
+
+    @geocodes_group.command("build_lookup")
+    @click.option(
+        "--path",
+        type=click.Path(exists=True, dir_okay=False),
+        default=None,
+        help="FIPS codes workbook, defaults to GEOCODES_PATH.")
+    @click.option(
+        "--output",
+        type=click.Path(dir_okay=False),
+        default=None,
+        help="Lookup table file, defaults to GEOCODES_LOOKUP_PATH.")
+    def build_lookup(path, output):
+        """Builds the memory mapped FIPS codes lookup table"""
+        path = path or app.config["GEOCODES_PATH"]
+        output = output or app.config["GEOCODES_LOOKUP_PATH"]
+
+        if not output:
+            raise click.UsageError("--output or GEOCODES_LOOKUP_PATH needed")
+
+        print("MESSAGE:", " building lookup table from " + path)
+        counts = geocodes.lookup.build(path, output)
+        print("SUCCESS:", f" {sum(counts.values())} codes written to {output}")
@@ -5,5 +5,14 @@ class LocationEntityError(Exception):
     pass
 
 
+class InvalidCursorError(Exception):
+    """Raised when a pagination cursor can't be decoded."""
+    pass
+
+
 def error_404(e):
     return flask.jsonify({"message": "resource not found"}), 404
+
+
+def invalid_cursor(e):
+    return flask.jsonify({"message": "invalid cursor"}), 400
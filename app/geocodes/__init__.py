@@ -0,0 +1,8 @@
+"""US states, counties, places and consolidated cities.
+
+Loads the census FIPS codes workbook into the database, and into a memory
+mapped lookup table used to validate location names.
+"""
+from app.geocodes.importer import (checkpointed_states, import_geocodes,
+                                   save_state)
+from app.geocodes.lookup import FipsLookup, get_lookup
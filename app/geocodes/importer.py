@@ -0,0 +1,223 @@
+"""Streaming, resumable import of the census FIPS codes workbook.
+
+The workbook is read one state at a time and every state is saved in its
+own transaction: its previous locations are replaced with executemany
+inserts of at most batch_size rows, and a checkpoint row is written with
+them. An interrupted import resumed with resume=True skips the states
+already checkpointed.
+
+States are saved by a pool of worker processes when workers is above zero,
+while the parent process keeps reading the workbook. At most two states per
+worker are waiting at any time, so memory stays bounded whatever the
+workbook size.
+"""
+import collections
+import concurrent.futures
+import datetime
+import types
+
+import flask
+import sqlalchemy
+
+import app
+from app import autocomplete
+from app.models import consolidated_city as consolidated_city_model
+from app.models import county as county_model
+from app.models import geocode_checkpoint as geocode_checkpoint_model
+from app.models import place as place_model
+from app.models import state as state_model
+from app.scripts import us_states_prcss
+
+TABLES = {
+    us_states_prcss.COUNTY: county_model.County.__table__,
+    us_states_prcss.PLACE: place_model.Place.__table__,
+    us_states_prcss.CITY: consolidated_city_model.ConsolidatedCity.__table__
+}
+
+# worker process application context.
+_context = None
+
+
+def save_state(state, codes, batch_size=5000):
+    """Replaces state and its locations, and checkpoints it.
+
+    Everything is written and committed in one transaction.
+
+    Args:
+        state (us_states_prcss.FipsCode): state code.
+        codes (list): FipsCode of the state locations.
+        batch_size (integer): rows inserted per statement.
+
+    Returns:
+        collections.Counter: rows inserted per kind.
+    """
+    connection = app.db.session.connection()
+    state_table = state_model.State.__table__
+    checkpoint_table = geocode_checkpoint_model.GeocodeCheckpoint.__table__
+    counts = collections.Counter()
+
+    try:
+        state_id = connection.execute(
+            sqlalchemy.select([state_table.c.id]).where(
+                state_table.c.fips_code == state.state_code)).scalar()
+
+        if state_id is None:
+            state_id = connection.execute(
+                state_table.insert(),
+                name=state.name,
+                fips_code=state.state_code).inserted_primary_key[0]
+        else:
+            connection.execute(state_table.update().where(
+                state_table.c.id == state_id).values(name=state.name))
+
+            for table in TABLES.values():
+                connection.execute(
+                    table.delete().where(table.c.state_id == state_id))
+
+        batches = {kind: [] for kind in TABLES}
+
+        def flush(kind):
+            if batches[kind]:
+                connection.execute(TABLES[kind].insert(), batches[kind])
+                counts[kind] += len(batches[kind])
+                batches[kind] = []
+
+        for fips in codes:
+            if fips.kind not in TABLES:
+                continue
+
+            batches[fips.kind].append({
+                "name": fips.name,
+                "fips_code": state.state_code + fips.code,
+                "state_id": state_id
+            })
+
+            if len(batches[fips.kind]) >= batch_size:
+                flush(fips.kind)
+
+        for kind in TABLES:
+            flush(kind)
+
+        connection.execute(checkpoint_table.delete().where(
+            checkpoint_table.c.state_fips == state.state_code))
+        connection.execute(
+            checkpoint_table.insert(),
+            state_fips=state.state_code,
+            rows=sum(counts.values()),
+            completed_at=datetime.datetime.utcnow())
+
+        autocomplete.mark_stale(autocomplete.PLACE)
+        app.db.session.commit()
+    except Exception:
+        app.db.session.rollback()
+        raise
+
+    counts[state.kind] += 1
+
+    return counts
+
+
+def _init_worker(config):
+    global _context
+    _context = app.create_app(config).app_context()
+    _context.push()
+
+
+def _worker_config():
+    config = {
+        key: value
+        for key, value in flask.current_app.config.items() if key.isupper()
+    }
+    # workers only write geocodes.
+    config.update(TESTING=True, TOKEN_PRUNE_INTERVAL=None)
+
+    return types.SimpleNamespace(**config)
+
+
+def checkpointed_states():
+    """Gets fips codes of the states saved by the last import.
+
+    Returns:
+        set: state fips codes.
+    """
+    GeocodeCheckpoint = geocode_checkpoint_model.GeocodeCheckpoint
+
+    return {
+        state_fips
+        for state_fips, in app.db.session.query(GeocodeCheckpoint.state_fips)
+    }
+
+
+def import_geocodes(filepath, batch_size=5000, workers=0, resume=False):
+    """Saves states and their locations from the FIPS codes workbook.
+
+    Args:
+        filepath (string): path of the xlsx file.
+        batch_size (integer): rows inserted per statement.
+        workers (integer): processes saving states, states are saved by the
+            calling process if 0.
+        resume (bool): skip states checkpointed by a previous import,
+            otherwise the checkpoints are cleared and every state is saved.
+
+    Returns:
+        collections.Counter: rows inserted per kind (state, county, place
+            and consolidated_city), and states skipped by a resumed import
+            (skipped).
+
+    Raises:
+        Exception: first error saving a state, states saved before it stay
+            checkpointed.
+    """
+    GeocodeCheckpoint = geocode_checkpoint_model.GeocodeCheckpoint
+    counts = collections.Counter()
+
+    if resume:
+        done = checkpointed_states()
+    else:
+        done = set()
+        GeocodeCheckpoint.query.delete()
+
+    app.db.session.commit()
+
+    def pending_states():
+        for state, codes in us_states_prcss.iter_fips_states(filepath):
+            if state.state_code in done:
+                counts["skipped"] += 1
+            else:
+                yield state, codes
+
+    states = pending_states()
+
+    if workers <= 0:
+        for state, codes in states:
+            counts.update(save_state(state, codes, batch_size))
+
+        return counts
+
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(_worker_config(), )) as executor:
+        pending = set()
+
+        try:
+            for state, codes in states:
+                if len(pending) >= workers * 2:
+                    finished, pending = concurrent.futures.wait(
+                        pending,
+                        return_when=concurrent.futures.FIRST_COMPLETED)
+
+                    for future in finished:
+                        counts.update(future.result())
+
+                pending.add(
+                    executor.submit(save_state, state, codes, batch_size))
+
+            for future in concurrent.futures.as_completed(pending):
+                counts.update(future.result())
+        except Exception:
+            for future in pending:
+                future.cancel()
+            raise
+
+    return counts
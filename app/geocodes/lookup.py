@@ -0,0 +1,319 @@
+"""Memory mapped lookup table of the census FIPS codes.
+
+The table is built once from the FIPS codes workbook with
+``flask geocodes build_lookup`` and opened from GEOCODES_LOOKUP_PATH. It
+holds, for every kind of location, a sorted array of numeric fips codes
+with the offsets of their names in a shared string pool, and a sorted array
+of name hashes with the fips code each name belongs to. Lookups are binary
+searches over memoryviews of the mapped file, so every worker process
+shares the same pages and nothing is parsed at start up.
+
+File layout, little endian, every section aligned to 8 bytes::
+
+    header      magic, version, number of names
+    counts      number of codes of each kind, in KINDS order
+    codes       per kind: sorted fips codes (uint32)
+    offsets     per kind: name offsets in the pool, plus its end (uint32)
+    hashes      sorted name hashes (uint64)
+    owners      fips code of each hashed name (uint32)
+    pool        utf-8 names
+"""
+import bisect
+import hashlib
+import mmap
+import os
+import struct
+import threading
+
+import flask
+
+from app.matching import profile as profile_module
+from app.scripts import us_states_prcss
+
+MAGIC = b"FIPS"
+VERSION = 1
+
+KINDS = (us_states_prcss.STATE, us_states_prcss.COUNTY,
+         us_states_prcss.PLACE, us_states_prcss.CITY)
+
+# digits of the full fips code of each kind.
+WIDTHS = {
+    us_states_prcss.STATE: 2,
+    us_states_prcss.COUNTY: 5,
+    us_states_prcss.PLACE: 7,
+    us_states_prcss.CITY: 7
+}
+
+# legal descriptions that may be left out of a location name, longest
+# first.
+SUFFIXES = ("city and borough", "census area", "municipality", "municipio",
+            "borough", "village", "county", "parish", "city", "town", "cdp")
+
+_HEADER = struct.Struct("<4sII")
+
+_lock = threading.Lock()
+
+
+def _align(size):
+    return size + -size % 8
+
+
+def name_hash(kind, state_fips, name):
+    """Hashes normalized location name.
+
+    Args:
+        kind (string): location kind.
+        state_fips (string): fips code of the location state, "" for states.
+        name (string): location name.
+
+    Returns:
+        integer: 64 bit hash.
+    """
+    key = f"{kind}\0{state_fips}\0{profile_module.normalize(name)}"
+
+    return int.from_bytes(
+        hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+
+
+def name_variants(name):
+    """Gets name with and without its legal description.
+
+    Args:
+        name (string): census location name, e.g. "Autauga County".
+
+    Returns:
+        list: name variants.
+    """
+    variants = [name]
+    normalized = profile_module.normalize(name) or ""
+
+    for suffix in SUFFIXES:
+        if normalized.endswith(" " + suffix):
+            variants.append(name[:-len(suffix) - 1])
+            break
+
+    return variants
+
+
+def build(workbook, output):
+    """Builds lookup table file from the FIPS codes workbook.
+
+    Args:
+        workbook (string): path of the xlsx file.
+        output (string): path of the lookup table file.
+
+    Returns:
+        dict: number of codes of each kind.
+    """
+    names = {kind: {} for kind in KINDS}
+    hashes = {}
+
+    for fips in us_states_prcss.iter_fips_codes(workbook):
+        if fips.kind not in names:
+            continue
+
+        code = fips.state_code + fips.code
+        state_fips = "" if fips.kind == us_states_prcss.STATE else \
+            fips.state_code
+        names[fips.kind][int(code)] = fips.name
+
+        for variant in name_variants(fips.name):
+            hashes.setdefault(
+                name_hash(fips.kind, state_fips, variant), int(code))
+
+    pool = bytearray()
+    codes, offsets = [], []
+
+    for kind in KINDS:
+        kind_codes = sorted(names[kind])
+        codes.append(kind_codes)
+        kind_offsets = []
+
+        for code in kind_codes:
+            kind_offsets.append(len(pool))
+            pool += names[kind][code].encode()
+
+        kind_offsets.append(len(pool))
+        offsets.append(kind_offsets)
+
+    sorted_hashes = sorted(hashes)
+    sections = [
+        _HEADER.pack(MAGIC, VERSION, len(sorted_hashes)),
+        struct.pack(f"<{len(KINDS)}I", *map(len, codes))
+    ]
+    sections += [struct.pack(f"<{len(c)}I", *c) for c in codes]
+    sections += [struct.pack(f"<{len(o)}I", *o) for o in offsets]
+    sections.append(struct.pack(f"<{len(sorted_hashes)}Q", *sorted_hashes))
+    sections.append(
+        struct.pack(f"<{len(sorted_hashes)}I",
+                    *[hashes[value] for value in sorted_hashes]))
+    sections.append(bytes(pool))
+
+    temporary = output + ".tmp"
+
+    with open(temporary, "wb") as file:
+        for section in sections:
+            file.write(section)
+            file.write(b"\0" * (_align(file.tell()) - file.tell()))
+
+    # replaced atomically, workers keep the file they mapped.
+    os.replace(temporary, output)
+
+    return {kind: len(kind_codes) for kind, kind_codes in zip(KINDS, codes)}
+
+
+class FipsLookup(object):
+    """Read only view of a lookup table file.
+
+    Attributes:
+        buffer: mapped file, or any bytes like object.
+        codes (dict): kind to memoryview of sorted fips codes.
+        offsets (dict): kind to memoryview of name offsets.
+        hashes (memoryview): sorted name hashes.
+        owners (memoryview): fips code of each hashed name.
+        pool (memoryview): utf-8 names.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        view = memoryview(buffer)
+        magic, version, n_names = _HEADER.unpack_from(view)
+
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a fips lookup table")
+
+        position = _align(_HEADER.size)
+        counts = struct.unpack_from(f"<{len(KINDS)}I", view, position)
+        position = _align(position + 4 * len(KINDS))
+
+        def section(length, format, size):
+            nonlocal position
+            start = position
+            position = _align(position + length * size)
+
+            return view[start:start + length * size].cast(format)
+
+        self.codes = {
+            kind: section(count, "I", 4)
+            for kind, count in zip(KINDS, counts)
+        }
+        self.offsets = {
+            kind: section(count + 1, "I", 4)
+            for kind, count in zip(KINDS, counts)
+        }
+        self.hashes = section(n_names, "Q", 8)
+        self.owners = section(n_names, "I", 4)
+        self.pool = view[position:]
+
+    def __repr__(self):
+        return f"<FipsLookup {len(self.hashes)} names>"
+
+    @classmethod
+    def open(cls, path):
+        """Maps lookup table file.
+
+        Args:
+            path (string): path of the lookup table file.
+
+        Returns:
+            FipsLookup: lookup table.
+        """
+        with open(path, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def name(self, kind, fips_code):
+        """Gets name of location.
+
+        Args:
+            kind (string): location kind.
+            fips_code (string): full fips code of the location.
+
+        Returns:
+            string: location name, None if fips code isn't found.
+        """
+        codes = self.codes[kind]
+        code = int(fips_code)
+        i = bisect.bisect_left(codes, code)
+
+        if i == len(codes) or codes[i] != code:
+            return None
+
+        offsets = self.offsets[kind]
+
+        return bytes(self.pool[offsets[i]:offsets[i + 1]]).decode()
+
+    def find(self, kind, name, state_fips=""):
+        """Gets fips code of location name.
+
+        Args:
+            kind (string): location kind.
+            name (string): location name, case insensitive and with or
+                without its legal description.
+            state_fips (string): fips code of the location state, "" for
+                states.
+
+        Returns:
+            string: full fips code, None if name isn't found.
+        """
+        value = name_hash(kind, state_fips, name)
+        i = bisect.bisect_left(self.hashes, value)
+
+        if i == len(self.hashes) or self.hashes[i] != value:
+            return None
+
+        return str(self.owners[i]).zfill(WIDTHS[kind])
+
+    def validate_location(self, state, county=None, place=None):
+        """Checks location names against the census codes.
+
+        Args:
+            state (string): state name.
+            county (string): county name.
+            place (string): place or consolidated city name.
+
+        Returns:
+            string: error message, None if location exists.
+        """
+        state_fips = self.find(us_states_prcss.STATE, state)
+
+        if state_fips is None:
+            return f"state {state} not found"
+
+        if county is not None and self.find(us_states_prcss.COUNTY, county,
+                                            state_fips) is None:
+            return f"county {county} not found in state {state}"
+
+        if place is not None and self.find(
+                us_states_prcss.PLACE, place, state_fips) is None and \
+                self.find(us_states_prcss.CITY, place, state_fips) is None:
+            return f"place {place} not found in state {state}"
+
+        return None
+
+    def close(self):
+        """Releases the views and the mapped file."""
+        views = list(self.codes.values()) + list(self.offsets.values())
+
+        for view in views + [self.hashes, self.owners, self.pool]:
+            view.release()
+
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+
+def get_lookup():
+    """Gets the lookup table of the current application.
+
+    Returns:
+        FipsLookup: lookup table mapped from GEOCODES_LOOKUP_PATH on first
+            use, None if it isn't set or the file doesn't exist.
+    """
+    extensions = flask.current_app.extensions
+
+    with _lock:
+        if "fips_lookup" not in extensions:
+            path = flask.current_app.config["GEOCODES_LOOKUP_PATH"]
+            extensions["fips_lookup"] = FipsLookup.open(path) if \
+                path and os.path.exists(path) else None
+
+        return extensions["fips_lookup"]
@@ -0,0 +1,12 @@
+"""Internal endpoints.
+
+Operational endpoints for administrators, like SQL metrics.
+
+Attributes:
+    bp: Flask blueprint
+"""
+import flask
+
+bp = flask.Blueprint("internal", __name__)
+
+from . import routes
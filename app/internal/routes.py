@@ -0,0 +1,75 @@
+import flask
+
+from app import profiling
+from app import security
+from app.internal import bp
+
+
+@bp.route("/metrics", methods=["GET"])
+@security.role_required("administrator")
+def get_metrics():
+    """Gets SQL metrics of the application endpoints.
+
+    Endpoints are sorted by total database time, heaviest first. Metrics are
+    kept in memory per process since startup or the last reset.
+
+    GET:
+
+    Responses:
+        200:
+            Successfully retrieves metrics.
+
+            Example::
+                {
+                    "sql_metrics_enabled": true,
+                    "endpoints": [
+                        {
+                            "endpoint": "colleges.get_colleges",
+                            "requests": 2,
+                            "queries": 6,
+                            "max_queries": 3,
+                            "mean_queries": 3.0,
+                            "db_time_ms": 1.52,
+                            "mean_db_time_ms": 0.76,
+                            "slowest": [
+                                {
+                                    "statement": "SELECT ...",
+                                    "duration_ms": 0.41
+                                }
+                            ]
+                        }
+                    ]
+                }
+
+            produces:
+                Application/json.
+        403:
+            User is not an administrator.
+    """
+    return flask.jsonify({
+        "sql_metrics_enabled":
+        bool(flask.current_app.config["SQL_METRICS_ENABLED"]),
+        "endpoints":
+        profiling.get_metrics()
+    })
+
+
+@bp.route("/metrics", methods=["DELETE"])
+@security.role_required("administrator")
+def delete_metrics():
+    """Resets SQL metrics of the application endpoints.
+
+    DELETE:
+
+    Responses:
+        200:
+            Metrics reset.
+
+            produces:
+                Application/json.
+        403:
+            User is not an administrator.
+    """
+    profiling.reset_metrics()
+
+    return flask.jsonify({"message": "metrics reset"})
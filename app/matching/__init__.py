@@ -0,0 +1,10 @@
+"""Scholarship matching.
+
+Compiles scholarship requirements into flat predicate programs kept in
+process memory, so student profiles can be matched against the whole
+catalogue without walking the ORM.
+"""
+from app.matching.batch import match_batch
+from app.matching.engine import (MatchingEngine, get_engine, invalidate,
+                                 mark_stale, match)
+from app.matching.profile import Profile
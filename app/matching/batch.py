@@ -0,0 +1,297 @@
+"""Batch matching of student profiles with numpy.
+
+The compiled engine is flattened into conjunctive normal form: the feature
+columns of every clause are stored back to back in one literals array and
+clause_starts holds the offset of each clause in it, while owner_starts
+holds the offset of each scholarship's first clause. A batch is evaluated
+with two reduceat calls, logical_or over the literal columns of each clause
+and logical_and over the clauses of each scholarship, instead of running
+the engine program once per profile.
+"""
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from app.matching import engine as engine_module
+
+# feature kinds of the profile feature matrix.
+ANSWER = "answer"
+OPTION = "option"
+PROGRAM = "program"
+COLLEGE = "college"
+GRADE = "grade"
+LOCATION = "location"
+
+
+class VectorizedEngine(object):
+    """Compiled engine flattened into numpy tables.
+
+    Every scholarship is expressed in conjunctive normal form over boolean
+    profile features: a scholarship qualifies when all its clauses hold and
+    a clause holds when any of its literals (feature columns) holds. A batch
+    of profiles is turned into a feature matrix with one row per profile and
+    the whole catalogue is evaluated with a handful of array operations.
+
+    Attributes:
+        ids (numpy.ndarray): sorted scholarship ids, one column per
+            scholarship.
+        features (dict): feature key to feature column.
+        literals (numpy.ndarray): feature column of every literal, grouped by
+            clause.
+        clause_starts (numpy.ndarray): offset of every clause in literals.
+        clause_owners (numpy.ndarray): scholarship column owning each clause
+            group, grouped by scholarship.
+        owner_starts (numpy.ndarray): offset of every scholarship in clauses.
+        grades (dict): grade id to grade column.
+        grade_features (list): (feature column, grade column, min, max).
+        location_index (LocationIndex): engine location requirements.
+        locations (list): (feature column, scholarship id) of the
+            scholarships with location requirements.
+        dependencies (list): (scholarship column, needed columns) of the
+            scholarships needing others, directly or transitively.
+        never (numpy.ndarray): columns of scholarships that never qualify.
+    """
+
+    def __init__(self, engine):
+        scholarships = engine.scholarships
+        self.ids = numpy.array(sorted(scholarships), dtype=numpy.int64)
+        columns = {id: column for column, id in enumerate(self.ids.tolist())}
+
+        self.features = {}
+        self.grades = {}
+        self.grade_features = []
+        self.location_index = engine.locations
+        self.locations = []
+        located = engine.locations.owners()
+
+        literals = []
+        clause_starts = []
+        clause_owners = []
+        owner_starts = []
+
+        for column, id in enumerate(self.ids.tolist()):
+            clauses = self._clauses(scholarships[id])
+
+            if id in located:
+                feature = self._feature((LOCATION, id))
+                self.locations.append((feature, id))
+                clauses.append([feature])
+
+            if not clauses:
+                continue
+
+            clause_owners.append(column)
+            owner_starts.append(len(clause_starts))
+
+            for clause in clauses:
+                clause_starts.append(len(literals))
+                literals.extend(clause)
+
+        self.literals = numpy.array(literals, dtype=numpy.intp)
+        self.clause_starts = numpy.array(clause_starts, dtype=numpy.intp)
+        self.clause_owners = numpy.array(clause_owners, dtype=numpy.intp)
+        self.owner_starts = numpy.array(owner_starts, dtype=numpy.intp)
+
+        self.dependencies = [
+            (columns[id], [columns[needed_id] for needed_id in needed])
+            for id, needed in ((id, scholarships[id].needed)
+                               for id in self.ids.tolist())
+            if needed and id not in engine.never
+        ]
+        self.never = numpy.array(
+            sorted(columns[id] for id in engine.never), dtype=numpy.intp)
+
+    def __repr__(self):
+        return f"<VectorizedEngine {len(self.ids)} scholarships>"
+
+    def _feature(self, key):
+        if key not in self.features:
+            self.features[key] = len(self.features)
+
+        return self.features[key]
+
+    def _clauses(self, scholarship):
+        clauses = []
+
+        for opcode, operand in scholarship.program:
+            if opcode == engine_module.BOOLEAN:
+                question_id, required_value = operand
+                clauses.append(
+                    [self._feature((ANSWER, question_id, required_value))])
+            elif opcode == engine_module.CHOSEN_COLLEGE:
+                college_id, question_ids = operand
+                clauses.append([self._feature((COLLEGE, college_id))])
+                clauses.extend([self._feature((ANSWER, question_id, True))]
+                               for question_id in sorted(question_ids))
+            elif opcode == engine_module.PROGRAM:
+                program_id, rounds = operand
+
+                if rounds:
+                    clauses.append([
+                        self._feature((PROGRAM, program_id, round_id))
+                        for round_id in sorted(rounds)
+                    ])
+                else:
+                    clauses.append([self._feature((PROGRAM, program_id,
+                                                   None))])
+            elif opcode == engine_module.SELECTION:
+                clauses.append([
+                    self._feature((OPTION, option_id))
+                    for option_id in sorted(operand)
+                ])
+            elif opcode == engine_module.GRADE_GROUP:
+                clause = []
+
+                for grade_id, range_min, range_max in operand:
+                    key = (GRADE, grade_id, range_min, range_max)
+                    new = key not in self.features
+                    feature = self._feature(key)
+                    clause.append(feature)
+
+                    if new:
+                        grade = self.grades.setdefault(grade_id,
+                                                       len(self.grades))
+                        self.grade_features.append((feature, grade, range_min,
+                                                    range_max))
+
+                clauses.append(clause)
+
+        return clauses
+
+    def feature_matrix(self, profiles):
+        """Builds boolean feature matrix of profiles.
+
+        Args:
+            profiles (list): Profile list.
+
+        Returns:
+            numpy.ndarray: (profiles, features) boolean matrix.
+        """
+        features = self.features
+        matrix = numpy.zeros((len(profiles), len(features)), dtype=bool)
+        grades = numpy.full((len(profiles), len(self.grades)), numpy.nan)
+        locations = {}
+        location_rows = numpy.zeros(len(profiles), dtype=numpy.intp)
+
+        for row, profile in enumerate(profiles):
+            keys = [(ANSWER, question_id, value)
+                    for question_id, value in profile.answers.items()]
+            keys.extend((OPTION, option_id) for option_id in profile.options)
+            keys.append((COLLEGE, profile.chosen_college))
+
+            for program_id, rounds in profile.programs.items():
+                keys.append((PROGRAM, program_id, None))
+                keys.extend(
+                    (PROGRAM, program_id, round_id) for round_id in rounds)
+
+            columns = [features[key] for key in keys if key in features]
+            matrix[row, columns] = True
+
+            for grade_id, value in profile.grades.items():
+                if grade_id in self.grades:
+                    grades[row, self.grades[grade_id]] = value
+
+            location_rows[row] = locations.setdefault(profile.location,
+                                                      len(locations))
+
+        if self.grade_features:
+            feature_columns, grade_columns, mins, maxs = map(
+                numpy.array, zip(*self.grade_features))
+            values = grades[:, grade_columns]
+
+            with numpy.errstate(invalid="ignore"):
+                matrix[:, feature_columns] = (values >= mins) & (values <=
+                                                                 maxs)
+
+        if self.locations:
+            # students share few distinct locations, evaluate each only once.
+            satisfied = numpy.ones((len(locations), len(self.locations)),
+                                   dtype=bool)
+
+            for location, row in locations.items():
+                excluded = self.location_index.excluded(location)
+                satisfied[row] = [
+                    id not in excluded for _, id in self.locations
+                ]
+
+            feature_columns = [feature for feature, _ in self.locations]
+            matrix[:, feature_columns] = satisfied[location_rows]
+
+        return matrix
+
+    def evaluate(self, profiles):
+        """Evaluates profiles against every scholarship.
+
+        Args:
+            profiles (list): Profile list.
+
+        Returns:
+            numpy.ndarray: (profiles, scholarships) boolean matrix, columns
+                follow ids.
+        """
+        qualifies = numpy.ones((len(profiles), len(self.ids)), dtype=bool)
+
+        if not profiles or not len(self.ids):
+            return qualifies
+
+        if len(self.literals):
+            matrix = self.feature_matrix(profiles)
+            clauses = numpy.logical_or.reduceat(
+                matrix[:, self.literals], self.clause_starts, axis=1)
+            qualifies[:, self.clause_owners] = numpy.logical_and.reduceat(
+                clauses, self.owner_starts, axis=1)
+
+        qualifies[:, self.never] = False
+        own = qualifies.copy()
+
+        for column, needed in self.dependencies:
+            qualifies[:, column] &= own[:, needed].all(axis=1)
+
+        return qualifies
+
+    def match(self, profiles):
+        """Gets the scholarships each student qualifies for.
+
+        Args:
+            profiles (list): Profile list.
+
+        Returns:
+            list: sorted scholarship ids list per profile.
+        """
+        qualifies = self.evaluate(profiles)
+
+        return [self.ids[row].tolist() for row in qualifies]
+
+
+def get_vectorized_engine():
+    """Gets the vectorized form of the current compiled engine.
+
+    Returns:
+        VectorizedEngine: vectorized engine, built once per compiled engine.
+    """
+    engine = engine_module.get_engine()
+
+    if engine.vectorized is None:
+        engine.vectorized = VectorizedEngine(engine)
+
+    return engine.vectorized
+
+
+def match_batch(profiles):
+    """Gets the scholarships each student of a batch qualifies for.
+
+    Profiles are evaluated together with numpy when it is installed,
+    otherwise one at a time with the compiled engine.
+
+    Args:
+        profiles (list): Profile list.
+
+    Returns:
+        list: sorted scholarship ids list per profile, in profiles order.
+    """
+    if numpy is None:
+        engine = engine_module.get_engine()
+        return [engine.match(profile) for profile in profiles]
+
+    return get_vectorized_engine().match(profiles)
@@ -0,0 +1,239 @@
+import collections
+
+import sqlalchemy
+
+import app
+from app.models import association_tables
+from app.models.common import tracked_cache
+
+
+class CycleError(ValueError):
+    """Raised when a dependency would make a scholarship need itself.
+
+    Attributes:
+        needs_id (integer): id of the scholarship needing.
+        needed_id (integer): id of the scholarship needed.
+    """
+
+    def __init__(self, needs_id, needed_id):
+        super().__init__(f"scholarship {needed_id} already needs scholarship "
+                         f"{needs_id}")
+        self.needs_id = needs_id
+        self.needed_id = needed_id
+
+
+class DependencyGraph(object):
+    """Transitive closure of the scholarships_needed graph.
+
+    Keeps, for every scholarship, every scholarship it needs directly or
+    transitively and every scholarship needing it, so prerequisite chains
+    are resolved with one lookup and cycles are detected before inserting a
+    dependency.
+
+    Attributes:
+        needs (dict): scholarship id to set of directly needed ids.
+        closure (dict): scholarship id to set of transitively needed ids.
+        needed_by (dict): scholarship id to set of ids transitively needing
+            it.
+        cyclic (set): ids of the scholarships part of a cycle, from rows
+            inserted without the cycle check of the routes.
+    """
+
+    def __init__(self, edges=()):
+        """Creates graph.
+
+        Args:
+            edges (iterable): (needs_id, needed_id) tuples.
+        """
+        self.needs = collections.defaultdict(set)
+        self.closure = collections.defaultdict(set)
+        self.needed_by = collections.defaultdict(set)
+        self.cyclic = set()
+
+        for needs_id, needed_id in edges:
+            self.needs[needs_id].add(needed_id)
+
+        for id in list(self.needs):
+            self.closure[id] = self._reachable(id)
+
+            for needed_id in self.closure[id]:
+                self.needed_by[needed_id].add(id)
+
+            if id in self.closure[id]:
+                self.cyclic.add(id)
+
+    def __repr__(self):
+        return f"<DependencyGraph {len(self.needs)} scholarships>"
+
+    @classmethod
+    def build(cls):
+        """Builds graph from the scholarships_needed table.
+
+        Returns:
+            DependencyGraph: dependency graph.
+        """
+        table = association_tables.scholarships_needed
+
+        return cls(
+            app.db.session.query(table.c.needs_id, table.c.needed_id))
+
+    def _reachable(self, id):
+        reachable = set()
+        stack = list(self.needs.get(id, ()))
+
+        while stack:
+            needed_id = stack.pop()
+
+            if needed_id not in reachable:
+                reachable.add(needed_id)
+                stack.extend(self.needs.get(needed_id, ()))
+
+        return reachable
+
+    def needed(self, id):
+        """Gets scholarships needed directly or transitively.
+
+        Args:
+            id (integer): scholarship id.
+
+        Returns:
+            set: needed scholarship ids.
+        """
+        return self.closure.get(id, set())
+
+    def creates_cycle(self, needs_id, needed_id):
+        """Checks if adding a dependency creates a cycle.
+
+        Args:
+            needs_id (integer): id of the scholarship needing.
+            needed_id (integer): id of the scholarship needed.
+
+        Returns:
+            bool: True if needed scholarship already needs the other one.
+        """
+        return needs_id == needed_id or needs_id in self.needed(needed_id)
+
+    def add(self, needs_id, needed_id):
+        """Adds dependency, updating the closure incrementally.
+
+        Args:
+            needs_id (integer): id of the scholarship needing.
+            needed_id (integer): id of the scholarship needed.
+
+        Raises:
+            CycleError: dependency creates a cycle.
+        """
+        if self.creates_cycle(needs_id, needed_id):
+            raise CycleError(needs_id, needed_id)
+
+        if needed_id in self.needs[needs_id]:
+            return
+
+        self.needs[needs_id].add(needed_id)
+
+        descendants = {needed_id} | self.needed(needed_id)
+        ancestors = {needs_id} | self.needed_by.get(needs_id, set())
+
+        for id in ancestors:
+            self.closure[id] |= descendants
+
+        for id in descendants:
+            self.needed_by[id] |= ancestors
+
+    def remove(self, needs_id, needed_id):
+        """Removes dependency, recomputing the closure of its ancestors.
+
+        Args:
+            needs_id (integer): id of the scholarship needing.
+            needed_id (integer): id of the scholarship needed.
+        """
+        if needed_id not in self.needs.get(needs_id, ()):
+            return
+
+        self.needs[needs_id].discard(needed_id)
+
+        for id in {needs_id} | self.needed_by.get(needs_id, set()):
+            closure = self._reachable(id)
+
+            for removed_id in self.closure[id] - closure:
+                self.needed_by[removed_id].discard(id)
+
+            self.closure[id] = closure
+
+            if id not in closure:
+                self.cyclic.discard(id)
+
+    def discard(self, id):
+        """Removes scholarship and every dependency from or to it.
+
+        Args:
+            id (integer): scholarship id.
+        """
+        for needed_id in list(self.needs.get(id, ())):
+            self.remove(id, needed_id)
+
+        for needs_id in [
+                needs_id for needs_id, needed in self.needs.items()
+                if id in needed
+        ]:
+            self.remove(needs_id, id)
+
+        self.needs.pop(id, None)
+        self.closure.pop(id, None)
+        self.needed_by.pop(id, None)
+        self.cyclic.discard(id)
+
+    def order(self):
+        """Gets scholarships in dependency order.
+
+        Needed scholarships come before the scholarships needing them.
+        Scholarships part of a cycle are left out.
+
+        Returns:
+            list: scholarship ids.
+        """
+        ids = set(self.needs) | set(self.needed_by)
+
+        return sorted(
+            ids - self.cyclic,
+            key=lambda id: (len(self.needed(id)), id))
+
+
+def check(needs_id, needed_ids):
+    """Checks that adding dependencies creates no cycle.
+
+    All new dependencies start from the same scholarship, so they can only
+    close a cycle if one of the needed scholarships already needs it. The
+    scholarships needing it are looked up with a recursive query, after
+    locking the scholarships_needed version row: transactions adding
+    dependencies wait for each other from the check to their commit, in
+    every process, so two of them can't each pass the check and commit a
+    cycle together.
+
+    Args:
+        needs_id (integer): id of the scholarship needing.
+        needed_ids (list): ids of the scholarships needed.
+
+    Raises:
+        CycleError: a dependency creates a cycle.
+    """
+    table = association_tables.scholarships_needed
+    tracked_cache.lock_table(table.name)
+
+    needing = sqlalchemy.select([
+        table.c.needs_id.label("id")
+    ]).where(table.c.needed_id == needs_id).cte("needing", recursive=True)
+    needing = needing.union(
+        sqlalchemy.select([table.c.needs_id
+                           ]).where(table.c.needed_id == needing.c.id))
+
+    # locking read, sees dependencies committed since the transaction began.
+    cyclic = {
+        id
+        for id, in app.db.session.query(needing.c.id).filter(
+            needing.c.id.in_(needed_ids)).with_for_update(read=True)
+    }
+
+    for needed_id in needed_ids:
+        if needed_id == needs_id or needed_id in cyclic:
+            raise CycleError(needs_id, needed_id)
@@ -0,0 +1,368 @@
+import collections
+
+import sqlalchemy
+
+import app
+from app.matching import dependencies
+from app.matching import location_index
+from app.models import association_tables
+from app.models import grade as grade_model
+from app.models import grade_requirement_group as grade_requirement_group_model
+from app.models import location as location_model
+from app.models import option as option_model
+from app.models import program as program_model
+from app.models import qualification_round as qualification_round_model
+from app.models import question as question_model
+from app.models import scholarship as scholarship_model
+from app.models.common import tracked_cache
+
+# predicate opcodes, ordered from cheapest to most expensive to evaluate.
+BOOLEAN = 0
+CHOSEN_COLLEGE = 1
+PROGRAM = 2
+SELECTION = 3
+GRADE_GROUP = 4
+
+# models whose changes invalidate the compiled engine.
+REQUIREMENT_MODELS = (
+    scholarship_model.Scholarship, association_tables.BooleanRequirement,
+    association_tables.SelectionRequirement,
+    association_tables.GradeRequirement, association_tables.ProgramRequirement,
+    grade_requirement_group_model.GradeRequirementGroup, grade_model.Grade,
+    location_model.Location, question_model.Question, option_model.Option,
+    program_model.Program, qualification_round_model.QualificationRound)
+
+# tables the engine is compiled from.
+REQUIREMENT_TABLES = [model.__table__.name for model in REQUIREMENT_MODELS] + [
+    association_tables.chosen_college_requirement.name,
+    association_tables.program_requirement_qualification_round.name,
+    association_tables.selection_requirement_option.name,
+    association_tables.scholarships_needed.name
+]
+
+_cache = tracked_cache.TrackedCache(
+    "matching", REQUIREMENT_MODELS, lambda instance, change: [True],
+    lambda keys: invalidate(), lambda: {"engine": None, "generation": 0},
+    REQUIREMENT_TABLES)
+
+
+def _boolean(profile, operand):
+    question_id, required_value = operand
+    return profile.answers.get(question_id) == required_value
+
+
+def _chosen_college(profile, operand):
+    college_id, question_ids = operand
+
+    if profile.chosen_college != college_id:
+        return False
+
+    return all(profile.answers.get(question_id) is True
+               for question_id in question_ids)
+
+
+def _program(profile, operand):
+    program_id, qualification_rounds = operand
+    student_rounds = profile.programs.get(program_id)
+
+    if student_rounds is None:
+        return False
+
+    return not qualification_rounds or \
+        not qualification_rounds.isdisjoint(student_rounds)
+
+
+def _selection(profile, operand):
+    return not operand.isdisjoint(profile.options)
+
+
+def _grade_group(profile, operand):
+    for grade_id, range_min, range_max in operand:
+        value = profile.grades.get(grade_id)
+
+        if value is not None and range_min <= value <= range_max:
+            return True
+
+    return False
+
+
+PREDICATES = {
+    BOOLEAN: _boolean,
+    CHOSEN_COLLEGE: _chosen_college,
+    PROGRAM: _program,
+    SELECTION: _selection,
+    GRADE_GROUP: _grade_group
+}
+
+
+class CompiledScholarship(object):
+    """Scholarship compiled into a flat predicate program.
+
+    Attributes:
+        id (integer): scholarship id.
+        college_id (integer): scholarship's college id.
+        program (tuple): (opcode, operand) predicates, all of them must hold
+            for a profile to qualify.
+        needed (tuple): ids of the scholarships needed, directly or
+            transitively.
+    """
+
+    __slots__ = ("id", "college_id", "program", "needed")
+
+    def __init__(self, id, college_id, program, needed):
+        self.id = id
+        self.college_id = college_id
+        self.program = program
+        self.needed = needed
+
+    def __repr__(self):
+        return f"<CompiledScholarship {self.id}>"
+
+    def evaluate(self, profile):
+        """Evaluates scholarship's own requirements.
+
+        Args:
+            profile (Profile): student profile.
+
+        Returns:
+            bool: True if profile satisfies every predicate.
+        """
+        for opcode, operand in self.program:
+            if not PREDICATES[opcode](profile, operand):
+                return False
+
+        return True
+
+
+class MatchingEngine(object):
+    """Evaluates student profiles against compiled scholarships.
+
+    Attributes:
+        scholarships (dict): scholarship id to CompiledScholarship.
+        locations (LocationIndex): location requirements by scholarship id.
+        never (frozenset): ids of the scholarships that never qualify, the
+            ones part of a cycle or needing a scholarship excluded from
+            match.
+        vectorized (VectorizedEngine): numpy tables of the engine, built on
+            first batch match.
+    """
+
+    def __init__(self, scholarships, locations=None, never=()):
+        self.scholarships = scholarships
+        self.locations = locations if locations is not None else \
+            location_index.LocationIndex()
+        self.never = frozenset(never)
+        self.vectorized = None
+
+    def __repr__(self):
+        return f"<MatchingEngine {len(self.scholarships)} scholarships>"
+
+    @classmethod
+    def compile(cls):
+        """Compiles every scholarship not excluded from match.
+
+        Each requirement table is read once, so compiling costs a fixed
+        number of queries regardless of the number of scholarships.
+
+        Returns:
+            MatchingEngine: compiled engine.
+        """
+        session = app.db.session
+        Scholarship = scholarship_model.Scholarship
+
+        scholarships = session.query(
+            Scholarship.id, Scholarship.college_id).filter(
+                sqlalchemy.or_(Scholarship.exclude_from_match.is_(None),
+                               Scholarship.exclude_from_match == False)).all()
+
+        college_ids = {id: college_id for id, college_id in scholarships}
+        programs = collections.defaultdict(list)
+
+        BooleanRequirement = association_tables.BooleanRequirement
+        for scholarship_id, question_id, required_value in session.query(
+                BooleanRequirement.scholarship_id,
+                BooleanRequirement.question_id,
+                BooleanRequirement.required_value):
+            if scholarship_id in college_ids:
+                programs[scholarship_id].append(
+                    (BOOLEAN, (question_id, bool(required_value))))
+
+        chosen_college = collections.defaultdict(set)
+        table = association_tables.chosen_college_requirement
+        for scholarship_id, question_id in session.query(
+                table.c.scholarship_id, table.c.question_id):
+            if scholarship_id in college_ids:
+                chosen_college[scholarship_id].add(question_id)
+
+        for scholarship_id, question_ids in chosen_college.items():
+            programs[scholarship_id].append(
+                (CHOSEN_COLLEGE, (college_ids[scholarship_id],
+                                  frozenset(question_ids))))
+
+        ProgramRequirement = association_tables.ProgramRequirement
+        table = association_tables.program_requirement_qualification_round
+        program_requirements = collections.defaultdict(set)
+        for scholarship_id, program_id, qualification_round_id in session.query(
+                ProgramRequirement.scholarship_id,
+                ProgramRequirement.program_id,
+                table.c.qualification_round_id).outerjoin(
+                    table,
+                    table.c.program_requirement_id == ProgramRequirement.id):
+            if scholarship_id in college_ids:
+                rounds = program_requirements[(scholarship_id, program_id)]
+
+                if qualification_round_id is not None:
+                    rounds.add(qualification_round_id)
+
+        for (scholarship_id, program_id), rounds in \
+                program_requirements.items():
+            programs[scholarship_id].append((PROGRAM, (program_id,
+                                                       frozenset(rounds))))
+
+        SelectionRequirement = association_tables.SelectionRequirement
+        table = association_tables.selection_requirement_option
+        selection_requirements = collections.defaultdict(set)
+        for scholarship_id, requirement_id, option_id in session.query(
+                SelectionRequirement.scholarship_id, SelectionRequirement.id,
+                table.c.option_id).join(
+                    table,
+                    table.c.selection_requirement_id == SelectionRequirement.id
+                ):
+            if scholarship_id in college_ids:
+                selection_requirements[(scholarship_id,
+                                        requirement_id)].add(option_id)
+
+        for (scholarship_id, _), options in selection_requirements.items():
+            programs[scholarship_id].append((SELECTION, frozenset(options)))
+
+        GradeRequirementGroup = \
+            grade_requirement_group_model.GradeRequirementGroup
+        GradeRequirement = association_tables.GradeRequirement
+        Grade = grade_model.Grade
+        grade_groups = collections.defaultdict(list)
+        for (scholarship_id, group_id, grade_id, range_min, range_max,
+             grade_min, grade_max) in session.query(
+                 GradeRequirementGroup.scholarship_id, GradeRequirementGroup.id,
+                 GradeRequirement.grade_id, GradeRequirement.range_min,
+                 GradeRequirement.range_max, Grade.min, Grade.max).join(
+                     GradeRequirement, GradeRequirement.
+                     grade_requirement_group_id == GradeRequirementGroup.id
+                 ).join(Grade, Grade.id == GradeRequirement.grade_id):
+            if scholarship_id in college_ids:
+                grade_groups[(scholarship_id, group_id)].append(
+                    (grade_id,
+                     float(range_min if range_min is not None else grade_min),
+                     float(range_max if range_max is not None else grade_max)))
+
+        for (scholarship_id, _), requirements in grade_groups.items():
+            programs[scholarship_id].append((GRADE_GROUP,
+                                             tuple(requirements)))
+
+        Location = location_model.Location
+        locations = location_index.LocationIndex(
+            row for row in session.query(
+                Location.scholarship_id, Location.state, Location.county,
+                Location.place, Location.zip_code, Location.blacklist)
+            if row[0] in college_ids)
+
+        graph = dependencies.DependencyGraph.build()
+
+        compiled = {}
+        never = set()
+        for scholarship_id, college_id in college_ids.items():
+            program = sorted(programs[scholarship_id], key=lambda p: p[0])
+            needed = graph.needed(scholarship_id)
+            compiled[scholarship_id] = CompiledScholarship(
+                scholarship_id, college_id, tuple(program),
+                tuple(sorted(needed)))
+
+            if scholarship_id in graph.cyclic or not needed.isdisjoint(
+                    graph.cyclic) or not needed <= college_ids.keys():
+                never.add(scholarship_id)
+
+        return cls(compiled, locations, never)
+
+    def match(self, profile):
+        """Gets the scholarships a student qualifies for.
+
+        A scholarship qualifies when the profile satisfies its own predicates
+        and the ones of every scholarship it needs, looked up in the
+        dependency closure.
+
+        Args:
+            profile (Profile): student profile.
+
+        Returns:
+            list: sorted ids of the scholarships the student qualifies for.
+        """
+        excluded = self.locations.excluded(profile.location)
+        own = {
+            scholarship.id: scholarship.id not in excluded
+            and scholarship.evaluate(profile)
+            for scholarship in self.scholarships.values()
+        }
+
+        return sorted(
+            scholarship.id for scholarship in self.scholarships.values()
+            if own[scholarship.id] and scholarship.id not in self.never
+            and all(own[needed_id] for needed_id in scholarship.needed))
+
+
+def get_engine():
+    """Gets the compiled engine of the current application.
+
+    The engine is compiled on first use and kept in process memory until a
+    commit, of this process or another one, changes any scholarship
+    requirement.
+
+    Returns:
+        MatchingEngine: compiled engine.
+    """
+    state = _cache.state()
+
+    if _cache.expired():
+        invalidate()
+
+    engine = state["engine"]
+
+    if engine is not None:
+        return engine
+
+    with _cache.lock:
+        if state["engine"] is None:
+            generation = state["generation"]
+            engine = MatchingEngine.compile()
+
+            if generation == state["generation"]:
+                state["engine"] = engine
+
+            return engine
+
+        return state["engine"]
+
+
+def invalidate():
+    """Discards the compiled engine of the current application."""
+    state = _cache.state()
+    state["generation"] += 1
+    state["engine"] = None
+
+
+def mark_stale():
+    """Discards the compiled engine after requirements changed outside the ORM.
+
+    The engine is discarded when the current transaction commits.
+    """
+    _cache.mark(True)
+
+
+def match(profile):
+    """Gets the scholarships a student qualifies for.
+
+    Args:
+        profile (Profile): student profile.
+
+    Returns:
+        list: sorted ids of the scholarships the student qualifies for.
+    """
+    return get_engine().match(profile)
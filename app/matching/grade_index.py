@@ -0,0 +1,351 @@
+import collections
+
+import app
+from app.models import association_tables
+from app.models import grade as grade_model
+from app.models import grade_requirement_group as grade_requirement_group_model
+from app.models.common import tracked_cache
+
+
+class IntervalTree(object):
+    """Centered interval tree over closed intervals.
+
+    Answers which intervals contain a value in O(log n + k).
+
+    Attributes:
+        center (float): node center.
+        by_min (list): (min, max, key) of the intervals containing center,
+            sorted by min.
+        by_max (list): (max, min, key) of the intervals containing center,
+            sorted by max in descending order.
+        left (IntervalTree): intervals entirely below center.
+        right (IntervalTree): intervals entirely above center.
+    """
+
+    __slots__ = ("center", "by_min", "by_max", "left", "right")
+
+    def __init__(self, intervals):
+        """Builds tree.
+
+        Args:
+            intervals (list): non empty list of (min, max, key).
+        """
+        endpoints = sorted(
+            endpoint for interval in intervals for endpoint in interval[:2])
+        self.center = endpoints[len(endpoints) // 2]
+
+        below = []
+        above = []
+        here = []
+
+        for interval in intervals:
+            if interval[1] < self.center:
+                below.append(interval)
+            elif interval[0] > self.center:
+                above.append(interval)
+            else:
+                here.append(interval)
+
+        self.by_min = sorted(here, key=lambda interval: interval[0])
+        self.by_max = sorted(((range_max, range_min, key)
+                              for range_min, range_max, key in here),
+                             key=lambda interval: -interval[0])
+        self.left = IntervalTree(below) if below else None
+        self.right = IntervalTree(above) if above else None
+
+    def stab(self, value):
+        """Gets keys of the intervals containing value.
+
+        Args:
+            value (float): value to look up.
+
+        Returns:
+            list: interval keys.
+        """
+        keys = []
+        node = self
+
+        while node is not None:
+            if value < node.center:
+                for range_min, _, key in node.by_min:
+                    if range_min > value:
+                        break
+                    keys.append(key)
+
+                node = node.left
+            elif value > node.center:
+                for range_max, _, key in node.by_max:
+                    if range_max < value:
+                        break
+                    keys.append(key)
+
+                node = node.right
+            else:
+                keys.extend(key for _, _, key in node.by_min)
+                node = None
+
+        return keys
+
+
+class GradeIndex(object):
+    """Per grade interval index of grade requirements.
+
+    Grade requirements without range_min or range_max fall back to the
+    grade's min and max, same as GradeRequirement.min and
+    GradeRequirement.max. Trees are rebuilt lazily, only for the grades
+    touched since the last lookup.
+
+    Attributes:
+        intervals (dict): grade id to dict of group id to list of (min, max).
+        bounds (dict): grade id to (min, max).
+        trees (dict): grade id to IntervalTree, None if the grade has no
+            requirements.
+    """
+
+    def __init__(self, rows=()):
+        """Creates index.
+
+        Args:
+            rows (iterable): (group id, grade id, range_min, range_max,
+                grade min, grade max) tuples.
+        """
+        self.intervals = collections.defaultdict(
+            lambda: collections.defaultdict(list))
+        self.bounds = {}
+        self.trees = {}
+
+        for row in rows:
+            self._add(*row)
+
+    def __repr__(self):
+        return f"<GradeIndex {len(self.intervals)} grades>"
+
+    @staticmethod
+    def _query():
+        GradeRequirement = association_tables.GradeRequirement
+        Grade = grade_model.Grade
+
+        return app.db.session.query(
+            GradeRequirement.grade_requirement_group_id,
+            GradeRequirement.grade_id, GradeRequirement.range_min,
+            GradeRequirement.range_max, Grade.min,
+            Grade.max).join(Grade, Grade.id == GradeRequirement.grade_id)
+
+    @classmethod
+    def build(cls):
+        """Builds index of every grade requirement.
+
+        Returns:
+            GradeIndex: grade index.
+        """
+        return cls(cls._query())
+
+    def _add(self, group_id, grade_id, range_min, range_max, grade_min,
+             grade_max):
+        self.bounds[grade_id] = (grade_min, grade_max)
+        self.intervals[grade_id][group_id].append((range_min, range_max))
+        self.trees.pop(grade_id, None)
+
+    def _tree(self, grade_id):
+        if grade_id in self.trees:
+            return self.trees[grade_id]
+
+        grade_min, grade_max = self.bounds.get(grade_id, (None, None))
+        intervals = []
+
+        for group_id, ranges in self.intervals.get(grade_id, {}).items():
+            for range_min, range_max in ranges:
+                range_min = range_min if range_min is not None else grade_min
+                range_max = range_max if range_max is not None else grade_max
+                intervals.append((float(range_min), float(range_max),
+                                  group_id))
+
+        tree = IntervalTree(intervals) if intervals else None
+        self.trees[grade_id] = tree
+
+        return tree
+
+    def refresh_group(self, group_id):
+        """Reloads grade requirements of a grade requirement group.
+
+        Args:
+            group_id (integer): grade requirement group id.
+        """
+        GradeRequirement = association_tables.GradeRequirement
+
+        for grade_id, groups in self.intervals.items():
+            if groups.pop(group_id, None) is not None:
+                self.trees.pop(grade_id, None)
+
+        for row in self._query().filter(
+                GradeRequirement.grade_requirement_group_id == group_id):
+            self._add(*row)
+
+    def refresh_grade(self, grade_id):
+        """Reloads grade requirements of a grade.
+
+        Needed when grade's min or max change or grade is deleted.
+
+        Args:
+            grade_id (integer): grade id.
+        """
+        GradeRequirement = association_tables.GradeRequirement
+
+        self.intervals.pop(grade_id, None)
+        self.bounds.pop(grade_id, None)
+        self.trees.pop(grade_id, None)
+
+        for row in self._query().filter(
+                GradeRequirement.grade_id == grade_id):
+            self._add(*row)
+
+    def groups(self, grade_id, value):
+        """Gets grade requirement groups satisfied by a grade value.
+
+        Args:
+            grade_id (integer): grade id.
+            value (float): grade value.
+
+        Returns:
+            set: grade requirement group ids.
+        """
+        tree = self._tree(grade_id)
+
+        if tree is None:
+            return set()
+
+        return set(tree.stab(float(value)))
+
+    def satisfied_groups(self, grades):
+        """Gets grade requirement groups satisfied by student grades.
+
+        Args:
+            grades (dict): grade id to grade value.
+
+        Returns:
+            set: grade requirement group ids.
+        """
+        groups = set()
+
+        for grade_id, value in grades.items():
+            groups |= self.groups(grade_id, value)
+
+        return groups
+
+
+def _refresh_stale(state):
+    """Reloads groups and grades changed since the last lookup.
+
+    Must be called holding the cache lock.
+    """
+    index = state["index"]
+
+    for group_id in state["groups"]:
+        index.refresh_group(group_id)
+
+    for grade_id in state["grades"]:
+        index.refresh_grade(grade_id)
+
+    state["groups"].clear()
+    state["grades"].clear()
+
+
+def get_grade_index():
+    """Gets the grade index of the current application.
+
+    Returns:
+        GradeIndex: grade index, built on first use.
+    """
+    state = _cache.state()
+    expired = _cache.expired()
+
+    with _cache.lock:
+        if state["index"] is None or expired:
+            state["index"] = GradeIndex.build()
+            state["groups"].clear()
+            state["grades"].clear()
+        else:
+            _refresh_stale(state)
+
+        return state["index"]
+
+
+def groups(grade_id, value):
+    """Gets grade requirement groups satisfied by a grade value.
+
+    Args:
+        grade_id (integer): grade id.
+        value (float): grade value.
+
+    Returns:
+        list: sorted grade requirement group ids.
+    """
+    index = get_grade_index()
+
+    with _cache.lock:
+        return sorted(index.groups(grade_id, value))
+
+
+def refresh_group(group_id):
+    """Refreshes grade requirement group in the current application index.
+
+    The group is reloaded on the next lookup. Changes made through the ORM
+    are refreshed when their transaction commits, this is only needed for
+    changes made outside of it.
+
+    Args:
+        group_id (integer): grade requirement group id.
+    """
+    state = _cache.state()
+
+    with _cache.lock:
+        if state["index"] is not None:
+            state["groups"].add(group_id)
+
+
+def refresh_grade(grade_id):
+    """Refreshes grade in the current application index.
+
+    The grade is reloaded on the next lookup, see refresh_group.
+
+    Args:
+        grade_id (integer): grade id.
+    """
+    state = _cache.state()
+
+    with _cache.lock:
+        if state["index"] is not None:
+            state["grades"].add(grade_id)
+
+
+def _stale_keys(instance, change):
+    GradeRequirement = association_tables.GradeRequirement
+    GradeRequirementGroup = grade_requirement_group_model.GradeRequirementGroup
+
+    if isinstance(instance, GradeRequirementGroup):
+        return [("groups", instance.id)]
+
+    if isinstance(instance, GradeRequirement):
+        return [("groups", group_id) for group_id in
+                tracked_cache.attribute_values(instance,
+                                               "grade_requirement_group_id")]
+
+    return [("grades", instance.id)]
+
+
+def _refresh_on_commit(keys):
+    state = _cache.state()
+
+    with _cache.lock:
+        if state["index"] is not None:
+            for kind, id in keys:
+                state[kind].add(id)
+
+
+_MODELS = (grade_model.Grade, association_tables.GradeRequirement,
+           grade_requirement_group_model.GradeRequirementGroup)
+
+_cache = tracked_cache.TrackedCache(
+    "grade_index", _MODELS, _stale_keys, _refresh_on_commit,
+    lambda: {"index": None, "groups": set(), "grades": set()},
+    [model.__table__.name for model in _MODELS])
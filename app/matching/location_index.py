@@ -0,0 +1,413 @@
+import collections
+
+import app
+from app.matching import profile as profile_module
+from app.models import college as college_model
+from app.models import location as location_model
+from app.models import scholarship as scholarship_model
+from app.models.common import tracked_cache
+
+SCHOLARSHIP = "scholarship"
+COLLEGE = "college"
+
+
+class Node(object):
+    """Location index node.
+
+    Attributes:
+        accepted (set): owners accepting every address under the node.
+        blacklisted (set): owners blacklisting every address under the node.
+        children (dict): child name to Node.
+    """
+
+    __slots__ = ("accepted", "blacklisted", "children")
+
+    def __init__(self):
+        self.accepted = set()
+        self.blacklisted = set()
+        self.children = {}
+
+    def owners(self, blacklist):
+        return self.blacklisted if blacklist else self.accepted
+
+
+class LocationIndex(object):
+    """Hierarchical index of location requirements.
+
+    State, county and place requirements are kept in a state -> county ->
+    place tree and zip code requirements in a hash table, so the
+    requirements covering an address are found in a fixed number of
+    lookups, whatever the number of location requirements.
+
+    Owners are opaque hashable keys, scholarship ids for the matching engine
+    or (kind, id) tuples for the application index. An owner excludes an
+    address when any of its blacklisted locations covers it, or when it has
+    accepted locations and none of them covers it. Blacklist takes
+    precedence.
+
+    Attributes:
+        root (Node): states tree root.
+        zip_codes (dict): zip code to Node.
+        restricted (collections.Counter): owner to number of accepted
+            locations.
+        entries (dict): owner to list of (location, blacklist).
+    """
+
+    def __init__(self, rows=()):
+        """Creates index.
+
+        Args:
+            rows (iterable): (owner, state, county, place, zip_code,
+                blacklist) tuples.
+        """
+        self.root = Node()
+        self.zip_codes = {}
+        self.restricted = collections.Counter()
+        self.entries = collections.defaultdict(list)
+
+        for row in rows:
+            self.add(*row)
+
+    def __repr__(self):
+        return f"<LocationIndex {len(self.entries)} owners>"
+
+    def _node(self, location, create=False):
+        state, county, place, zip_code = location
+
+        if zip_code is not None:
+            children, path = self.zip_codes, [zip_code]
+        else:
+            children = self.root.children
+            path = [
+                name for name in (state, county, place) if name is not None
+            ]
+
+        node = None
+        for name in path:
+            node = children.get(name)
+
+            if node is None:
+                if not create:
+                    return None
+
+                node = children[name] = Node()
+
+            children = node.children
+
+        return node
+
+    def add(self, owner, state, county, place, zip_code, blacklist):
+        """Adds location requirement.
+
+        Locations without zip code nor state are ignored, they can't cover
+        any address.
+
+        Args:
+            owner (hashable): location requirement owner.
+            state (string): location state.
+            county (string): location county.
+            place (string): location place.
+            zip_code (string): location zip code.
+            blacklist (bool): True if location is blacklisted.
+        """
+        location = profile_module.normalize_location(state, county, place,
+                                                     zip_code)
+
+        if location[0] is None and location[3] is None:
+            return
+
+        blacklist = bool(blacklist)
+        self._node(location, create=True).owners(blacklist).add(owner)
+        self.entries[owner].append((location, blacklist))
+
+        if not blacklist:
+            self.restricted[owner] += 1
+
+    def remove(self, owner):
+        """Removes every location requirement of owner.
+
+        Args:
+            owner (hashable): location requirement owner.
+        """
+        for location, blacklist in self.entries.pop(owner, []):
+            node = self._node(location)
+
+            if node is not None:
+                node.owners(blacklist).discard(owner)
+
+        self.restricted.pop(owner, None)
+
+    def owners(self):
+        """Gets owners with location requirements.
+
+        Returns:
+            set: owners.
+        """
+        return set(self.entries)
+
+    def matches(self, location):
+        """Gets owners whose location requirements cover an address.
+
+        Args:
+            location (tuple): normalized (state, county, place, zip_code).
+
+        Returns:
+            tuple: (accepted, blacklisted) owner sets.
+        """
+        accepted = set()
+        blacklisted = set()
+
+        if location is None:
+            return accepted, blacklisted
+
+        state, county, place, zip_code = location
+        nodes = []
+
+        if zip_code is not None:
+            nodes.append(self.zip_codes.get(zip_code))
+
+            if len(zip_code) > 5:
+                nodes.append(self.zip_codes.get(zip_code[:5]))
+
+        node = self.root
+        for name in (state, county, place):
+            if name is None:
+                break
+
+            node = node.children.get(name)
+
+            if node is None:
+                break
+
+            nodes.append(node)
+
+        for node in nodes:
+            if node is not None:
+                accepted |= node.accepted
+                blacklisted |= node.blacklisted
+
+        return accepted, blacklisted
+
+    def excluded(self, location):
+        """Gets owners excluding an address.
+
+        An unknown address (None) is excluded by every owner with accepted
+        locations.
+
+        Args:
+            location (tuple): normalized (state, county, place, zip_code).
+
+        Returns:
+            set: owners excluding the address.
+        """
+        accepted, blacklisted = self.matches(location)
+
+        return blacklisted | (set(self.restricted) - accepted)
+
+    def status(self, owner, location):
+        """Checks if an owner accepts or blacklists an address.
+
+        Args:
+            owner (hashable): location requirement owner.
+            location (tuple): normalized (state, county, place, zip_code).
+
+        Returns:
+            dict: accepted and blacklisted flags.
+        """
+        accepted, blacklisted = self.matches(location)
+        is_blacklisted = owner in blacklisted
+
+        return {
+            "accepted":
+            not is_blacklisted and (owner in accepted
+                                    or owner not in self.restricted),
+            "blacklisted":
+            is_blacklisted
+        }
+
+    def accepting(self, location):
+        """Gets owners whose accepted locations cover an address.
+
+        Owners without accepted locations accept every address not
+        blacklisted and are left out.
+
+        Args:
+            location (tuple): normalized (state, county, place, zip_code).
+
+        Returns:
+            set: owners accepting the address.
+        """
+        accepted, blacklisted = self.matches(location)
+
+        return accepted - blacklisted
+
+
+def _rows(query):
+    for (scholarship_id, college_id, state, county, place, zip_code,
+         blacklist) in query:
+        if scholarship_id is not None:
+            yield ((SCHOLARSHIP, scholarship_id), state, county, place,
+                   zip_code, blacklist)
+
+        if college_id is not None:
+            yield ((COLLEGE, college_id), state, county, place, zip_code,
+                   blacklist)
+
+
+def _query():
+    Location = location_model.Location
+
+    return app.db.session.query(Location.scholarship_id, Location.college_id,
+                                Location.state, Location.county,
+                                Location.place, Location.zip_code,
+                                Location.blacklist)
+
+
+def address_from_args(args):
+    """Gets normalized student address from request args.
+
+    Args:
+        args (dict): request args with state, county, place and zip_code.
+
+    Returns:
+        tuple: normalized (state, county, place, zip_code), None if no field
+            is provided.
+    """
+    location = profile_module.normalize_location(
+        args.get("state"), args.get("county"), args.get("place"),
+        args.get("zip_code"))
+
+    return location if any(location) else None
+
+
+def _refresh_stale(state):
+    """Reloads owners changed since the last lookup.
+
+    Must be called holding the cache lock.
+    """
+    index = state["index"]
+    Location = location_model.Location
+
+    for kind, id in state["owners"]:
+        column = Location.scholarship_id if kind == SCHOLARSHIP else \
+            Location.college_id
+        index.remove((kind, id))
+
+        for row in _rows(_query().filter(column == id)):
+            if row[0] == (kind, id):
+                index.add(*row)
+
+    state["owners"].clear()
+
+
+def get_location_index():
+    """Gets the location index of the current application.
+
+    Owners are (kind, id) tuples, kind being SCHOLARSHIP or COLLEGE.
+
+    Returns:
+        LocationIndex: location index, built on first use.
+    """
+    state = _cache.state()
+    expired = _cache.expired()
+
+    with _cache.lock:
+        if state["index"] is None or expired:
+            state["index"] = LocationIndex(_rows(_query()))
+            state["owners"].clear()
+        else:
+            _refresh_stale(state)
+
+        return state["index"]
+
+
+def refresh(kind, id):
+    """Reloads location requirements of a scholarship or college.
+
+    The owner is reloaded on the next lookup. Changes made through the ORM
+    are refreshed when their transaction commits, this is only needed for
+    changes made outside of it.
+
+    Args:
+        kind (string): SCHOLARSHIP or COLLEGE.
+        id (integer): scholarship or college id.
+    """
+    state = _cache.state()
+
+    with _cache.lock:
+        if state["index"] is not None:
+            state["owners"].add((kind, id))
+
+
+def status(kind, id, location):
+    """Checks if a scholarship or college accepts or blacklists an address.
+
+    Args:
+        kind (string): SCHOLARSHIP or COLLEGE.
+        id (integer): scholarship or college id.
+        location (tuple): normalized (state, county, place, zip_code).
+
+    Returns:
+        dict: accepted and blacklisted flags.
+    """
+    index = get_location_index()
+
+    with _cache.lock:
+        return index.status((kind, id), location)
+
+
+def accepting(kind, location):
+    """Gets scholarships or colleges whose accepted locations cover an address.
+
+    Args:
+        kind (string): SCHOLARSHIP or COLLEGE.
+        location (tuple): normalized (state, county, place, zip_code).
+
+    Returns:
+        dict: sorted "accepted" ids and sorted "excluded" ids.
+    """
+    index = get_location_index()
+
+    with _cache.lock:
+        accepted = index.accepting(location)
+        excluded = index.excluded(location)
+
+    return {
+        "accepted": sorted(id for owner_kind, id in accepted
+                           if owner_kind == kind),
+        "excluded": sorted(id for owner_kind, id in excluded
+                           if owner_kind == kind)
+    }
+
+
+def _stale_owners(instance, change):
+    if isinstance(instance, location_model.Location):
+        scholarship_ids = tracked_cache.attribute_values(
+            instance, "scholarship_id")
+        college_ids = tracked_cache.attribute_values(instance, "college_id")
+
+        return [(SCHOLARSHIP, id) for id in scholarship_ids] + \
+            [(COLLEGE, id) for id in college_ids]
+
+    if change != tracked_cache.DELETE:
+        return []
+
+    if isinstance(instance, scholarship_model.Scholarship):
+        return [(SCHOLARSHIP, instance.id)]
+
+    return [(COLLEGE, instance.id)]
+
+
+def _refresh_on_commit(owners):
+    state = _cache.state()
+
+    with _cache.lock:
+        if state["index"] is not None:
+            state["owners"] |= owners
+
+
+_cache = tracked_cache.TrackedCache(
+    "location_index", (location_model.Location, scholarship_model.Scholarship,
+                       college_model.College), _stale_owners,
+    _refresh_on_commit, lambda: {"index": None, "owners": set()},
+    [location_model.Location.__table__.name])
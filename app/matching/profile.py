@@ -0,0 +1,127 @@
+def normalize(value):
+    """Normalizes location name for comparison.
+
+    Args:
+        value (string): state, county, place or zip code.
+
+    Returns:
+        string: stripped and case folded value, None if value is empty.
+    """
+    if value is None:
+        return None
+
+    value = str(value).strip().casefold()
+
+    return value if value else None
+
+
+def normalize_location(state=None, county=None, place=None, zip_code=None):
+    """Normalizes location fields.
+
+    Returns:
+        tuple: normalized (state, county, place, zip_code).
+    """
+    return (normalize(state), normalize(county), normalize(place),
+            normalize(zip_code))
+
+
+class Profile(object):
+    """Student profile matched against compiled scholarships.
+
+    Attributes:
+        grades (dict): grade id to grade value.
+        answers (dict): question id to boolean answer.
+        options (frozenset): ids of the options selected by the student.
+        location (tuple): normalized (state, county, place, zip_code), None
+            if the student location is unknown.
+        programs (dict): program id to frozenset of qualification round ids.
+        chosen_college (integer): id of the college chosen by the student.
+    """
+
+    __slots__ = ("grades", "answers", "options", "location", "programs",
+                 "chosen_college")
+
+    def __init__(self,
+                 grades=None,
+                 answers=None,
+                 options=None,
+                 location=None,
+                 programs=None,
+                 chosen_college=None):
+        self.grades = grades or {}
+        self.answers = answers or {}
+        self.options = frozenset(options or ())
+        self.location = location
+        self.programs = programs or {}
+        self.chosen_college = chosen_college
+
+    @classmethod
+    def from_dict(cls, data):
+        """Creates profile from request data.
+
+        Args:
+            data (dict): student profile.
+
+            Example::
+                {
+                    "grades": [{"grade_id": grade id, "value": 3.5}],
+                    "answers": [{"question_id": question id, "value": 1}],
+                    "options": [option id, ...],
+                    "location": {
+                        "state": state,
+                        "county": county,
+                        "place": place,
+                        "zip_code": zip code
+                    },
+                    "programs": [
+                        {
+                            "program_id": program id,
+                            "qualification_rounds": [round id, ...]
+                        }
+                    ],
+                    "chosen_college": college id
+                }
+
+        Returns:
+            Profile: student profile.
+
+        Raises:
+            KeyError: missing fields in data.
+            ValueError: invalid id, grade value or answer value.
+            TypeError: badly structured data.
+        """
+        if not isinstance(data, dict):
+            raise TypeError("profile must be a dictionary")
+
+        grades = {}
+        for grade in data.get("grades") or []:
+            grades[int(grade["grade_id"])] = float(grade["value"])
+
+        answers = {}
+        for answer in data.get("answers") or []:
+            if answer["value"] not in [1, 0]:
+                raise ValueError("answer value must be either 1 or 0")
+
+            answers[int(answer["question_id"])] = answer["value"] == 1
+
+        options = [int(option_id) for option_id in data.get("options") or []]
+
+        location = None
+        if data.get("location"):
+            address = data["location"]
+            location = normalize_location(
+                address.get("state"), address.get("county"),
+                address.get("place"), address.get("zip_code"))
+
+        programs = {}
+        for program in data.get("programs") or []:
+            programs[int(program["program_id"])] = frozenset(
+                int(round_id)
+                for round_id in program.get("qualification_rounds") or [])
+
+        chosen_college = data.get("chosen_college")
+        if chosen_college is not None:
+            chosen_college = int(chosen_college)
+
+        return cls(grades, answers, options, location, programs,
+                   chosen_college)
@@ -1,4 +1,5 @@
 from . import (association_tables, college, scholarship, scholarship_details,
                program, qualification_round, question, token_blacklist, user,
                college_details, major, grade, detail, submission,
-               grade_requirement_group, location, option)
+               grade_requirement_group, location, option, state, county,
+               place, consolidated_city, geocode_checkpoint, table_version)
@@ -8,35 +8,53 @@ college_major = app.db.Table(
     "college_major",
     app.db.Column("college_id", app.db.Integer,
                   app.db.ForeignKey("college.id")),
-    app.db.Column("major_id", app.db.Integer, app.db.ForeignKey("major.id")))
+    app.db.Column("major_id", app.db.Integer, app.db.ForeignKey("major.id")),
+    app.db.Index("uq_college_major", "college_id", "major_id", unique=True),
+    app.db.Index("ix_college_major_major_id", "major_id", "college_id"))
 
 program_qualification_round = app.db.Table(
     "program_qualification_round",
     app.db.Column("program_id", app.db.Integer,
                   app.db.ForeignKey("program.id")),
     app.db.Column("qualification_round_id", app.db.Integer,
-                  app.db.ForeignKey("qualification_round.id")))
+                  app.db.ForeignKey("qualification_round.id")),
+    app.db.Index("uq_program_qualification_round",
+                 "program_id", "qualification_round_id", unique=True),
+    app.db.Index("ix_program_qualification_round_qualification_round_id",
+                 "qualification_round_id", "program_id"))
 
 scholarships_needed = app.db.Table(
     "scholarships_needed",
     app.db.Column("needs_id", app.db.Integer,
                   app.db.ForeignKey("scholarship.id")),
     app.db.Column("needed_id", app.db.Integer,
-                  app.db.ForeignKey("scholarship.id")))
+                  app.db.ForeignKey("scholarship.id")),
+    app.db.Index("uq_scholarships_needed", "needs_id", "needed_id",
+                 unique=True),
+    app.db.Index("ix_scholarships_needed_needed_id", "needed_id", "needs_id"))
 
 program_requirement_qualification_round = app.db.Table(
     "program_requirement_qualification_round",
     app.db.Column("program_requirement_id", app.db.Integer,
                   app.db.ForeignKey("program_requirement.id")),
     app.db.Column("qualification_round_id", app.db.Integer,
-                  app.db.ForeignKey("qualification_round.id")))
+                  app.db.ForeignKey("qualification_round.id")),
+    app.db.Index("uq_program_requirement_qualification_round",
+                 "program_requirement_id", "qualification_round_id",
+                 unique=True),
+    app.db.Index("ix_program_requirement_qualification_round_round_id",
+                 "qualification_round_id", "program_requirement_id"))
 
 chosen_college_requirement = app.db.Table(
     "chosen_college_requirement",
     app.db.Column("scholarship_id", app.db.Integer,
                   app.db.ForeignKey("scholarship.id")),
     app.db.Column("question_id", app.db.Integer,
-                  app.db.ForeignKey("question.id")))
+                  app.db.ForeignKey("question.id")),
+    app.db.Index("uq_chosen_college_requirement",
+                 "scholarship_id", "question_id", unique=True),
+    app.db.Index("ix_chosen_college_requirement_question_id",
+                 "question_id", "scholarship_id"))
 
 
 class ProgramRequirement(app.db.Model, base_mixin.BaseMixin,
@@ -65,7 +83,10 @@ class ProgramRequirement(app.db.Model, base_mixin.BaseMixin,
         "program_id",
         app.db.Integer,
         app.db.ForeignKey("program.id"),
-        nullable=False)
+        nullable=False,
+        index=True)
+    __table_args__ = (app.db.Index("ix_program_requirement_scholarship_id",
+                                   "scholarship_id", "program_id"),)
     program = app.db.relationship("Program")
     qualification_rounds = app.db.relationship(
         "QualificationRound",
@@ -138,8 +159,13 @@ class BooleanRequirement(app.db.Model, base_mixin.BaseMixin,
     id = app.db.Column(app.db.Integer, primary_key=True)
     scholarship_id = app.db.Column("scholarship_id", app.db.Integer,
                                    app.db.ForeignKey("scholarship.id"))
-    question_id = app.db.Column("question_id", app.db.Integer,
-                                app.db.ForeignKey("question.id"))
+    question_id = app.db.Column(
+        "question_id",
+        app.db.Integer,
+        app.db.ForeignKey("question.id"),
+        index=True)
+    __table_args__ = (app.db.Index("ix_boolean_requirement_scholarship_id",
+                                   "scholarship_id", "question_id"),)
 
     question = app.db.relationship("Question")
     required_value = app.db.Column(app.db.Boolean, default=True)
@@ -175,7 +201,11 @@ class GradeRequirement(app.db.Model, base_mixin.BaseMixin,
     id = app.db.Column(app.db.Integer, primary_key=True)
     grade_requirement_group_id = app.db.Column(
         app.db.Integer, app.db.ForeignKey("grade_requirement_group.id"))
-    grade_id = app.db.Column(app.db.Integer, app.db.ForeignKey("grade.id"))
+    grade_id = app.db.Column(
+        app.db.Integer, app.db.ForeignKey("grade.id"), index=True)
+    __table_args__ = (app.db.Index(
+        "ix_grade_requirement_grade_requirement_group_id",
+        "grade_requirement_group_id", "grade_id"),)
     grade = app.db.relationship("Grade")
     range_min = app.db.Column(app.db.Numeric(8, 2), nullable=True)
     range_max = app.db.Column(app.db.Numeric(8, 2), nullable=True)
@@ -216,13 +246,20 @@ selection_requirement_option = app.db.Table(
     "selection_requirement_option",
     app.db.Column("selection_requirement_id", app.db.Integer,
                   app.db.ForeignKey("selection_requirement.id")),
-    app.db.Column("option_id", app.db.Integer, app.db.ForeignKey("option.id")))
+    app.db.Column("option_id", app.db.Integer, app.db.ForeignKey("option.id")),
+    app.db.Index("uq_selection_requirement_option",
+                 "selection_requirement_id", "option_id", unique=True),
+    app.db.Index("ix_selection_requirement_option_option_id",
+                 "option_id", "selection_requirement_id"))
 
 question_option = app.db.Table(
     "question_option",
     app.db.Column("question_id", app.db.Integer,
                   app.db.ForeignKey("question.id")),
-    app.db.Column("option_id", app.db.Integer, app.db.ForeignKey("option.id")))
+    app.db.Column("option_id", app.db.Integer, app.db.ForeignKey("option.id")),
+    app.db.Index("uq_question_option", "question_id", "option_id",
+                 unique=True),
+    app.db.Index("ix_question_option_option_id", "option_id", "question_id"))
 
 
 class SelectionRequirement(app.db.Model, base_mixin.BaseMixin,
@@ -240,8 +277,10 @@ class SelectionRequirement(app.db.Model, base_mixin.BaseMixin,
     id = app.db.Column(app.db.Integer, primary_key=True)
     scholarship_id = app.db.Column(app.db.Integer,
                                    app.db.ForeignKey("scholarship.id"))
-    question_id = app.db.Column(app.db.Integer,
-                                app.db.ForeignKey("question.id"))
+    question_id = app.db.Column(
+        app.db.Integer, app.db.ForeignKey("question.id"), index=True)
+    __table_args__ = (app.db.Index("ix_selection_requirement_scholarship_id",
+                                   "scholarship_id", "question_id"),)
     description = app.db.Column(app.db.String(512), nullable=True)
     question = app.db.relationship("Question")
     options = app.db.relationship(
@@ -25,6 +25,9 @@ class College(app.db.Model, paginated_api_mixin.PaginatedAPIMixin,
     """
     id = app.db.Column(app.db.Integer, primary_key=True)
     str_repr = "college"
+    EAGER_LOADS = ("college_details",)
+    JSON_CACHE = True
+    JSON_CACHE_RELATED = ("college_details",)
     college_details = app.db.relationship(
         "CollegeDetails",
         uselist=False,
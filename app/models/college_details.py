@@ -15,9 +15,11 @@ class CollegeDetails(app.db.Model, date_audit.DateAudit, base_mixin.BaseMixin):
     religious_affiliation = app.db.Column(app.db.String(256), nullable=True)
     setting = app.db.Column(app.db.String(256), nullable=True)
     number_of_students = app.db.Column(app.db.Integer, nullable=True)
-    college_id = app.db.Column(app.db.Integer, app.db.ForeignKey("college.id"))
+    college_id = app.db.Column(
+        app.db.Integer, app.db.ForeignKey("college.id"), index=True)
 
     str_repr = "college_details"
+    JSON_CACHE_OWNER = ("college", "college_id")
 
     ATTR_FIELDS = [
         "name", "room_and_board", "type_of_institution", "phone", "website",
@@ -0,0 +1,163 @@
+"""Bulk changes of many to many association tables.
+
+Endpoints adding or removing lists of ids resolve them with one IN query
+and write the links with a single multi-row INSERT, or delete them with a
+single DELETE, instead of loading and checking every id on its own.
+
+Association tables have a unique index on (owner, target), so on SQLite
+and MySQL links are inserted with INSERT OR IGNORE / INSERT IGNORE, and
+concurrent requests adding the same link don't conflict. Other databases
+read the links the owner already has first.
+
+Links are written with core statements, so session flush listeners don't
+see them. Callers flag the caches built from the table themselves, e.g.
+with matching.mark_stale().
+"""
+import sqlalchemy
+
+import app
+
+# insert prefix skipping rows that break a unique index, per dialect.
+IGNORE_PREFIXES = {"sqlite": "OR IGNORE", "mysql": "IGNORE"}
+
+
+def parse_ids(ids):
+    """Converts submitted ids to integers.
+
+    Args:
+        ids (list): submitted ids.
+
+    Returns:
+        list: integer ids, without duplicates, in submitted order.
+
+    Raises:
+        ValueError: an id isn't an integer.
+    """
+    try:
+        return list(dict.fromkeys(int(id) for id in ids))
+    except TypeError:
+        raise ValueError("ids must be integers")
+
+
+def resolve_ids(query, column, ids):
+    """Gets ids matching rows of query.
+
+    Args:
+        query (sqlalchemy.Query): rows ids may belong to, e.g. a dynamic
+            relationship.
+        column (sqlalchemy.Column): id column of the rows.
+        ids (list): integer ids.
+
+    Returns:
+        set: ids of existing rows.
+    """
+    if not ids:
+        return set()
+
+    return {
+        id
+        for id, in query.with_entities(column).filter(column.in_(ids))
+    }
+
+
+def linked_ids(owner_column, owner_id, target_column, ids):
+    """Gets ids owner is linked to.
+
+    Args:
+        owner_column (sqlalchemy.Column): owner column of the association
+            table.
+        owner_id (integer): owner id.
+        target_column (sqlalchemy.Column): target column of the same table.
+        ids (list): target ids to check.
+
+    Returns:
+        set: target ids linked to owner.
+    """
+    if not ids:
+        return set()
+
+    select = sqlalchemy.select([target_column]).where(
+        sqlalchemy.and_(owner_column == owner_id, target_column.in_(ids)))
+
+    return {id for id, in app.db.session.execute(select)}
+
+
+def insert_ignore(table, rows):
+    """Inserts rows, skipping the ones already in a unique index.
+
+    Args:
+        table (sqlalchemy.Table): table with a unique index.
+        rows (list): dicts of column values.
+
+    Returns:
+        integer: rows inserted, None if the database can't skip rows, in
+            which case nothing is inserted.
+    """
+    prefix = IGNORE_PREFIXES.get(app.db.session.connection().dialect.name)
+
+    if prefix is None:
+        return None
+
+    if not rows:
+        return 0
+
+    return app.db.session.execute(
+        table.insert().values(rows).prefix_with(prefix)).rowcount
+
+
+def add_links(owner_column, owner_id, target_column, ids):
+    """Links owner to the targets it isn't linked to yet.
+
+    Args:
+        owner_column (sqlalchemy.Column): owner column of the association
+            table.
+        owner_id (integer): owner id.
+        target_column (sqlalchemy.Column): target column of the same table.
+        ids (list): existing target ids.
+
+    Returns:
+        integer: links added.
+    """
+    def rows(ids):
+        return [{
+            owner_column.name: owner_id,
+            target_column.name: id
+        } for id in ids]
+
+    added = insert_ignore(owner_column.table, rows(ids))
+
+    if added is not None:
+        return added
+
+    existing = linked_ids(owner_column, owner_id, target_column, ids)
+    missing = [id for id in ids if id not in existing]
+
+    if missing:
+        app.db.session.execute(owner_column.table.insert().values(
+            rows(missing)))
+
+    return len(missing)
+
+
+def remove_links(owner_column, owner_id, target_column, ids):
+    """Unlinks owner from targets.
+
+    Args:
+        owner_column (sqlalchemy.Column): owner column of the association
+            table.
+        owner_id (integer): owner id.
+        target_column (sqlalchemy.Column): target column of the same table.
+        ids (list): target ids.
+
+    Returns:
+        list: target ids unlinked.
+    """
+    existing = linked_ids(owner_column, owner_id, target_column, ids)
+    removed = [id for id in ids if id in existing]
+
+    if removed:
+        app.db.session.execute(owner_column.table.delete().where(
+            sqlalchemy.and_(owner_column == owner_id,
+                            target_column.in_(removed))))
+
+    return removed
@@ -1,13 +1,18 @@
 from datetime import datetime
 
+from sqlalchemy.dialects import mysql
+
 from app import db
 
 
 class DateAudit(object):
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # microseconds on MySQL too, cached JSON is validated against it.
     updated_at = db.Column(
-        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+        db.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"),
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow)
 
     def audit_dates(self):
         """
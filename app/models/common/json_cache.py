@@ -0,0 +1,189 @@
+"""Serialized JSON of catalogue entities.
+
+Models with JSON_CACHE set keep the encoded JSON of their to_dict and
+for_pagination output in process memory, so responses listing them splice
+cached fragments instead of building dicts, generating urls and encoding
+them on every request. Models serialized inside their owner's output name
+it with JSON_CACHE_OWNER, a (table name, owner id attribute) tuple.
+
+Every fragment keeps the updated_at of the rows it was built from, the
+entity's and the ones of its JSON_CACHE_RELATED relationships, and is only
+served while the rows loaded by the request still have them. Entities
+changed by other processes are rebuilt on their next use, and a body is
+never older than the conditional GET validator sent with it. Updated and
+deleted entities, and entities whose owned rows were inserted, updated or
+deleted, are also discarded when the transaction commits, like the
+matching engine and the autocomplete indexes.
+"""
+import re
+import uuid
+
+import flask
+import sqlalchemy
+
+from app.models.common import tracked_cache
+
+
+class Fragment(object):
+    """Encoded JSON value, written verbatim by JSONEncoder.
+
+    Attributes:
+        json (string): encoded value.
+    """
+
+    __slots__ = ("json", )
+
+    def __init__(self, json):
+        self.json = json
+
+    def __repr__(self):
+        return f"<Fragment {self.json[:40]}>"
+
+
+class JSONEncoder(flask.json.JSONEncoder):
+    """Application JSON encoder splicing fragments."""
+
+    def encode(self, o):
+        fragments = []
+        token = uuid.uuid4().hex
+
+        def replace(value):
+            if isinstance(value, Fragment):
+                fragments.append(value.json)
+                return f"{token}:{len(fragments) - 1}"
+
+            if isinstance(value, dict):
+                return {key: replace(item) for key, item in value.items()}
+
+            if isinstance(value, (list, tuple)):
+                return [replace(item) for item in value]
+
+            return value
+
+        encoded = super().encode(replace(o))
+
+        if not fragments:
+            return encoded
+
+        return re.sub(f'"{token}:(\\d+)"',
+                      lambda match: fragments[int(match.group(1))], encoded)
+
+    def default(self, o):
+        # encoders not going through encode, e.g. iterencode.
+        if isinstance(o, Fragment):
+            return flask.json.loads(o.json)
+
+        return super().default(o)
+
+
+def _is_clean(session):
+    """Checks session has no changes the cache doesn't know about yet."""
+    return not (session.new or session.dirty or session.deleted or
+                _cache.pending(session))
+
+
+def _validator(instance):
+    """Gets updated_at of the rows instance is serialized from."""
+    rows = [instance] + [
+        getattr(instance, name) for name in instance.JSON_CACHE_RELATED
+    ]
+
+    return tuple(getattr(row, "updated_at", None) for row in rows)
+
+
+def serialize(instance, method="to_dict"):
+    """Gets serialized instance.
+
+    Args:
+        instance (sqlalchemy.Model): model instance.
+        method (string): serializing method, to_dict or for_pagination.
+
+    Returns:
+        Fragment: cached JSON of the method output, or the output itself if
+            the model isn't cached or the session has uncommitted changes.
+    """
+    size = flask.current_app.config["JSON_CACHE_SIZE"]
+    instance_state = sqlalchemy.inspect(instance)
+    session = instance_state.session
+
+    if not getattr(instance, "JSON_CACHE", False) or not size or \
+            not instance_state.persistent or not _is_clean(session):
+        return getattr(instance, method)()
+
+    state = _cache.state()
+    entity = (instance.__tablename__, instance_state.identity)
+    script_root = flask.request.script_root if \
+        flask.has_request_context() else ""
+    key = (method, script_root)
+    validator = _validator(instance)
+    cached = state["entries"].get(entity, {}).get(key)
+
+    if cached is not None and cached[0] == validator:
+        return cached[1]
+
+    # generation the rows were read at, entries invalidated since then
+    # would be stored stale.
+    generation = session.info.get("json_cache_generation")
+    fragment = Fragment(
+        flask.json.dumps(getattr(instance, method)(), separators=(",", ":")))
+
+    with _cache.lock:
+        if generation is not None and generation == state["generation"]:
+            entries = state["entries"]
+
+            if entity not in entries and len(entries) >= size:
+                del entries[next(iter(entries))]
+
+            entries.setdefault(entity, {})[key] = (validator, fragment)
+
+    return fragment
+
+
+def invalidate(*entities):
+    """Discards serialized entities of the current application.
+
+    Args:
+        entities (tuple): (table name, identity) of the entities, every
+            entity if none.
+    """
+    state = _cache.state()
+
+    with _cache.lock:
+        state["generation"] += 1
+
+        if not entities:
+            state["entries"].clear()
+
+        for entity in entities:
+            state["entries"].pop(entity, None)
+
+
+def _stale_entities(instance, change):
+    entities = set()
+    model = type(instance)
+
+    # inserted entities can't be cached yet, only their owner changes.
+    if getattr(model, "JSON_CACHE", False) and \
+            change != tracked_cache.INSERT:
+        entities.add((instance.__tablename__,
+                      sqlalchemy.inspect(instance).identity))
+
+    owner = getattr(model, "JSON_CACHE_OWNER", None)
+
+    if owner is not None:
+        table, attribute = owner
+        entities.add((table, (getattr(instance, attribute), )))
+
+    return entities
+
+
+_cache = tracked_cache.TrackedCache(
+    "json_cache", None, _stale_entities,
+    lambda entities: invalidate(*entities),
+    lambda: {"entries": {}, "generation": 0})
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "after_begin")
+def _record_generation(session, transaction, connection):
+    if flask.has_app_context():
+        session.info["json_cache_generation"] = _cache.state()["generation"]
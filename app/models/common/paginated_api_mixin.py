@@ -1,20 +1,171 @@
 from typing import Any, Optional
 from urllib import parse
 
+import sqlalchemy
 from flask import url_for
+from sqlalchemy import orm
 from flask_sqlalchemy.model import Model as SqlalchemyModel
 
+from app import utils
+from app.models.common import json_cache
+
+
+# dialects sorting NULLs first in ascending order and last in descending
+# order, without NULLS FIRST / NULLS LAST.
+NULLS_FIRST_DIALECTS = {"sqlite", "mysql"}
+
+
+def _nullable(column):
+    return getattr(column.expression, "nullable", False)
+
+
+def _after(column, value, reverse=False):
+    """Compares column with a cursor value, NULLs sorting first."""
+    if value is None:
+        return sqlalchemy.false() if reverse else column.isnot(None)
+
+    if reverse and _nullable(column):
+        return sqlalchemy.or_(column < value, column.is_(None))
+
+    return column < value if reverse else column > value
+
+
+def keyset_condition(columns, values, reverse=False):
+    """Builds condition selecting rows after (or before) a cursor.
+
+    Expands the row comparison (c1, c2, ...) > (v1, v2, ...) into
+    c1 > v1 OR (c1 = v1 AND c2 > v2) OR ..., supported by every database.
+    NULLs sort before every value, see order_by.
+
+    Args:
+        columns (list): ordering columns.
+        values (list): cursor values, one per column.
+        reverse (bool): select rows before the cursor instead.
+
+    Returns:
+        sqlalchemy expression: keyset condition.
+    """
+    clauses = []
+
+    for index, column in enumerate(columns):
+        equal = [
+            columns[i].is_(None) if values[i] is None else
+            columns[i] == values[i] for i in range(index)
+        ]
+        clauses.append(
+            sqlalchemy.and_(*equal, _after(column, values[index], reverse)))
+
+    return sqlalchemy.or_(*clauses)
+
+
+def order_by(columns, dialect, reverse=False):
+    """Builds keyset ordering, NULLs first in ascending order.
+
+    Args:
+        columns (list): ordering columns.
+        dialect (string): database dialect name.
+        reverse (bool): descending order.
+
+    Returns:
+        list: ORDER BY clauses.
+    """
+    clauses = []
+
+    for column in columns:
+        clause = column.desc() if reverse else column.asc()
+
+        if _nullable(column) and dialect not in NULLS_FIRST_DIALECTS:
+            clause = clause.nullslast() if reverse else clause.nullsfirst()
+
+        clauses.append(clause)
+
+    return clauses
+
+
+def eager_load_options(entity, relationships):
+    """Builds loader options for relationships used by for_pagination.
+
+    Many to one and one to one relationships are joined in the page query,
+    collections are loaded with one extra SELECT ... IN query per page.
+    Dynamic relationships can't be eager loaded and are skipped.
+
+    Args:
+        entity (sqlalchemy.Model): queried model.
+        relationships (iterable): relationship names.
+
+    Returns:
+        list: loader options.
+    """
+    mapper = sqlalchemy.inspect(entity)
+    options = []
+
+    for name in relationships:
+        relationship = mapper.relationships[name]
+
+        if relationship.lazy == "dynamic":
+            continue
+
+        attribute = getattr(entity, name)
+        options.append(
+            orm.selectinload(attribute)
+            if relationship.uselist else orm.joinedload(attribute))
+
+    return options
+
 
 class PaginatedAPIMixin(object):
+    """Paginated collections.
+
+    Attributes:
+        CURSOR_KEYS (tuple): unique ordering of the model's collections in
+            cursor mode, last key must be unique.
+        EAGER_LOADS (tuple): relationships used by for_pagination, loaded
+            with the page instead of one query per item.
+        JSON_CACHE (bool): keep serialized JSON of instances, see json_cache.
+        JSON_CACHE_RELATED (tuple): one to one relationships serialized with
+            instances, whose updated_at is checked with the instance's
+            before serving cached JSON.
+    """
+
+    CURSOR_KEYS = ("id",)
+    EAGER_LOADS = ()
+    JSON_CACHE = False
+    JSON_CACHE_RELATED = ()
 
     @staticmethod
-    def to_collection_dict(query, page=0, per_page=0, endpoint="", **kwargs):
-        """Returns a dictionary of a paginated collection of model instances."""
+    def to_collection_dict(query,
+                           page=0,
+                           per_page=0,
+                           endpoint="",
+                           cursor_keys=None,
+                           eager_loads=None,
+                           **kwargs):
+        """Returns a dictionary of a paginated collection of model instances.
+
+        Switches to cursor (keyset) pagination when the request has an after
+        or before param, see to_cursor_collection_dict.
+
+        Relationships in eager_loads, the model's EAGER_LOADS by default, are
+        loaded together with the page.
+        """
+        entity = query.column_descriptions[0]["entity"]
+        query = query.options(*eager_load_options(
+            entity, entity.EAGER_LOADS if eager_loads is None else eager_loads))
+        cursor = utils.get_cursor_args()
+
+        if cursor is not None:
+            return PaginatedAPIMixin.to_cursor_collection_dict(
+                query, per_page, endpoint, cursor_keys=cursor_keys, **cursor,
+                **kwargs)
+
         resources = query.paginate(page, per_page, False)
 
         self_url = url_for(endpoint, page=page, per_page=per_page, **kwargs)
         return {
-            "items": [item.for_pagination() for item in resources.items],
+            "items": [
+                json_cache.serialize(item, "for_pagination")
+                for item in resources.items
+            ],
             "meta": {
                 "page": page,
                 "per_page": per_page,
@@ -35,3 +186,113 @@ class PaginatedAPIMixin(object):
                 if resources.has_prev else None
             }
         }
+
+    @staticmethod
+    def to_cursor_collection_dict(query,
+                                  per_page=0,
+                                  endpoint="",
+                                  after=None,
+                                  before=None,
+                                  include_total=False,
+                                  cursor_keys=None,
+                                  **kwargs):
+        """Returns a dictionary of a keyset paginated collection.
+
+        Rows are ordered by cursor_keys and selected with a keyset condition
+        instead of OFFSET, so every page costs the same, and the count query
+        only runs if include_total is set.
+
+        Args:
+            query (sqlalchemy.Query): collection query.
+            per_page (integer): items per page.
+            endpoint (string): collection endpoint for links.
+            after (string): cursor of the item preceding the page, "" for the
+                first page.
+            before (string): cursor of the item following the page.
+            include_total (bool): count items in collection.
+            cursor_keys (tuple): ordering attributes, defaults to the model's
+                CURSOR_KEYS.
+            kwargs: endpoint params.
+
+        Returns:
+            dict: items, meta and links. next and prev links carry opaque
+                after and before cursors.
+
+        Raises:
+            InvalidCursorError: malformed cursor.
+        """
+        entity = query.column_descriptions[0]["entity"]
+        keys = tuple(cursor_keys or entity.CURSOR_KEYS)
+        columns = [getattr(entity, key) for key in keys]
+        per_page = per_page if per_page > 0 else 20
+        reverse = before is not None
+        token = before if reverse else after
+
+        query = query.order_by(None)
+        total = query.count() if include_total else None
+
+        if token:
+            values = utils.decode_cursor(token, len(keys))
+            query = query.filter(keyset_condition(columns, values, reverse))
+
+        query = query.order_by(*order_by(
+            columns, query.session.connection().dialect.name, reverse))
+        items = query.limit(per_page + 1).all()
+        has_more = len(items) > per_page
+        items = items[:per_page]
+
+        if reverse:
+            items.reverse()
+
+        if include_total:
+            kwargs["include_total"] = 1
+
+        def cursor(item):
+            return utils.encode_cursor([getattr(item, key) for key in keys])
+
+        has_next = has_more if not reverse else True
+        has_prev = has_more if reverse else bool(token)
+
+        self_url = url_for(
+            endpoint,
+            per_page=per_page,
+            **({
+                "before": before
+            } if reverse else {
+                "after": after or ""
+            }),
+            **kwargs)
+
+        return {
+            "items": [
+                json_cache.serialize(item, "for_pagination")
+                for item in items
+            ],
+            "meta": {
+                "per_page": per_page,
+                "total_pages": -(-total // per_page)
+                if total is not None else None,
+                "total_items": total
+            },
+            "links": {
+                "self": {
+                    "url": self_url,
+                    "params": dict(
+                        parse.parse_qsl(
+                            parse.urlsplit(self_url).query,
+                            keep_blank_values=True))
+                },
+                "next":
+                url_for(
+                    endpoint,
+                    per_page=per_page,
+                    after=cursor(items[-1]),
+                    **kwargs) if has_next and items else None,
+                "prev":
+                url_for(
+                    endpoint,
+                    per_page=per_page,
+                    before=cursor(items[0]),
+                    **kwargs) if has_prev and items else None
+            }
+        }
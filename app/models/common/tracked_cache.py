@@ -0,0 +1,353 @@
+"""Process memory caches kept in sync with committed changes.
+
+Caches built from database rows (the matching engine, the grade and
+location indexes, autocomplete, serialized JSON and token revocation
+states) are TrackedCache instances naming the models they are built from.
+One set of mapper listeners hands every inserted, updated or deleted row
+of those models to the caches, which turn it into stale keys collected in
+the session until the transaction commits, when they are passed to the
+cache, or rolls back, when they are dropped.
+
+Commits of other processes are caught through the table_version table:
+every transaction bumps the version of the tables it wrote, ORM flushes
+and core statements alike, right before committing. Caches naming their
+tables compare the committed versions with the ones they were built at,
+one primary key lookup per use, and are rebuilt when a version moved
+without the cache seeing the commit.
+"""
+import threading
+from datetime import datetime
+
+import flask
+import sqlalchemy
+
+import app
+from app.models import table_version as table_version_model
+from app.models.common import bulk_association
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+_caches = []
+_create_lock = threading.Lock()
+# guards the table versions each cache was built at.
+_versions_lock = threading.Lock()
+# model to the caches tracking it, filled on first flush of the model.
+_model_caches = {}
+
+
+def attribute_values(instance, key):
+    """Gets current and previous values of an attribute, without loading it.
+
+    Args:
+        instance (sqlalchemy.Model): model instance.
+        key (string): attribute name.
+
+    Returns:
+        set: values, None left out.
+    """
+    history = sqlalchemy.inspect(instance).attrs[key].history
+
+    return {value for value in history.sum() if value is not None}
+
+
+def table_versions(names):
+    """Gets committed versions of tables.
+
+    Args:
+        names (iterable): table names.
+
+    Returns:
+        dict: table name to version, 0 for tables never written.
+    """
+    TableVersion = table_version_model.TableVersion
+    versions = dict.fromkeys(names, 0)
+    versions.update(
+        app.db.session.query(TableVersion.name, TableVersion.version).filter(
+            TableVersion.name.in_(list(versions))))
+
+    return versions
+
+
+def _bump(connection, names):
+    """Bumps versions of tables written by the transaction of connection.
+
+    Returns:
+        dict: table name to bumped version.
+    """
+    table = table_version_model.TableVersion.__table__
+    bump = table.update().values(version=table.c.version + 1,
+                                 updated_at=datetime.utcnow())
+
+    if connection.execute(bump.where(
+            table.c.name.in_(names))).rowcount < len(names):
+        present = {
+            name
+            for name, in connection.execute(
+                sqlalchemy.select([table.c.name
+                                   ]).where(table.c.name.in_(names)))
+        }
+        missing = [name for name in names if name not in present]
+        insert = table.insert()
+        prefix = bulk_association.IGNORE_PREFIXES.get(connection.dialect.name)
+
+        if prefix is not None:
+            # rows inserted meanwhile by other transactions are bumped too.
+            insert = insert.prefix_with(prefix)
+
+        connection.execute(insert, [{
+            "name": name,
+            "version": 0
+        } for name in missing])
+        connection.execute(bump.where(table.c.name.in_(missing)))
+
+    return dict(
+        connection.execute(
+            sqlalchemy.select([table.c.name, table.c.version
+                               ]).where(table.c.name.in_(names))).fetchall())
+
+
+def lock_table(name):
+    """Bumps a table version in the current transaction, before writing it.
+
+    The version row stays locked until the transaction ends, so
+    transactions reading rows of the table to validate their writes wait
+    for each other, in every process.
+
+    Args:
+        name (string): table name.
+    """
+    session = app.db.session
+    session.info.setdefault("table_versions", {}).update(
+        _bump(session.connection(), [name]))
+
+
+class TrackedCache(object):
+    """Per application cache discarding committed changes.
+
+    Attributes:
+        name (string): application extension key.
+        session_key (string): session info key of the uncommitted stale
+            keys.
+        models (tuple): models the cache is built from, every model if
+            None.
+        stale_keys (function): takes a flushed instance and INSERT, UPDATE
+            or DELETE, returns the keys it makes stale.
+        on_commit (function): takes the set of committed stale keys, called
+            within the application context.
+        create (function): creates the cache state of an application.
+        tables (tuple): names of the tables the cache is built from, whose
+            versions expire it.
+        lock (threading.Lock): lock of the cache state.
+    """
+
+    def __init__(self,
+                 name,
+                 models,
+                 stale_keys,
+                 on_commit,
+                 create=dict,
+                 tables=()):
+        self.name = name
+        self.session_key = f"{name}_stale"
+        self.models = models
+        self.stale_keys = stale_keys
+        self.on_commit = on_commit
+        self.create = create
+        self.tables = tuple(sorted(set(tables)))
+        self.lock = threading.Lock()
+
+        _caches.append(self)
+        _model_caches.clear()
+
+    def __repr__(self):
+        return f"<TrackedCache {self.name}>"
+
+    def state(self):
+        """Gets the cache state of the current application.
+
+        Returns:
+            object: cache state, created on first use.
+        """
+        extensions = flask.current_app.extensions
+
+        if self.name not in extensions:
+            with _create_lock:
+                if self.name not in extensions:
+                    extensions[self.name] = self.create()
+
+        return extensions[self.name]
+
+    def mark(self, *keys):
+        """Flags keys changed outside the ORM, e.g. with core statements.
+
+        Keys are passed to on_commit when the current transaction commits.
+
+        Args:
+            keys (tuple): stale keys.
+        """
+        app.db.session.info.setdefault(self.session_key, set()).update(keys)
+
+    def pending(self, session):
+        """Checks if session has uncommitted stale keys.
+
+        Args:
+            session (sqlalchemy.orm.Session): session.
+
+        Returns:
+            bool: True if flushed changes or marked keys aren't committed.
+        """
+        return self.session_key in session.info
+
+    def expired(self):
+        """Checks if other processes committed changes to the cache tables.
+
+        The committed table versions read are recorded, the caller discards
+        the cache when it expired and rebuilds it from rows at least as
+        recent.
+
+        Returns:
+            bool: True if a table version moved without the cache seeing
+                the commit, or on first check. False if the cache has no
+                tables.
+        """
+        if not self.tables:
+            return False
+
+        versions = table_versions(self.tables)
+        built = flask.current_app.extensions.setdefault("table_versions", {})
+
+        with _versions_lock:
+            expired = built.get(self.name) != versions
+            built[self.name] = versions
+
+        return expired
+
+    def _advance(self, versions):
+        """Records the versions bumped by a commit the cache has seen.
+
+        Only done when the cache was current right before the commit, so
+        commits of other processes in between still expire it.
+        """
+        written = {
+            name: version
+            for name, version in versions.items() if name in self.tables
+        }
+        built = flask.current_app.extensions.get("table_versions", {})
+
+        with _versions_lock:
+            current = built.get(self.name)
+
+            if written and current is not None and all(
+                    current[name] == version - 1
+                    for name, version in written.items()):
+                current.update(written)
+
+
+def _tracking(model):
+    if model not in _model_caches:
+        _model_caches[model] = [
+            cache for cache in _caches
+            if cache.models is None or issubclass(model, cache.models)
+        ]
+
+    return _model_caches[model]
+
+
+def _collect(target, change):
+    caches = _tracking(type(target))
+
+    if not caches:
+        return
+
+    session = sqlalchemy.orm.object_session(target)
+
+    for cache in caches:
+        keys = set(cache.stale_keys(target, change))
+
+        if keys and session is not None:
+            session.info.setdefault(cache.session_key, set()).update(keys)
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Mapper, "after_insert")
+def _collect_insert(mapper, connection, target):
+    _collect(target, INSERT)
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Mapper, "after_update")
+def _collect_update(mapper, connection, target):
+    _collect(target, UPDATE)
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Mapper, "after_delete")
+def _collect_delete(mapper, connection, target):
+    _collect(target, DELETE)
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "after_begin")
+def _record_writes(session, transaction, connection):
+    # shared by the session and its connection, filled by _record_write.
+    connection.info["written_tables"] = session.info.setdefault(
+        "written_tables", set())
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.engine.Engine, "after_execute")
+def _record_write(conn, clauseelement, multiparams, params, result):
+    written = conn.info.get("written_tables")
+
+    if written is not None and isinstance(clauseelement,
+                                          sqlalchemy.sql.dml.UpdateBase):
+        name = getattr(clauseelement.table, "name", None)
+
+        if name is not None and \
+                name != table_version_model.TableVersion.__tablename__:
+            written.add(name)
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.engine.Engine, "commit")
+def _forget_writes_on_commit(conn):
+    conn.info.pop("written_tables", None)
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.engine.Engine, "rollback")
+def _forget_writes_on_rollback(conn):
+    conn.info.pop("written_tables", None)
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "before_commit")
+def _bump_versions(session):
+    # the commit flushes after this hook, its writes are bumped too.
+    session.flush()
+    written = session.info.get("written_tables")
+    versions = session.info.setdefault("table_versions", {})
+
+    if written:
+        # tables locked by lock_table are already bumped.
+        names = sorted(written - versions.keys())
+        written.clear()
+
+        if names:
+            versions.update(_bump(session.connection(), names))
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "after_commit")
+def _apply_on_commit(session):
+    session.info.pop("written_tables", None)
+    versions = session.info.pop("table_versions", {})
+
+    for cache in _caches:
+        keys = session.info.pop(cache.session_key, None)
+
+        if keys and flask.has_app_context():
+            cache.on_commit(keys)
+            cache._advance(versions)
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("written_tables", None)
+    session.info.pop("table_versions", None)
+
+    for cache in _caches:
+        session.info.pop(cache.session_key, None)
@@ -0,0 +1,24 @@
+from app import db
+
+from .common.base_mixin import BaseMixin
+from .common.paginated_api_mixin import PaginatedAPIMixin
+
+
+class ConsolidatedCity(db.Model, PaginatedAPIMixin, BaseMixin):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(256))
+    fips_code = db.Column(db.String(10), index=True, unique=True)
+    state_id = db.Column(db.Integer, db.ForeignKey("state.id"), index=True)
+    __str_repr__ = "consolidated_city"
+
+    ATTR_FIELDS = ["name", "fips_code"]
+    CURSOR_KEYS = ("fips_code",)
+
+    def __repr__(self):
+        return "<ConsolidatedCity {}>".format(self.name)
+
+    def to_dict(self):
+        return {"name": self.name, "fips_code": self.fips_code}
+
+    def for_pagination(self):
+        return self.to_dict()
@@ -23,6 +23,11 @@ class Detail(app.db.Model, paginated_api_mixin.PaginatedAPIMixin,
         app.db.Integer, app.db.ForeignKey("college.id"), nullable=True)
     scholarship_id = app.db.Column(
         app.db.Integer, app.db.ForeignKey("scholarship.id"), nullable=True)
+    # additional details are looked up by owner and name.
+    __table_args__ = (app.db.Index("ix_detail_college_id_name", "college_id",
+                                   "name"),
+                      app.db.Index("ix_detail_scholarship_id_name",
+                                   "scholarship_id", "name"))
     str_repr = "detail"
 
     ATTR_FIELDS = ["value", "type"]
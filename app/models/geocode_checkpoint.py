@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from app import db
+
+
+class GeocodeCheckpoint(db.Model):
+    """State saved by a geocodes import.
+
+    Attributes:
+        id (integer): model id.
+        state_fips (string): fips code of the saved state.
+        rows (integer): locations saved with the state.
+        completed_at (datetime): when the state was committed.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    state_fips = db.Column(db.String(10), unique=True, nullable=False)
+    rows = db.Column(db.Integer, nullable=False, default=0)
+    completed_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<GeocodeCheckpoint {self.state_fips}>"
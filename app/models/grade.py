@@ -21,6 +21,8 @@ class Grade(app.db.Model, base_mixin.BaseMixin, date_audit.DateAudit,
     description = app.db.Column(app.db.String(256), nullable=True)
     str_repr = "grade"
 
+    CURSOR_KEYS = ("name", "id")
+    JSON_CACHE = True
     ATTR_FIELDS = ["name", "max", "min", "description"]
 
     def __repr__(self):
@@ -16,9 +16,10 @@ class GradeRequirementGroup(app.db.Model, base_mixin.BaseMixin,
              group.
     """
     id = app.db.Column(app.db.Integer, primary_key=True)
-    scholarship_id = app.db.Column(app.db.Integer,
-                                   app.db.ForeignKey("scholarship.id"))
-    college_id = app.db.Column(app.db.Integer, app.db.ForeignKey("college.id"))
+    scholarship_id = app.db.Column(
+        app.db.Integer, app.db.ForeignKey("scholarship.id"), index=True)
+    college_id = app.db.Column(
+        app.db.Integer, app.db.ForeignKey("college.id"), index=True)
     grade_requirements = app.db.relationship(
         "GradeRequirement",
         cascade="all, delete-orphan",
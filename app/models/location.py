@@ -24,6 +24,11 @@ class Location(app.db.Model, base_mixin.BaseMixin,
     scholarship_id = app.db.Column(app.db.Integer,
                                    app.db.ForeignKey("scholarship.id"))
     college_id = app.db.Column(app.db.Integer, app.db.ForeignKey("college.id"))
+    # location requirements are listed by owner and blacklist flag.
+    __table_args__ = (app.db.Index("ix_location_scholarship_id_blacklist",
+                                   "scholarship_id", "blacklist"),
+                      app.db.Index("ix_location_college_id_blacklist",
+                                   "college_id", "blacklist"))
 
     def __repr__(self):
         state = self.state if self.state is not None else ""
@@ -19,6 +19,8 @@ class Major(app.db.Model, base_mixin.BaseMixin, date_audit.DateAudit,
     name = app.db.Column(app.db.String(256), unique=True, index=True)
     description = app.db.Column(app.db.Text, nullable=True)
 
+    CURSOR_KEYS = ("name", "id")
+    JSON_CACHE = True
     ATTR_FIELDS = ["name", "description"]
 
     def __repr__(self):
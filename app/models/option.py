@@ -18,6 +18,8 @@ class Option(app.db.Model, base_mixin.BaseMixin,
     name = app.db.Column(app.db.String(256), unique=True)
 
     str_repr = "option"
+    CURSOR_KEYS = ("name", "id")
+    JSON_CACHE = True
 
     def __repr__(self):
         return f"<Option {self.name}>"
@@ -23,6 +23,8 @@ class Program(app.db.Model, paginated_api_mixin.PaginatedAPIMixin,
         lazy="dynamic",
         backref=app.db.backref("programs", lazy="dynamic"))
 
+    CURSOR_KEYS = ("name", "id")
+    JSON_CACHE = True
     ATTR_FIELDS = ["name", "description"]
 
     def __repr__(self):
@@ -15,6 +15,8 @@ class QualificationRound(app.db.Model, paginated_api_mixin.PaginatedAPIMixin,
     name = app.db.Column(app.db.String(256), unique=True, index=True)
     str_repr = "qualification_round"
 
+    CURSOR_KEYS = ("name", "id")
+    JSON_CACHE = True
     ATTR_FIELDS = ["name"]
 
     def __repr__(self):
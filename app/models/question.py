@@ -22,6 +22,8 @@ class Question(app.db.Model, base_mixin.BaseMixin,
         lazy="dynamic")
 
     str_repr = "question"
+    CURSOR_KEYS = ("name", "id")
+    JSON_CACHE = True
 
     def has_option(self, option_id):
         """checks if question has option.
@@ -22,7 +22,8 @@ class Scholarship(app.db.Model, paginated_api_mixin.PaginatedAPIMixin,
     """
     id = app.db.Column(app.db.Integer, primary_key=True)
     exclude_from_match = app.db.Column(app.db.Boolean, default=False)
-    college_id = app.db.Column(app.db.Integer, app.db.ForeignKey("college.id"))
+    college_id = app.db.Column(
+        app.db.Integer, app.db.ForeignKey("college.id"), index=True)
     scholarship_details = app.db.relationship(
         "ScholarshipDetails",
         uselist=False,
@@ -69,6 +70,9 @@ class Scholarship(app.db.Model, paginated_api_mixin.PaginatedAPIMixin,
         "SelectionRequirement", lazy="dynamic")
 
     str_repr = "scholarship"
+    EAGER_LOADS = ("scholarship_details",)
+    JSON_CACHE = True
+    JSON_CACHE_RELATED = ("scholarship_details",)
 
     def __repr__(self):
         return f"<Scholarship {self.id}>"
@@ -24,10 +24,11 @@ class ScholarshipDetails(app.db.Model, date_audit.DateAudit,
     group = app.db.Column(app.db.String(256), nullable=True)
     description = app.db.Column(app.db.Text, nullable=True)
     type = app.db.Column(app.db.String(256), nullable=True)
-    scholarship_id = app.db.Column(app.db.Integer,
-                                         app.db.ForeignKey("scholarship.id"))
+    scholarship_id = app.db.Column(
+        app.db.Integer, app.db.ForeignKey("scholarship.id"), index=True)
 
     str_repr = "scholarship_details"
+    JSON_CACHE_OWNER = ("scholarship", "scholarship_id")
 
     ATTR_FIELDS = [
         "name", "amount", "amount_expression", "application_needed", "group",
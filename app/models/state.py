@@ -17,6 +17,7 @@ class State(db.Model, PaginatedAPIMixin, BaseMixin):
         "ConsolidatedCity", backref="state", lazy="dynamic")
 
     ATTR_FIELDS = ["name", "fips_code"]
+    CURSOR_KEYS = ("fips_code",)
 
     def __repr__(self):
         return "<State {}>".format(self.name)
@@ -26,6 +27,8 @@ class State(db.Model, PaginatedAPIMixin, BaseMixin):
             "name": self.name,
             "fips_code": self.fips_code,
             "_links": {
+                "self":
+                url_for("locations.get_state", state_fips=self.fips_code),
                 "counties":
                 url_for(
                     "locations.get_state_counties", state_fips=self.fips_code),
@@ -21,8 +21,12 @@ class Submission(db.Model, PaginatedAPIMixin, DateAudit, BaseMixin):
     submitted_by = db.Column(db.String(256), nullable=True)
     observation = db.Column(db.Text(), nullable=True)
     college_id = db.Column(db.Integer, db.ForeignKey("college.id"))
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"))
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), index=True)
+    # submissions are listed by college and status.
+    __table_args__ = (db.Index("ix_submission_college_id_status",
+                               "college_id", "status"),)
     __str_repr__ = "submission"
+    EAGER_LOADS = ("user",)
 
     ATTR_FIELDS = ["reviewed_at", "reviewed_by", "status", "college_name"]
 
@@ -0,0 +1,25 @@
+from sqlalchemy.dialects import mysql
+
+from app import db
+
+
+class TableVersion(db.Model):
+    """Number of committed transactions that wrote a table.
+
+    Bumped before every commit writing the table, so processes caching its
+    rows can tell another process changed them, and conditional GET
+    responses built from it can be validated without reading its rows.
+
+    Attributes:
+        name (string): table name.
+        version (integer): table version.
+        updated_at (datetime): time of the latest bump, None if the table
+            was never written.
+    """
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(
+        db.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"))
+
+    def __repr__(self):
+        return f"<TableVersion {self.name} {self.version}>"
@@ -13,7 +13,10 @@ class TokenBlacklist(db.Model, BaseMixin):
     jti = db.Column(db.String(36), unique=True, nullable=False)
     user = db.Column(db.String(256), nullable=False)
     revoked = db.Column(db.Boolean(), default=False)
-    expires = db.Column(db.DateTime, nullable=False)
+    expires = db.Column(db.DateTime, nullable=False, index=True)
+    # user tokens are listed and revoked by user and revoked flag.
+    __table_args__ = (db.Index("ix_token_blacklist_user_revoked", "user",
+                               "revoked"),)
 
     def __repr__(self):
         return f"<Token {self.jti}>"
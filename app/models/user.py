@@ -1,8 +1,8 @@
 from datetime import datetime
-from werkzeug import security
 
 import app
 from app.models.common import base_mixin, date_audit, paginated_api_mixin
+from app.security import hashing
 
 
 class User(paginated_api_mixin.PaginatedAPIMixin, base_mixin.BaseMixin,
@@ -29,10 +29,18 @@ class User(paginated_api_mixin.PaginatedAPIMixin, base_mixin.BaseMixin,
 
     @password.setter
     def password(self, password):
-        self.password_hash = security.generate_password_hash(password)
+        self.password_hash = hashing.generate_password_hash(password)
 
     def check_password(self, password):
-        return security.check_password_hash(self.password_hash, password)
+        return hashing.check_password_hash(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        """Checks if password hash is outdated, see hashing.needs_rehash.
+
+        Returns:
+            bool: True if password should be hashed again.
+        """
+        return hashing.needs_rehash(self.password_hash)
 
     def for_pagination(self):
         return self.to_dict()
@@ -0,0 +1,204 @@
+"""Per request SQL instrumentation.
+
+Counts the statements each request executes and the time spent in the
+database, through the cursor execution events of every SQLAlchemy engine,
+and aggregates them per endpoint. Request figures are sent back as response
+headers when SQL_METRICS_HEADERS is set (debug mode by default), and the
+aggregates are served by the internal metrics endpoint.
+"""
+import heapq
+import threading
+import time
+
+import flask
+import sqlalchemy
+
+_lock = threading.Lock()
+
+
+class QueryStats(object):
+    """SQL statements executed by a request or an endpoint.
+
+    Attributes:
+        count (integer): number of statements.
+        duration (float): total database time in seconds.
+        slowest (list): heap of the slowest (duration, statement) tuples.
+        size (integer): number of slowest statements kept.
+    """
+
+    __slots__ = ("count", "duration", "slowest", "size")
+
+    def __init__(self, size=5):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = []
+        self.size = size
+
+    def record(self, statement, duration):
+        """Records executed statement.
+
+        Args:
+            statement (string): SQL statement.
+            duration (float): execution time in seconds.
+        """
+        self.count += 1
+        self.duration += duration
+        self._keep(duration, statement)
+
+    def _keep(self, duration, statement):
+        if len(self.slowest) < self.size:
+            heapq.heappush(self.slowest, (duration, statement))
+        elif duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (duration, statement))
+
+    def to_dict(self):
+        return {
+            "queries": self.count,
+            "db_time_ms": round(self.duration * 1000, 3),
+            "slowest": [{
+                "statement": statement,
+                "duration_ms": round(duration * 1000, 3)
+            } for duration, statement in sorted(self.slowest, reverse=True)]
+        }
+
+
+class EndpointStats(QueryStats):
+    """SQL statements executed by the requests to an endpoint.
+
+    Attributes:
+        requests (integer): number of requests.
+        max_queries (integer): most statements executed by one request.
+    """
+
+    __slots__ = ("requests", "max_queries")
+
+    def __init__(self, size=5):
+        super().__init__(size)
+        self.requests = 0
+        self.max_queries = 0
+
+    def add(self, stats):
+        """Adds the statements of a request.
+
+        Args:
+            stats (QueryStats): request statements.
+        """
+        self.requests += 1
+        self.count += stats.count
+        self.duration += stats.duration
+        self.max_queries = max(self.max_queries, stats.count)
+
+        for duration, statement in stats.slowest:
+            self._keep(duration, statement)
+
+    def to_dict(self):
+        data = super().to_dict()
+        data.update({
+            "requests": self.requests,
+            "max_queries": self.max_queries,
+            "mean_queries": round(self.count / self.requests, 2),
+            "mean_db_time_ms": round(
+                self.duration * 1000 / self.requests, 3)
+        })
+
+        return data
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.engine.Engine, "before_cursor_execute")
+def before_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany):
+    # kept on the execution context, which is dropped with the statement
+    # even when it raises and after_cursor_execute doesn't fire.
+    if context is not None:
+        context.query_start = time.perf_counter()
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.engine.Engine, "after_cursor_execute")
+def after_cursor_execute(conn, cursor, statement, parameters, context,
+                         executemany):
+    start = getattr(context, "query_start", None)
+
+    if start is None:
+        return
+
+    duration = time.perf_counter() - start
+
+    if flask.has_request_context():
+        stats = flask.g.get("query_stats")
+
+        if stats is not None:
+            stats.record(statement, duration)
+
+
+def _before_request():
+    flask.g.query_stats = QueryStats(
+        flask.current_app.config["SQL_METRICS_SLOWEST"])
+
+
+def _after_request(response):
+    stats = flask.g.pop("query_stats", None)
+
+    if stats is None:
+        return response
+
+    config = flask.current_app.config
+    headers = config["SQL_METRICS_HEADERS"]
+
+    if headers or (headers is None and flask.current_app.debug):
+        response.headers["X-SQL-Queries"] = str(stats.count)
+        response.headers["X-SQL-Time"] = f"{stats.duration * 1000:.3f}"
+
+    endpoint = flask.request.endpoint
+
+    if endpoint is not None:
+        endpoints = flask.current_app.extensions["query_stats"]
+
+        with _lock:
+            if endpoint not in endpoints:
+                endpoints[endpoint] = EndpointStats(
+                    config["SQL_METRICS_SLOWEST"])
+
+            endpoints[endpoint].add(stats)
+
+    return response
+
+
+def init_app(app):
+    """Records SQL statements of the application requests.
+
+    Does nothing if SQL_METRICS_ENABLED is not set.
+
+    Args:
+        app (flask.Flask): application.
+    """
+    if not app.config["SQL_METRICS_ENABLED"]:
+        return
+
+    app.extensions["query_stats"] = {}
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+
+
+def get_metrics():
+    """Gets SQL statements aggregated per endpoint.
+
+    Returns:
+        list: endpoint statistics, heaviest endpoints (by total database
+            time) first.
+    """
+    endpoints = flask.current_app.extensions.get("query_stats", {})
+
+    with _lock:
+        items = sorted(
+            endpoints.items(), key=lambda item: item[1].duration, reverse=True)
+
+        return [{
+            "endpoint": endpoint,
+            **stats.to_dict()
+        } for endpoint, stats in items]
+
+
+def reset_metrics():
+    """Clears SQL statements aggregated per endpoint."""
+    with _lock:
+        flask.current_app.extensions.get("query_stats", {}).clear()
@@ -36,3 +36,8 @@ class ScholarshipSchema(Schema):
 
             if compiled_regex.match(component[1:]) is None:
                 raise ValidationError("Incorrent amount expression")
+
+
+class BulkScholarshipSchema(ScholarshipSchema):
+    college_id = fields.Integer(
+        required=True, error_messages={"required": "college id is required"})
@@ -0,0 +1,240 @@
+"""Query plans of the join paths used by the API routes.
+
+Prints the plan and timing of each route query with and without the foreign
+key indexes, on a throwaway SQLite database filled with sample rows::
+
+    python -m app.scripts.query_plans
+"""
+import time
+
+import sqlalchemy
+
+import app
+import config
+from app.models import association_tables
+from app.models import college as college_model
+from app.models import college_details as college_details_model
+from app.models import detail as detail_model
+from app.models import grade_requirement_group as grade_requirement_group_model
+from app.models import location as location_model
+from app.models import major as major_model
+from app.models import scholarship as scholarship_model
+from app.models import scholarship_details as scholarship_details_model
+from app.models import submission as submission_model
+
+# indexes on foreign keys and join paths, see migration 8d41f6b2c0a7.
+INDEXED_TABLES = [
+    "college_details", "scholarship_details", "scholarship", "detail",
+    "location", "grade_requirement_group", "submission",
+    "program_requirement", "boolean_requirement", "grade_requirement",
+    "selection_requirement", "college_major", "program_qualification_round",
+    "scholarships_needed", "program_requirement_qualification_round",
+    "chosen_college_requirement", "selection_requirement_option",
+    "question_option"
+]
+
+
+def route_queries(id):
+    """Builds the queries of the routes reading sub resources.
+
+    Args:
+        id (integer): college and scholarship id to look up.
+
+    Returns:
+        dict: description to sqlalchemy.Query.
+    """
+    Scholarship = scholarship_model.Scholarship
+    ScholarshipDetails = scholarship_details_model.ScholarshipDetails
+    College = college_model.College
+    CollegeDetails = college_details_model.CollegeDetails
+    scholarships_needed = association_tables.scholarships_needed
+    college_major = association_tables.college_major
+
+    return {
+        "search scholarships":
+        Scholarship.query.join(
+            ScholarshipDetails,
+            ScholarshipDetails.scholarship_id == Scholarship.id).filter(
+                ScholarshipDetails.name.like("scholarship 1%")),
+        "search colleges":
+        College.query.join(CollegeDetails,
+                           CollegeDetails.college_id == College.id).filter(
+                               CollegeDetails.name.like("college 1%")),
+        "scholarship details":
+        ScholarshipDetails.query.filter_by(scholarship_id=id),
+        "college details":
+        CollegeDetails.query.filter_by(college_id=id),
+        "college additional detail":
+        detail_model.Detail.query.filter_by(college_id=id, name="detail"),
+        "scholarship location requirements":
+        location_model.Location.query.filter_by(
+            scholarship_id=id, blacklist=False),
+        "college grade requirement groups":
+        grade_requirement_group_model.GradeRequirementGroup.query.filter_by(
+            college_id=id),
+        "scholarships needed":
+        Scholarship.query.join(
+            scholarships_needed,
+            scholarships_needed.c.needed_id == Scholarship.id).filter(
+                scholarships_needed.c.needs_id == id),
+        "scholarships needing":
+        Scholarship.query.join(
+            scholarships_needed,
+            scholarships_needed.c.needs_id == Scholarship.id).filter(
+                scholarships_needed.c.needed_id == id),
+        "college majors":
+        major_model.Major.query.join(
+            college_major, college_major.c.major_id == major_model.Major.id
+        ).filter(college_major.c.college_id == id),
+        "college pending submissions":
+        submission_model.Submission.query.filter_by(
+            college_id=id, status="pending")
+    }
+
+
+def explain(query):
+    """Gets SQLite query plan.
+
+    Args:
+        query (sqlalchemy.Query): query.
+
+    Returns:
+        list: plan details, one per step.
+    """
+    statement = query.statement.compile(
+        dialect=app.db.engine.dialect,
+        compile_kwargs={"literal_binds": True})
+
+    return [
+        row[-1] for row in app.db.session.execute(
+            sqlalchemy.text(f"EXPLAIN QUERY PLAN {statement}"))
+    ]
+
+
+def measure(query, repeat=50):
+    """Gets mean query time in milliseconds."""
+    start = time.perf_counter()
+
+    for _ in range(repeat):
+        query.all()
+
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def drop_indexes():
+    """Drops the foreign key and join path indexes."""
+    for table in app.db.metadata.sorted_tables:
+        if table.name not in INDEXED_TABLES:
+            continue
+
+        for index in table.indexes:
+            if not index.unique:
+                index.drop(app.db.engine)
+
+
+def populate(rows):
+    """Adds sample colleges and scholarships with their sub resources.
+
+    Args:
+        rows (integer): number of colleges and of scholarships.
+    """
+    engine = app.db.engine
+    majors = [{"name": f"major {i}"} for i in range(100)]
+    engine.execute(major_model.Major.__table__.insert(), majors)
+    engine.execute(college_model.College.__table__.insert(),
+                   [{"id": i} for i in range(1, rows + 1)])
+    engine.execute(scholarship_model.Scholarship.__table__.insert(),
+                   [{"id": i, "college_id": i} for i in range(1, rows + 1)])
+    engine.execute(college_details_model.CollegeDetails.__table__.insert(),
+                   [{"name": f"college {i}", "college_id": i}
+                    for i in range(1, rows + 1)])
+    engine.execute(
+        scholarship_details_model.ScholarshipDetails.__table__.insert(),
+        [{"name": f"scholarship {i}", "scholarship_id": i}
+         for i in range(1, rows + 1)])
+    engine.execute(detail_model.Detail.__table__.insert(),
+                   [{"name": "detail", "value": "", "college_id": i}
+                    for i in range(1, rows + 1)])
+    engine.execute(location_model.Location.__table__.insert(),
+                   [{"state": "oregon", "blacklist": i % 2 == 0,
+                     "scholarship_id": i // 2 + 1}
+                    for i in range(rows * 2)])
+    engine.execute(
+        grade_requirement_group_model.GradeRequirementGroup.__table__.insert(),
+        [{"college_id": i} for i in range(1, rows + 1)])
+    engine.execute(association_tables.scholarships_needed.insert(),
+                   [{"needs_id": i, "needed_id": i % rows + 1}
+                    for i in range(1, rows + 1)])
+    engine.execute(association_tables.college_major.insert(),
+                   [{"college_id": i, "major_id": i % 100 + 1}
+                    for i in range(1, rows + 1)])
+    engine.execute(submission_model.Submission.__table__.insert(),
+                   [{"public_id": str(i), "status": "pending",
+                     "college_id": i} for i in range(1, rows + 1)])
+
+
+def plans(indexed, rows):
+    """Gets plans and timings of the route queries.
+
+    Must run inside an application context with an empty SQLite database.
+    Each database is only measured once, SQLite connections keep prepared
+    statements, and their plans, across schema changes.
+
+    Args:
+        indexed (bool): keep the foreign key and join path indexes.
+        rows (integer): number of sample colleges and scholarships.
+
+    Returns:
+        dict: description to (plan, ms).
+    """
+    app.db.create_all()
+
+    if not indexed:
+        drop_indexes()
+
+    populate(rows)
+
+    return {
+        name: (explain(query), measure(query))
+        for name, query in route_queries(rows // 2).items()
+    }
+
+
+def compare(rows=10000):
+    """Gets plans and timings of the route queries before and after indexing.
+
+    Args:
+        rows (integer): number of sample colleges and scholarships.
+
+    Returns:
+        dict: description to {"unindexed": (plan, ms), "indexed": (plan,
+            ms)}.
+    """
+
+    class PlanConfig(config.Config):
+        SQLALCHEMY_DATABASE_URI = "sqlite://"
+
+    results = {}
+
+    for label, indexed in [("unindexed", False), ("indexed", True)]:
+        with app.create_app(PlanConfig).app_context():
+            for name, result in plans(indexed, rows).items():
+                results.setdefault(name, {})[label] = result
+
+    return results
+
+
+def main():
+    for name, result in compare().items():
+        print(name)
+
+        for label in ["unindexed", "indexed"]:
+            plan, ms = result[label]
+            print(f"    {label} ({ms:.3f} ms):")
+
+            for step in plan:
+                print(f"        {step}")
+
+
+if __name__ == "__main__":
+    main()
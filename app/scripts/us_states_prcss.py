@@ -1,5 +1,101 @@
+import collections
+
 from openpyxl import load_workbook
 
+STATE_CODE = 1
+COUNTY_CODE = 2
+COUNTY_SUBDIVISION = 3
+PLACE_CODE = 4
+CONSOLIDATED_CITY = 5
+NAME = 6
+FIRST_ROW = 6
+
+STATE = "state"
+COUNTY = "county"
+SUBDIVISION = "county_subdivision"
+PLACE = "place"
+CITY = "consolidated_city"
+
+FipsCode = collections.namedtuple("FipsCode",
+                                  ["kind", "state_code", "code", "name"])
+
+
+def _is_empty(code):
+    return code is None or not str(code).strip("0")
+
+
+def iter_fips_codes(filepath):
+    """Reads fips codes from xslx file one row at a time
+
+    The workbook is opened in read only mode, so rows are streamed from the
+    file instead of loaded at once.
+
+    Args:
+        filepath (string) (required): Path of the xslx file.
+
+    Yields:
+        FipsCode: kind (STATE, COUNTY, SUBDIVISION, PLACE or CITY), state
+        code, code within the state (county and subdivision codes for
+        subdivisions) and name of the row.
+    """
+    wb = load_workbook(filepath, read_only=True)
+
+    try:
+        for row in wb.active.iter_rows(
+                min_row=FIRST_ROW, max_col=NAME + 1, values_only=True):
+            state = row[STATE_CODE]
+
+            if _is_empty(state):
+                continue
+
+            state = str(state)
+            county, county_subdiv, place, consolidated_city, name = (
+                row[COUNTY_CODE], row[COUNTY_SUBDIVISION], row[PLACE_CODE],
+                row[CONSOLIDATED_CITY], row[NAME])
+
+            if not _is_empty(county):
+                if _is_empty(county_subdiv):
+                    yield FipsCode(COUNTY, state, str(county), name)
+                else:
+                    yield FipsCode(SUBDIVISION, state,
+                                   str(county) + str(county_subdiv), name)
+            elif not _is_empty(place):
+                yield FipsCode(PLACE, state, str(place), name)
+            elif not _is_empty(consolidated_city):
+                yield FipsCode(CITY, state, str(consolidated_city), name)
+            else:
+                yield FipsCode(STATE, state, "", name)
+    finally:
+        wb.close()
+
+
+def iter_fips_states(filepath):
+    """Reads fips codes from xslx file one state at a time
+
+    Rows of a state follow its own row in the file, so only the codes of
+    the current state are held in memory.
+
+    Args:
+        filepath (string) (required): Path of the xslx file.
+
+    Yields:
+        tuple: state FipsCode and list of the FipsCode of its counties,
+        subdivisions, places and consolidated cities.
+    """
+    state, codes = None, []
+
+    for fips in iter_fips_codes(filepath):
+        if fips.kind == STATE:
+            if state is not None:
+                yield state, codes
+
+            state, codes = fips, []
+        elif state is not None and fips.state_code == state.state_code:
+            codes.append(fips)
+
+    if state is not None:
+        yield state, codes
+
 
 def process_fips_codes(filepath):
     """Processes fips codes from xslx file
@@ -39,59 +135,36 @@ def process_fips_codes(filepath):
         
     """
 
-    STATE_CODE = 1
-    COUNTY_CODE = 2
-    COUNTY_SUBDIVISION = 3
-    PLACE_CODE = 4
-    CONSOLIDATED_CITY = 5
-    NAME = 6
     codes = {}
-    wb = load_workbook(filepath, read_only=True)
-    ws = wb.active
-
-    for row in ws.iter_rows(min_row=6):
-
-        state = row[STATE_CODE].value
-        if not state == "00":
-            if state not in codes:
-                name = row[NAME].value
-                codes[state] = {
-                    "name": name,
-                    "counties": {},
-                    "places": {},
-                    "consolidated_cities": {}
-                }
-                continue
 
-            county = row[COUNTY_CODE].value
-            if not county == "000":
-                if county not in codes[state]["counties"]:
-                    name = row[NAME].value
-                    codes[state]["counties"][county] = {
-                        "name": name,
-                        "subdivisions": {}
-                    }
-                    continue
-
-                county_subdiv = row[COUNTY_SUBDIVISION].value
-                if not county_subdiv == "000000":
-                    name = row[NAME].value
-                    codes[state]["counties"][county]["subdivisions"][
-                        county_subdiv] = name
-                    continue
-
-            place = row[PLACE_CODE].value
-            if not place == "00000":
-                name = row[NAME].value
-                codes[state]["places"][place] = {"name": name}
-                continue
+    for fips in iter_fips_codes(filepath):
+        if fips.kind == STATE:
+            codes.setdefault(fips.state_code, {
+                "name": fips.name,
+                "counties": {},
+                "places": {},
+                "consolidated_cities": {}
+            })
+            continue
+
+        state = codes[fips.state_code]
+
+        if fips.kind == COUNTY:
+            state["counties"][fips.code] = {
+                "name": fips.name,
+                "subdivisions": {}
+            }
+        elif fips.kind == SUBDIVISION:
+            county = state["counties"].setdefault(fips.code[:3], {
+                "name": None,
+                "subdivisions": {}
+            })
+            county["subdivisions"][fips.code[3:]] = fips.name
+        elif fips.kind == PLACE:
+            state["places"][fips.code] = {"name": fips.name}
+        else:
+            state["consolidated_cities"][fips.code] = {"name": fips.name}
 
-            consolidated_city = row[CONSOLIDATED_CITY].value
-            if not consolidated_city == "00000":
-                name = row[NAME].value
-                codes[state]["consolidated_cities"][consolidated_city] = {
-                    "name": name
-                }
     return codes
 
 
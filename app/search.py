@@ -0,0 +1,237 @@
+"""Full text search over college and scholarship details.
+
+SQLite databases get an external content FTS5 table per details table, kept
+in sync by triggers and using the trigram tokenizer when the SQLite library
+supports it, so any substring of three or more characters is found through
+the index. MySQL databases get a FULLTEXT index with the ngram parser.
+Other databases, or search terms too short for the index, fall back to the
+LIKE filters of the routes.
+"""
+import collections
+
+import flask
+import sqlalchemy
+
+import app
+from app.models import college_details as college_details_model
+from app.models import scholarship_details as scholarship_details_model
+
+SearchIndex = collections.namedtuple("SearchIndex",
+                                     ["name", "table", "owner", "columns"])
+
+INDEXES = {
+    "college":
+    SearchIndex("college_details_fts",
+                college_details_model.CollegeDetails.__table__, "college_id",
+                ("name", "type_of_institution", "setting",
+                 "religious_affiliation", "location_address")),
+    "scholarship":
+    SearchIndex("scholarship_details_fts",
+                scholarship_details_model.ScholarshipDetails.__table__,
+                "scholarship_id", ("name", "description", "type", "group"))
+}
+
+# shortest term each tokenizer can look up.
+MIN_TERM_LENGTH = {"trigram": 3, "unicode61": 1, "ngram": 2}
+
+
+def _sqlite_statements(index, tokenizer):
+    quote = sqlalchemy.dialects.sqlite.dialect().identifier_preparer.quote
+    table = quote(index.table.name)
+    columns = ", ".join(quote(column) for column in index.columns)
+    new = ", ".join(f"new.{quote(column)}" for column in index.columns)
+    old = ", ".join(f"old.{quote(column)}" for column in index.columns)
+
+    return [
+        f"CREATE VIRTUAL TABLE {index.name} USING fts5({columns}, "
+        f"content={table}, content_rowid='id', tokenize='{tokenizer}')",
+        f"CREATE TRIGGER {index.name}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {index.name}(rowid, {columns}) VALUES (new.id, {new}); "
+        "END",
+        f"CREATE TRIGGER {index.name}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {index.name}({index.name}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER {index.name}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {index.name}({index.name}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {index.name}(rowid, {columns}) VALUES (new.id, {new}); "
+        "END",
+        f"INSERT INTO {index.name}({index.name}) VALUES ('rebuild')",
+    ]
+
+
+def _mysql_statements(index):
+    quote = sqlalchemy.dialects.mysql.dialect().identifier_preparer.quote
+    columns = ", ".join(quote(column) for column in index.columns)
+
+    return [
+        f"ALTER TABLE {quote(index.table.name)} ADD FULLTEXT INDEX "
+        f"{index.name} ({columns}) WITH PARSER ngram"
+    ]
+
+
+def create_index(connection, kind):
+    """Creates full text index for college or scholarship details.
+
+    Does nothing on databases without full text support.
+
+    Args:
+        connection (sqlalchemy.engine.Connection): database connection.
+        kind (string): "college" or "scholarship".
+    """
+    index = INDEXES[kind]
+    dialect = connection.dialect.name
+
+    if dialect == "sqlite":
+        try:
+            for statement in _sqlite_statements(index, "trigram"):
+                connection.execute(sqlalchemy.text(statement))
+        except sqlalchemy.exc.OperationalError:
+            # trigram tokenizer needs SQLite 3.34.
+            drop_index(connection, kind)
+            for statement in _sqlite_statements(index, "unicode61"):
+                connection.execute(sqlalchemy.text(statement))
+    elif dialect == "mysql":
+        for statement in _mysql_statements(index):
+            connection.execute(sqlalchemy.text(statement))
+
+
+def drop_index(connection, kind):
+    """Drops full text index for college or scholarship details.
+
+    Args:
+        connection (sqlalchemy.engine.Connection): database connection.
+        kind (string): "college" or "scholarship".
+    """
+    index = INDEXES[kind]
+    dialect = connection.dialect.name
+
+    if dialect == "sqlite":
+        for suffix in ["ai", "ad", "au"]:
+            connection.execute(
+                sqlalchemy.text(f"DROP TRIGGER IF EXISTS {index.name}_{suffix}"))
+
+        connection.execute(
+            sqlalchemy.text(f"DROP TABLE IF EXISTS {index.name}"))
+    elif dialect == "mysql":
+        connection.execute(
+            sqlalchemy.text(
+                f"ALTER TABLE {index.table.name} DROP INDEX {index.name}"))
+
+
+def _tokenizer(kind):
+    """Gets tokenizer of the full text index, None if there is no index."""
+    state = flask.current_app.extensions.setdefault("search", {})
+
+    if kind not in state:
+        index = INDEXES[kind]
+        connection = app.db.session.connection()
+        tokenizer = None
+
+        if connection.dialect.name == "sqlite":
+            sql = connection.execute(
+                sqlalchemy.text("SELECT sql FROM sqlite_master WHERE "
+                                "type = 'table' AND name = :name"),
+                name=index.name).scalar()
+
+            if sql is not None:
+                tokenizer = "trigram" if "trigram" in sql else "unicode61"
+        elif connection.dialect.name == "mysql":
+            found = connection.execute(
+                sqlalchemy.text(
+                    "SELECT COUNT(*) FROM information_schema.statistics "
+                    "WHERE table_schema = DATABASE() AND table_name = :table "
+                    "AND index_name = :name"),
+                table=index.table.name,
+                name=index.name).scalar()
+            tokenizer = "ngram" if found else None
+
+        state[kind] = tokenizer
+
+    return state[kind]
+
+
+def match_expression(term, tokenizer):
+    """Builds full text query matching every word of term.
+
+    Args:
+        term (string): search term.
+        tokenizer (string): index tokenizer.
+
+    Returns:
+        string: full text query, None if a word is too short for the index.
+    """
+    words = term.split()
+
+    if not words or any(
+            len(word) < MIN_TERM_LENGTH[tokenizer] for word in words):
+        return None
+
+    if tokenizer == "ngram":
+        return " ".join('+"{}"'.format(word.replace('"', ' ')) for word in words)
+
+    phrases = ['"{}"'.format(word.replace('"', '""')) for word in words]
+
+    if tokenizer == "unicode61":
+        phrases = [f"{phrase}*" for phrase in phrases]
+
+    return " ".join(phrases)
+
+
+def match(kind, term):
+    """Gets ranked ids of the colleges or scholarships matching term.
+
+    Args:
+        kind (string): "college" or "scholarship".
+        term (string): search term.
+
+    Returns:
+        sqlalchemy.Alias: selectable with owner_id and score columns, lower
+            score is better. None if there is no full text index or term
+            can't be looked up in it.
+    """
+    tokenizer = _tokenizer(kind)
+
+    if tokenizer is None:
+        return None
+
+    expression = match_expression(term, tokenizer)
+
+    if expression is None:
+        return None
+
+    index = INDEXES[kind]
+    table = index.table.name
+
+    if tokenizer == "ngram":
+        quote = sqlalchemy.dialects.mysql.dialect().identifier_preparer.quote
+        columns = ", ".join(quote(column) for column in index.columns)
+        against = f"MATCH ({columns}) AGAINST (:search IN BOOLEAN MODE)"
+        statement = (f"SELECT {table}.{index.owner} AS owner_id, "
+                     f"-{against} AS score FROM {table} WHERE {against}")
+    else:
+        statement = (f"SELECT {table}.{index.owner} AS owner_id, "
+                     f"{index.name}.rank AS score FROM {index.name} "
+                     f"JOIN {table} ON {table}.id = {index.name}.rowid "
+                     f"WHERE {index.name} MATCH :search")
+
+    return sqlalchemy.text(statement).bindparams(search=expression).columns(
+        owner_id=sqlalchemy.Integer,
+        score=sqlalchemy.Float).alias(f"{kind}_search")
+
+
+def _listen(kind):
+    table = INDEXES[kind].table
+
+    @sqlalchemy.event.listens_for(table, "after_create")
+    def after_create(target, connection, **kw):
+        create_index(connection, kind)
+
+    @sqlalchemy.event.listens_for(table, "before_drop")
+    def before_drop(target, connection, **kw):
+        if connection.dialect.name == "sqlite":
+            drop_index(connection, kind)
+
+
+for _kind in INDEXES:
+    _listen(_kind)
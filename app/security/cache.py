@@ -0,0 +1,184 @@
+"""Cache of token revocation states.
+
+Keeps jti -> revoked lookups out of the database on the hot path of the
+blacklist check. Entries are invalidated after every commit touching the
+token blacklist, and expire after TOKEN_CACHE_TTL seconds so processes not
+seeing the commit catch up.
+
+Every process keeps its own bounded LRU cache unless TOKEN_CACHE_REDIS_URL
+is set, in which case processes share a Redis cache and invalidations are
+seen by all of them.
+"""
+import collections
+import threading
+import time
+
+import flask
+
+try:
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+from app.models import token_blacklist
+from app.models.common import tracked_cache
+
+
+class LocalCache(object):
+    """Bounded in-process LRU cache with expiring entries.
+
+    Attributes:
+        maxsize (integer): maximum number of entries.
+        ttl (float): entry lifetime in seconds.
+        entries (collections.OrderedDict): jti to (revoked, expires at),
+            least recently used first.
+    """
+
+    def __init__(self, maxsize=10000, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<LocalCache {len(self.entries)} tokens>"
+
+    def get(self, jti):
+        """Gets cached revocation state.
+
+        Args:
+            jti (string): token identifier.
+
+        Returns:
+            bool: True if token is revoked, None if not cached.
+        """
+        with self._lock:
+            entry = self.entries.get(jti)
+
+            if entry is None:
+                return None
+
+            if entry[1] <= time.monotonic():
+                del self.entries[jti]
+                return None
+
+            self.entries.move_to_end(jti)
+            return entry[0]
+
+    def set(self, jti, revoked):
+        """Caches revocation state, evicting the least recently used entry.
+
+        Args:
+            jti (string): token identifier.
+            revoked (bool): token revocation state.
+        """
+        with self._lock:
+            self.entries[jti] = (revoked, time.monotonic() + self.ttl)
+            self.entries.move_to_end(jti)
+
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def delete(self, *jtis):
+        """Removes cached revocation states.
+
+        Args:
+            jtis (string): token identifiers.
+        """
+        with self._lock:
+            for jti in jtis:
+                self.entries.pop(jti, None)
+
+    def clear(self):
+        """Removes every cached revocation state."""
+        with self._lock:
+            self.entries.clear()
+
+
+class RedisCache(object):
+    """Revocation states shared by every process through Redis.
+
+    Attributes:
+        client: Redis client, or any object with get, setex and delete.
+        ttl (integer): entry lifetime in seconds.
+        prefix (string): key prefix.
+    """
+
+    def __init__(self, client, ttl=30, prefix="token_revoked:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def __repr__(self):
+        return f"<RedisCache {self.prefix}>"
+
+    def get(self, jti):
+        value = self.client.get(self.prefix + jti)
+
+        if value is None:
+            return None
+
+        return value in (b"1", "1")
+
+    def set(self, jti, revoked):
+        self.client.setex(self.prefix + jti, self.ttl, "1" if revoked else "0")
+
+    def delete(self, *jtis):
+        if jtis:
+            self.client.delete(*[self.prefix + jti for jti in jtis])
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + "*"):
+            self.client.delete(key)
+
+
+def create_cache(config):
+    """Creates revocation cache from configuration.
+
+    Args:
+        config (dict): application configuration.
+
+    Returns:
+        LocalCache or RedisCache: revocation cache.
+
+    Raises:
+        RuntimeError: TOKEN_CACHE_REDIS_URL is set but redis isn't installed.
+    """
+    url = config["TOKEN_CACHE_REDIS_URL"]
+    ttl = config["TOKEN_CACHE_TTL"]
+
+    if url:
+        if redis is None:
+            raise RuntimeError(
+                "redis package required by TOKEN_CACHE_REDIS_URL")
+
+        return RedisCache(redis.Redis.from_url(url), ttl)
+
+    return LocalCache(config["TOKEN_CACHE_SIZE"], ttl)
+
+
+def get_cache():
+    """Gets the revocation cache of the current application.
+
+    Returns:
+        LocalCache or RedisCache: revocation cache, created on first use.
+    """
+    return _cache.state()
+
+
+def invalidate(*jtis):
+    """Invalidates revocation state of tokens changed outside the ORM.
+
+    Tokens are invalidated when the current transaction commits.
+
+    Args:
+        jtis (string): token identifiers.
+    """
+    _cache.mark(*jtis)
+
+
+_cache = tracked_cache.TrackedCache(
+    "token_cache", token_blacklist.TokenBlacklist,
+    lambda instance, change: [instance.jti],
+    lambda jtis: get_cache().delete(*jtis),
+    lambda: create_cache(flask.current_app.config))
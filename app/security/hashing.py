@@ -0,0 +1,203 @@
+"""Password hashing service.
+
+Hashes passwords with PASSWORD_HASH_METHOD at PASSWORD_HASH_COST:
+
+    pbkdf2:sha256 (default): werkzeug hashes, cost is the iterations.
+    scrypt: hashlib scrypt, cost is log2 of the CPU/memory cost n.
+    argon2: argon2id through the optional argon2-cffi package, cost is the
+        number of iterations.
+
+Hashes from any method are checked, so the method and cost can change at any
+time; needs_rehash tells which stored hashes should be upgraded, which login
+does transparently.
+
+When PASSWORD_HASH_WORKERS is above zero hashes run in a process pool of
+that size, so key stretching doesn't hold the request worker's interpreter
+and concurrent logins are bounded by the pool.
+"""
+import concurrent.futures
+import hashlib
+import hmac
+import threading
+
+import flask
+from werkzeug import security
+
+try:
+    import argon2
+except ImportError:  # pragma: no cover
+    argon2 = None
+
+PBKDF2 = "pbkdf2:sha256"
+SCRYPT = "scrypt"
+ARGON2 = "argon2"
+
+DEFAULT_COSTS = {
+    PBKDF2: security.DEFAULT_PBKDF2_ITERATIONS,
+    SCRYPT: 14,
+    ARGON2: 3
+}
+
+SALT_LENGTH = 16
+SCRYPT_BLOCK_SIZE = 8
+SCRYPT_PARALLELISM = 1
+SCRYPT_KEY_LENGTH = 32
+
+_lock = threading.Lock()
+
+
+def _settings():
+    if flask.has_app_context():
+        config = flask.current_app.config
+        method = config["PASSWORD_HASH_METHOD"]
+        cost = config["PASSWORD_HASH_COST"]
+    else:
+        method, cost = PBKDF2, None
+
+    if method not in DEFAULT_COSTS:
+        raise ValueError(f"unsupported password hash method {method}")
+
+    return method, int(cost or DEFAULT_COSTS[method])
+
+
+def _argon2_hasher(cost):
+    if argon2 is None:
+        raise RuntimeError("argon2-cffi package required by argon2 hashes")
+
+    return argon2.PasswordHasher(time_cost=cost)
+
+
+def _scrypt(password, salt, cost):
+    return hashlib.scrypt(
+        password.encode(),
+        salt=salt.encode(),
+        n=2**cost,
+        r=SCRYPT_BLOCK_SIZE,
+        p=SCRYPT_PARALLELISM,
+        maxmem=2**cost * SCRYPT_BLOCK_SIZE * 256,
+        dklen=SCRYPT_KEY_LENGTH).hex()
+
+
+def hash_password(password, method, cost):
+    """Hashes password.
+
+    Args:
+        password (string): password.
+        method (string): PBKDF2, SCRYPT or ARGON2.
+        cost (integer): method cost.
+
+    Returns:
+        string: password hash, prefixed with its method and cost.
+    """
+    if method == ARGON2:
+        return _argon2_hasher(cost).hash(password)
+
+    if method == SCRYPT:
+        salt = security.gen_salt(SALT_LENGTH)
+        return f"{SCRYPT}:{cost}${salt}${_scrypt(password, salt, cost)}"
+
+    return security.generate_password_hash(
+        password, method=f"{method}:{cost}", salt_length=SALT_LENGTH)
+
+
+def verify_password(password_hash, password):
+    """Checks password against hash of any supported method.
+
+    Args:
+        password_hash (string): stored password hash.
+        password (string): password to check.
+
+    Returns:
+        bool: True if password matches.
+    """
+    if not password_hash:
+        return False
+
+    if password_hash.startswith("$argon2"):
+        hasher = _argon2_hasher(DEFAULT_COSTS[ARGON2])
+
+        try:
+            return hasher.verify(password_hash, password)
+        except argon2.exceptions.VerificationError:
+            return False
+
+    if password_hash.startswith(f"{SCRYPT}:"):
+        method, salt, hashval = password_hash.split("$", 2)
+        cost = int(method.split(":")[1])
+
+        return hmac.compare_digest(_scrypt(password, salt, cost), hashval)
+
+    return security.check_password_hash(password_hash, password)
+
+
+def _get_executor():
+    if not flask.has_app_context():
+        return None
+
+    workers = int(flask.current_app.config["PASSWORD_HASH_WORKERS"] or 0)
+
+    if workers <= 0:
+        return None
+
+    extensions = flask.current_app.extensions
+
+    with _lock:
+        if "password_hashing" not in extensions:
+            extensions["password_hashing"] = \
+                concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+
+        return extensions["password_hashing"]
+
+
+def _run(function, *args):
+    executor = _get_executor()
+
+    if executor is None:
+        return function(*args)
+
+    return executor.submit(function, *args).result()
+
+
+def generate_password_hash(password):
+    """Hashes password with the configured method and cost.
+
+    Args:
+        password (string): password.
+
+    Returns:
+        string: password hash.
+    """
+    method, cost = _settings()
+
+    return _run(hash_password, password, method, cost)
+
+
+def check_password_hash(password_hash, password):
+    """Checks password against stored hash.
+
+    Args:
+        password_hash (string): stored password hash.
+        password (string): password to check.
+
+    Returns:
+        bool: True if password matches.
+    """
+    return _run(verify_password, password_hash, password)
+
+
+def needs_rehash(password_hash):
+    """Checks if hash was made with another method or cost than configured.
+
+    Args:
+        password_hash (string): stored password hash.
+
+    Returns:
+        bool: True if hash should be replaced.
+    """
+    method, cost = _settings()
+
+    if password_hash.startswith("$argon2"):
+        return method != ARGON2 or _argon2_hasher(cost).check_needs_rehash(
+            password_hash)
+
+    return password_hash.split("$", 1)[0] != f"{method}:{cost}"
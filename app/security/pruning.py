@@ -0,0 +1,69 @@
+"""Background pruning of expired tokens.
+
+Every token issued at login is stored in the token blacklist until pruned.
+When TOKEN_PRUNE_INTERVAL is set, a daemon thread deletes expired tokens
+every TOKEN_PRUNE_INTERVAL seconds, TOKEN_PRUNE_CHUNK_SIZE rows per
+statement. Tokens can also be pruned with the flask tokens prune command.
+"""
+import threading
+
+import app
+from app.security import utils
+
+
+class TokenPruner(threading.Thread):
+    """Daemon thread pruning expired tokens periodically.
+
+    Attributes:
+        app (flask.Flask): application.
+        interval (float): seconds between prunes.
+        chunk_size (integer): tokens deleted per statement.
+        stopped (threading.Event): set to stop the thread.
+    """
+
+    def __init__(self, app, interval, chunk_size):
+        super().__init__(name="token-pruner", daemon=True)
+        self.app = app
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            with self.app.app_context():
+                try:
+                    deleted = utils.prune_expired_tokens(self.chunk_size)
+                except Exception:
+                    self.app.logger.exception("token pruning failed")
+                    app.db.session.rollback()
+                else:
+                    self.app.logger.info("pruned %d expired tokens", deleted)
+                finally:
+                    app.db.session.remove()
+
+    def stop(self):
+        self.stopped.set()
+
+
+def init_app(app):
+    """Starts token pruner if TOKEN_PRUNE_INTERVAL is set.
+
+    The pruner never runs in testing.
+
+    Args:
+        app (flask.Flask): application.
+
+    Returns:
+        TokenPruner: started pruner, None if pruning is disabled.
+    """
+    interval = app.config["TOKEN_PRUNE_INTERVAL"]
+
+    if not interval or app.testing:
+        return None
+
+    pruner = TokenPruner(app, float(interval),
+                         int(app.config["TOKEN_PRUNE_CHUNK_SIZE"]))
+    app.extensions["token_pruner"] = pruner
+    pruner.start()
+
+    return pruner
@@ -3,10 +3,12 @@ import functools
 import flask
 import flask_jwt_extended
 import datetime
+import sqlalchemy
 
 import app
 from app.api import errors
 from app.models import token_blacklist
+from app.security import cache as token_cache
 
 
 def add_token_to_database(token):
@@ -34,20 +36,24 @@ def add_token_to_database(token):
 def is_token_revoked(token):
     """
     Checks if token is revoked or not. If token is not in the database
-    it is considered revoked.
+    it is considered revoked. Revocation states are cached, see
+    app.security.cache.
 
     Args:
         token: decoded token to check.
     """
 
     jti = token["jti"]
+    cache = token_cache.get_cache()
+    revoked = cache.get(jti)
 
-    token = token_blacklist.TokenBlacklist.query.filter_by(jti=jti).first()
+    if revoked is None:
+        token = token_blacklist.TokenBlacklist.query.filter_by(
+            jti=jti).first()
+        revoked = True if token is None else bool(token.revoked)
+        cache.set(jti, revoked)
 
-    if token is None:
-        return True
-
-    return token.revoked
+    return revoked
 
 
 def protect_blueprint(blueprint):
@@ -61,6 +67,30 @@ def protect_blueprint(blueprint):
         pass
 
 
+def role_required(role):
+    """
+    restricts route to users with role, must run after a jwt check.
+
+    Args:
+        role (string): required user role.
+    """
+
+    def decorator(function):
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            claims = flask_jwt_extended.get_jwt_claims()
+
+            if claims.get("role") != role:
+                return errors.forbidden(f"{role} role required")
+
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
 def get_user_tokens(user):
     """
     returns all user tokens.
@@ -77,13 +107,48 @@ def revoke_all_user_tokens(user):
 
     Args:
         user (string): user identity
+
+    Returns:
+        int: number of tokens revoked.
+    """
+
+    return revoke_all_users_tokens([user])
+
+
+def revoke_all_users_tokens(users):
+    """
+    revokes all unrevoked tokens of many users with one UPDATE statement.
+
+    Revoked tokens are dropped from the revocation cache on commit.
+
+    Args:
+        users (list): user identities
+
+    Returns:
+        int: number of tokens revoked.
     """
+    TokenBlacklist = token_blacklist.TokenBlacklist
 
-    tokens = token_blacklist.TokenBlacklist.query.filter_by(
-        user=user, revoked=False).all()
+    if not users:
+        return 0
 
-    for token in tokens:
-        revoke_token(token)
+    query = TokenBlacklist.query.filter(
+        TokenBlacklist.user.in_(users), TokenBlacklist.revoked == False)
+    jtis = [jti for jti, in query.with_entities(TokenBlacklist.jti)]
+
+    if not jtis:
+        return 0
+
+    count = query.update({TokenBlacklist.revoked: True},
+                         synchronize_session=False)
+    token_cache.invalidate(*jtis)
+
+    # tokens already loaded in the session must not keep revoked False.
+    for instance in list(app.db.session.identity_map.values()):
+        if isinstance(instance, TokenBlacklist) and instance.user in users:
+            app.db.session.expire(instance, ["revoked"])
+
+    return count
 
 
 def revoke_token(token):
@@ -106,14 +171,59 @@ def unrevoke_token(token):
     token.revoked = False
 
 
+def _expired_tokens_delete(now, chunk_size=None):
+    table = token_blacklist.TokenBlacklist.__table__
+
+    if chunk_size is None:
+        return table.delete().where(table.c.expires < now)
+
+    if app.db.session.bind.dialect.name == "mysql":
+        return sqlalchemy.text(
+            "DELETE FROM token_blacklist WHERE expires < :now "
+            "ORDER BY expires LIMIT :limit").bindparams(
+                now=now, limit=chunk_size)
+
+    chunk = sqlalchemy.select([table.c.id]).where(
+        table.c.expires < now).order_by(table.c.expires).limit(chunk_size)
+
+    return table.delete().where(table.c.id.in_(chunk))
+
+
 def prune_database():
     """
-    Delete all expired tokens from database
+    Delete all expired tokens from database with a single statement.
+
+    Returns:
+        int: number of tokens deleted.
     """
 
     now = datetime.datetime.now()
-    expired = token_blacklist.TokenBlacklist.query.filter(
-        token_blacklist.TokenBlacklist.expires < now).all()
 
-    for token in expired:
-        app.db.session.delete(token)
\ No newline at end of file
+    return app.db.session.execute(_expired_tokens_delete(now)).rowcount
+
+
+def prune_expired_tokens(chunk_size=1000):
+    """
+    Delete expired tokens from database, chunk_size rows per statement.
+
+    Every chunk is committed on its own so the table is never locked for
+    long.
+
+    Args:
+        chunk_size (int): tokens deleted per statement.
+
+    Returns:
+        int: number of tokens deleted.
+    """
+
+    now = datetime.datetime.now()
+    deleted = 0
+
+    while True:
+        count = app.db.session.execute(
+            _expired_tokens_delete(now, chunk_size)).rowcount
+        app.db.session.commit()
+        deleted += count
+
+        if count < chunk_size:
+            return deleted
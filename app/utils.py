@@ -1,4 +1,6 @@
+import base64
 import functools
+import json
 import uuid
 import flask
 import app
@@ -67,4 +69,66 @@ def to_snake_case(word):
 
         result = result + character.lower()
 
-    return result
\ No newline at end of file
+    return result
+
+
+def encode_cursor(values):
+    """Encodes pagination cursor.
+
+    Args:
+        values (list): cursor key values.
+
+    Returns:
+        string: opaque url safe cursor.
+    """
+    data = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    """Decodes pagination cursor.
+
+    Args:
+        cursor (string): opaque cursor from encode_cursor.
+        size (integer): expected number of values.
+
+    Returns:
+        list: cursor key values, strings, numbers, booleans or None.
+
+    Raises:
+        InvalidCursorError: malformed cursor.
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(data.decode())
+    except (ValueError, TypeError):
+        raise errors.InvalidCursorError(cursor)
+
+    if not isinstance(values, list) or len(values) != size or any(
+            isinstance(value, (dict, list)) for value in values):
+        raise errors.InvalidCursorError(cursor)
+
+    return values
+
+
+def get_cursor_args():
+    """Gets cursor pagination params from request.
+
+    Cursor pagination is used when the request has an after or before param,
+    an empty after param requests the first page.
+
+    Returns:
+        dict: after, before and include_total params, None if the request
+            doesn't use cursor pagination.
+    """
+    args = flask.request.args
+
+    if "after" not in args and "before" not in args:
+        return None
+
+    return {
+        "after": args.get("after") if "before" not in args else None,
+        "before": args.get("before"),
+        "include_total": args.get("include_total", "").lower() in
+        ["1", "true"]
+    }
@@ -27,7 +27,39 @@ class Config(object):
         SUBMISSIONS_PER_PAGE: submissions per page for pagination.
         LOCATIONS_PER_PAGE: locations (states, counties, places, 
             consolidated cities) per page for pagination.
+        LOCATIONS_MAX_AGE: seconds browsers may reuse locations responses.
         PER_PAGE: items per page for pagination.
+        AUTOCOMPLETE_LIMIT: names per autocomplete response by default.
+        AUTOCOMPLETE_MAX_LIMIT: most names per autocomplete response.
+        MATCH_BATCH_SIZE: maximum student profiles per batch match request.
+        BULK_CHUNK_SIZE: items written per transaction by bulk create
+            requests.
+        BULK_MAX_ITEMS: maximum items per bulk create request.
+        JSON_CACHE_SIZE: entities whose serialized JSON is cached per
+            process, nothing is cached if 0.
+        SQL_METRICS_ENABLED: record SQL statements executed per request.
+        SQL_METRICS_HEADERS: send request SQL statement count and time as
+            response headers, defaults to debug mode.
+        SQL_METRICS_SLOWEST: slowest statements kept per request and
+            endpoint.
+        TOKEN_CACHE_SIZE: token revocation states cached per process.
+        TOKEN_CACHE_TTL: seconds a token revocation state stays cached.
+        TOKEN_CACHE_REDIS_URL: Redis shared token revocation cache, per
+            process cache if not set.
+        TOKEN_PRUNE_INTERVAL: seconds between background prunes of expired
+            tokens, no background pruning if not set.
+        TOKEN_PRUNE_CHUNK_SIZE: expired tokens deleted per statement.
+        PASSWORD_HASH_METHOD: password hash method, pbkdf2:sha256, scrypt
+            or argon2.
+        PASSWORD_HASH_COST: password hash cost, defaults to the method's
+            default. See app.security.hashing.
+        PASSWORD_HASH_WORKERS: processes hashing passwords, hashes run in
+            the request thread if 0.
+        GEOCODES_PATH: census FIPS codes workbook.
+        GEOCODES_BATCH_SIZE: rows inserted per statement when importing
+            geocodes.
+        GEOCODES_LOOKUP_PATH: FIPS codes lookup table validating location
+            requirement names, no validation if not set.
         UPLOADED_PHOTOS_DEST: photos destination directory.
         UPLOADED_PHOTOS_URL: url to access photos.
     """
@@ -75,7 +107,32 @@ class Config(object):
     SCHOLARSHIPS_PER_PAGE = os.environ.get("SCHOLARSHIPS_PER_PAGE") or 5
     SUBMISSIONS_PER_PAGE = os.environ.get("SUBMISSIONS_PER_PAGE") or 5
     LOCATIONS_PER_PAGE = os.environ.get("LOCATIONS_PER_PAGE") or 5
+    LOCATIONS_MAX_AGE = int(os.environ.get("LOCATIONS_MAX_AGE") or 86400)
     PER_PAGE = os.environ.get("PER_PAGE") or 5
+    AUTOCOMPLETE_LIMIT = int(os.environ.get("AUTOCOMPLETE_LIMIT") or 10)
+    AUTOCOMPLETE_MAX_LIMIT = int(
+        os.environ.get("AUTOCOMPLETE_MAX_LIMIT") or 50)
+    MATCH_BATCH_SIZE = os.environ.get("MATCH_BATCH_SIZE") or 1000
+    BULK_CHUNK_SIZE = int(os.environ.get("BULK_CHUNK_SIZE") or 500)
+    BULK_MAX_ITEMS = int(os.environ.get("BULK_MAX_ITEMS") or 10000)
+    JSON_CACHE_SIZE = int(os.environ.get("JSON_CACHE_SIZE") or 10000)
+    SQL_METRICS_ENABLED = os.environ.get("SQL_METRICS_ENABLED") or True
+    SQL_METRICS_HEADERS = os.environ.get("SQL_METRICS_HEADERS")
+    SQL_METRICS_SLOWEST = int(os.environ.get("SQL_METRICS_SLOWEST") or 5)
+    TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE") or 10000)
+    TOKEN_CACHE_TTL = int(os.environ.get("TOKEN_CACHE_TTL") or 30)
+    TOKEN_CACHE_REDIS_URL = os.environ.get("TOKEN_CACHE_REDIS_URL")
+    TOKEN_PRUNE_INTERVAL = os.environ.get("TOKEN_PRUNE_INTERVAL")
+    TOKEN_PRUNE_CHUNK_SIZE = int(
+        os.environ.get("TOKEN_PRUNE_CHUNK_SIZE") or 1000)
+    PASSWORD_HASH_METHOD = os.environ.get(
+        "PASSWORD_HASH_METHOD") or "pbkdf2:sha256"
+    PASSWORD_HASH_COST = os.environ.get("PASSWORD_HASH_COST")
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS") or 0)
+    GEOCODES_PATH = os.environ.get("GEOCODES_PATH") or os.path.join(
+        basedir, "static/files/geocodes/all-geocodes-v2016.xlsx")
+    GEOCODES_BATCH_SIZE = int(os.environ.get("GEOCODES_BATCH_SIZE") or 5000)
+    GEOCODES_LOOKUP_PATH = os.environ.get("GEOCODES_LOOKUP_PATH")
     UPLOADED_PHOTOS_DEST = os.environ.get(
         "UPLOADED_PHOTOS_DEST") or "static/photos/"
     UPLOADED_PHOTOS_URL = os.environ.get(
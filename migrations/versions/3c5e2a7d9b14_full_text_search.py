@@ -0,0 +1,90 @@
+"""full text search indexes for college and scholarship details
+
+Revision ID: 3c5e2a7d9b14
+Revises: fb0df8103eeb
+Create Date: 2026-10-17 10:12:41.203518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects import sqlite
+
+
+# revision identifiers, used by Alembic.
+revision = '3c5e2a7d9b14'
+down_revision = 'fb0df8103eeb'
+branch_labels = None
+depends_on = None
+
+# (index name, table, indexed columns) at this revision.
+INDEXES = [
+    ('college_details_fts', 'college_details',
+     ['name', 'type_of_institution', 'setting', 'religious_affiliation',
+      'location_address']),
+    ('scholarship_details_fts', 'scholarship_details',
+     ['name', 'description', 'type', 'group']),
+]
+
+
+def sqlite_statements(name, table, columns, tokenizer):
+    quote = sqlite.dialect().identifier_preparer.quote
+    table = quote(table)
+    new = ', '.join(f'new.{quote(column)}' for column in columns)
+    old = ', '.join(f'old.{quote(column)}' for column in columns)
+    columns = ', '.join(quote(column) for column in columns)
+
+    return [
+        f'CREATE VIRTUAL TABLE {name} USING fts5({columns}, '
+        f"content={table}, content_rowid='id', tokenize='{tokenizer}')",
+        f'CREATE TRIGGER {name}_ai AFTER INSERT ON {table} BEGIN '
+        f'INSERT INTO {name}(rowid, {columns}) VALUES (new.id, {new}); END',
+        f'CREATE TRIGGER {name}_ad AFTER DELETE ON {table} BEGIN '
+        f'INSERT INTO {name}({name}, rowid, {columns}) '
+        f"VALUES ('delete', old.id, {old}); END",
+        f'CREATE TRIGGER {name}_au AFTER UPDATE ON {table} BEGIN '
+        f'INSERT INTO {name}({name}, rowid, {columns}) '
+        f"VALUES ('delete', old.id, {old}); "
+        f'INSERT INTO {name}(rowid, {columns}) VALUES (new.id, {new}); END',
+        f"INSERT INTO {name}({name}) VALUES ('rebuild')",
+    ]
+
+
+def sqlite_drop(bind, name):
+    for suffix in ['ai', 'ad', 'au']:
+        bind.execute(sa.text(f'DROP TRIGGER IF EXISTS {name}_{suffix}'))
+
+    bind.execute(sa.text(f'DROP TABLE IF EXISTS {name}'))
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    for name, table, columns in INDEXES:
+        if bind.dialect.name == 'sqlite':
+            try:
+                for statement in sqlite_statements(name, table, columns,
+                                                   'trigram'):
+                    bind.execute(sa.text(statement))
+            except sa.exc.OperationalError:
+                # trigram tokenizer needs SQLite 3.34.
+                sqlite_drop(bind, name)
+                for statement in sqlite_statements(name, table, columns,
+                                                   'unicode61'):
+                    bind.execute(sa.text(statement))
+        elif bind.dialect.name == 'mysql':
+            quote = mysql.dialect().identifier_preparer.quote
+            bind.execute(
+                sa.text(f'ALTER TABLE {quote(table)} ADD FULLTEXT INDEX '
+                        f'{name} ({", ".join(map(quote, columns))}) '
+                        'WITH PARSER ngram'))
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    for name, table, columns in INDEXES:
+        if bind.dialect.name == 'sqlite':
+            sqlite_drop(bind, name)
+        elif bind.dialect.name == 'mysql':
+            bind.execute(sa.text(f'ALTER TABLE {table} DROP INDEX {name}'))
@@ -0,0 +1,69 @@
+"""unique indexes of association tables
+
+Revision ID: 4e8b1d7c3a95
+Revises: 9a4e7c2d5f18
+Create Date: 2026-10-17 15:12:44.203518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e8b1d7c3a95'
+down_revision = '9a4e7c2d5f18'
+branch_labels = None
+depends_on = None
+
+# table, unique index, index it replaces, owner and target columns.
+INDEXES = [
+    ('college_major', 'uq_college_major', 'ix_college_major_college_id',
+     ['college_id', 'major_id']),
+    ('program_qualification_round', 'uq_program_qualification_round',
+     'ix_program_qualification_round_program_id',
+     ['program_id', 'qualification_round_id']),
+    ('scholarships_needed', 'uq_scholarships_needed',
+     'ix_scholarships_needed_needs_id', ['needs_id', 'needed_id']),
+    ('program_requirement_qualification_round',
+     'uq_program_requirement_qualification_round',
+     'ix_program_requirement_qualification_round_requirement_id',
+     ['program_requirement_id', 'qualification_round_id']),
+    ('chosen_college_requirement', 'uq_chosen_college_requirement',
+     'ix_chosen_college_requirement_scholarship_id',
+     ['scholarship_id', 'question_id']),
+    ('selection_requirement_option', 'uq_selection_requirement_option',
+     'ix_selection_requirement_option_selection_requirement_id',
+     ['selection_requirement_id', 'option_id']),
+    ('question_option', 'uq_question_option',
+     'ix_question_option_question_id', ['question_id', 'option_id']),
+]
+
+
+def deduplicate(table_name, columns):
+    """Keeps one row of every duplicated link."""
+    bind = op.get_bind()
+    table = sa.table(table_name, *[sa.column(column) for column in columns])
+    duplicates = bind.execute(
+        sa.select(list(table.c)).group_by(*table.c).having(
+            sa.func.count() > 1)).fetchall()
+
+    for row in duplicates:
+        values = dict(zip(columns, row))
+        bind.execute(table.delete().where(
+            sa.and_(*[table.c[column] == value
+                      for column, value in values.items()])))
+        bind.execute(table.insert().values(values))
+
+
+def upgrade():
+    for table, name, replaced, columns in INDEXES:
+        deduplicate(table, columns)
+        # created first, mysql keeps an index on the foreign key.
+        op.create_index(name, table, columns, unique=True)
+        op.drop_index(replaced, table_name=table)
+
+
+def downgrade():
+    for table, name, replaced, columns in reversed(INDEXES):
+        op.create_index(replaced, table, columns, unique=False)
+        op.drop_index(name, table_name=table)
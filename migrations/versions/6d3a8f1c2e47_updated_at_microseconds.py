@@ -0,0 +1,47 @@
+"""microseconds in updated_at on mysql
+
+Revision ID: 6d3a8f1c2e47
+Revises: 4e8b1d7c3a95
+Create Date: 2026-10-17 19:05:12.846203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = '6d3a8f1c2e47'
+down_revision = '4e8b1d7c3a95'
+branch_labels = None
+depends_on = None
+
+# tables of DateAudit models.
+TABLES = [
+    'college', 'college_details', 'grade', 'location', 'major', 'option',
+    'program', 'program_requirement', 'qualification_round', 'question',
+    'scholarship', 'scholarship_details', 'submission', 'user'
+]
+
+
+def upgrade():
+    # other databases already keep microseconds.
+    if op.get_bind().dialect.name != 'mysql':
+        return
+
+    for table in TABLES:
+        op.alter_column(table, 'updated_at',
+                        existing_type=sa.DateTime(),
+                        type_=mysql.DATETIME(fsp=6),
+                        existing_nullable=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+
+    for table in TABLES:
+        op.alter_column(table, 'updated_at',
+                        existing_type=mysql.DATETIME(fsp=6),
+                        type_=sa.DateTime(),
+                        existing_nullable=True)
@@ -0,0 +1,37 @@
+"""table versions for process caches
+
+Revision ID: 7b2e9c4f1a63
+Revises: 6d3a8f1c2e47
+Create Date: 2026-10-17 21:18:36.402715
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2e9c4f1a63'
+down_revision = '6d3a8f1c2e47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    table_version = op.create_table('table_version',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql'), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    # rows of the existing tables, so the first commits writing them don't
+    # race to insert them.
+    names = sa.inspect(op.get_bind()).get_table_names()
+    op.bulk_insert(table_version, [{
+        'name': name,
+        'version': 0
+    } for name in names if name not in ('alembic_version', 'table_version')])
+
+
+def downgrade():
+    op.drop_table('table_version')
@@ -15,7 +15,7 @@ from app.models.association_tables import ProgramRequirement
 
 app = create_app()
 
-# cli.register(app)
+cli.register(app)
 
 
 @app.shell_context_processor
@@ -236,4 +236,38 @@ def test_logout_all_success(app, client, user):
     with app.app_context():
         tokens_count = token_blacklist.TokenBlacklist.query.filter_by(
             user=json["id"], revoked=False).count()
-        assert tokens_count == 0
\ No newline at end of file
+        assert tokens_count == 0
+
+
+def test_logout_users(app, client, user):
+    """Revokes every token of many users at once."""
+
+    with app.app_context():
+        for username in ["alice", "bob", "carol"]:
+            for i in range(2):
+                security.add_token_to_database(
+                    flask_jwt_extended.create_refresh_token(username))
+
+        alice_token = token_blacklist.TokenBlacklist.query.filter_by(
+            user="alice").first()
+        decoded_token = {"jti": alice_token.jti}
+        assert security.is_token_revoked(decoded_token) == False
+
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    response = client.post("/auth/logout/users", json={"users": "alice"})
+    assert response.status_code == 400
+
+    response = client.post(
+        "/auth/logout/users", json={"users": ["alice", "bob"]})
+    assert response.status_code == 200
+    assert response.get_json()["revoked"] == 4
+
+    with app.app_context():
+        tokens = token_blacklist.TokenBlacklist.query.filter(
+            token_blacklist.TokenBlacklist.user != "test").all()
+        assert sorted((token.user, token.revoked) for token in tokens) == [
+            ("alice", True), ("alice", True), ("bob", True), ("bob", True),
+            ("carol", False), ("carol", False)
+        ]
+        assert security.is_token_revoked(decoded_token) == True
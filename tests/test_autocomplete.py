@@ -0,0 +1,47 @@
+import app as application
+from app import autocomplete
+from app.models import major as major_model
+
+
+def test_prefix_index():
+    index = autocomplete.PrefixIndex([(1, "University of Oregon"),
+                                      (2, "Oregon State University"),
+                                      (3, "Portland Community College"),
+                                      (4, None)])
+
+    assert index.search("ore") == [(2, "Oregon State University"),
+                                   (1, "University of Oregon")]
+    assert index.search("UNIV", limit=1) == [(1, "University of Oregon")]
+    assert index.search("community c") == [(3, "Portland Community College")]
+    assert index.search("") == []
+    assert index.search("x") == []
+
+
+def test_autocomplete(app, client, user, colleges):
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    response = client.get("/api/autocomplete?kind=college&prefix=TEST&limit=2")
+    assert response.status_code == 200
+    assert response.get_json()["items"] == [{
+        "id": 1,
+        "name": "test college 0"
+    }, {
+        "id": 2,
+        "name": "test college 1"
+    }]
+
+    response = client.get("/api/autocomplete?kind=major&prefix=bio")
+    assert response.get_json()["items"] == []
+
+    with app.app_context():
+        application.db.session.add(major_model.Major(name="Marine Biology"))
+        application.db.session.commit()
+
+    response = client.get("/api/autocomplete?kind=major&prefix=bio")
+    assert response.get_json()["items"] == [{
+        "id": 1,
+        "name": "Marine Biology"
+    }]
+
+    response = client.get("/api/autocomplete?kind=scholarship&prefix=a")
+    assert response.status_code == 400
@@ -1,9 +1,14 @@
+import pytest
+import sqlalchemy
+
 from app import db
+from app.models import association_tables
 from app.models.college import College
 from app.models.college_details import CollegeDetails
 from app.models.detail import Detail
 from app.models.major import Major
 from app.models.scholarship import Scholarship
+from app.models.common import bulk_association
 
 url = "/api/colleges"
 
@@ -168,6 +173,97 @@ def test_college_majors(app, client, auth):
             assert major["id"] in [3, 4]
 
 
+def test_college_majors_links(app, client, user):
+    """ repeated and missing major ids are linked once """
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    with app.app_context():
+        college = College(college_details=CollegeDetails(name="test college"))
+        db.session.add(college)
+
+        for i in range(3):
+            db.session.add(Major(name=f"test major {i}"))
+
+        db.session.commit()
+        college_id = college.id
+        major_ids = [major.id for major in Major.query.all()]
+
+    for _ in range(2):
+        response = client.post(
+            url + f"/{college_id}/majors",
+            json=major_ids[:2] + [major_ids[0], 99999])
+
+        assert response.status_code == 200
+
+    with app.app_context():
+        assert College.query.get(college_id).majors.count() == 2
+
+    response = client.delete(
+        url + f"/{college_id}/majors", json=[major_ids[0], "invalid"])
+
+    assert response.status_code == 400
+
+    response = client.delete(url + f"/{college_id}/majors", json=major_ids)
+
+    assert response.status_code == 200
+
+    with app.app_context():
+        assert College.query.get(college_id).majors.count() == 0
+
+
+def test_college_majors_conditional(app, client, user):
+    """ linking different majors with the same count and id sum """
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    with app.app_context():
+        college = College(college_details=CollegeDetails(name="test college"))
+        db.session.add(college)
+
+        for i in range(6):
+            db.session.add(Major(name=f"test major {i}"))
+
+        db.session.commit()
+        college_id = college.id
+        major_ids = [major.id for major in Major.query.order_by(Major.id)]
+
+    majors_url = url + f"/{college_id}/majors"
+    client.post(majors_url, json=[major_ids[0], major_ids[4], major_ids[5]])
+    etag = client.get(majors_url).headers["ETag"]
+
+    client.delete(majors_url, json=[major_ids[0], major_ids[4]])
+    client.post(majors_url, json=[major_ids[1], major_ids[3]])
+    response = client.get(majors_url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert sorted(item["id"] for item in response.get_json()["items"]) == \
+        [major_ids[1], major_ids[3], major_ids[5]]
+
+
+def test_college_majors_unique(app):
+    """ links are inserted once and the index rejects duplicates """
+    table = association_tables.college_major
+
+    with app.app_context():
+        college = College(college_details=CollegeDetails(name="test college"))
+        major = Major(name="test major")
+        db.session.add_all([college, major])
+        db.session.commit()
+
+        assert bulk_association.add_links(table.c.college_id, college.id,
+                                          table.c.major_id, [major.id]) == 1
+        assert bulk_association.add_links(table.c.college_id, college.id,
+                                          table.c.major_id, [major.id]) == 0
+        db.session.commit()
+
+        with pytest.raises(sqlalchemy.exc.IntegrityError):
+            db.session.execute(table.insert().values(
+                college_id=college.id, major_id=major.id))
+
+        db.session.rollback()
+        assert college.majors.count() == 1
+
+
 def test_college_additional_details(app, client, auth):
     """tests college additional details"""
 
@@ -238,3 +334,44 @@ def test_get_college_scholarships(app, client, auth, scholarships, colleges):
         for scholarship in scholarships:
             assert college.scholarships.filter_by(
                 id=scholarship["id"]).count() == 1
+
+
+def test_post_colleges_bulk(app, client, user, colleges):
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+    app.config["BULK_CHUNK_SIZE"] = 2
+
+    response = client.post(
+        url + "/bulk",
+        json=[{
+            "name": "bulk college 0",
+            "setting": "urban"
+        }, {
+            "setting": "rural"
+        }, "college", {
+            "name": "test college 0"
+        }, {
+            "name": "bulk college 1"
+        }])
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["created"] == 2
+    assert [result["status"] for result in data["results"]
+            ] == [201, 400, 400, 400, 201]
+    assert data["results"][1]["errors"] == {"name": ["name required"]}
+
+    response = client.post(
+        url + "/bulk",
+        data='{"name": "bulk college 2"}\n\nnot json\n',
+        content_type="application/x-ndjson")
+
+    assert [result["status"] for result in response.get_json()["results"]
+            ] == [201, 400]
+
+    with app.app_context():
+        assert CollegeDetails.query.filter(
+            CollegeDetails.name.like("bulk college%")).count() == 3
+        assert CollegeDetails.first(name="bulk college 0").setting == "urban"
+
+    response = client.post(url + "/bulk", json={"name": "bulk college 3"})
+    assert response.status_code == 400
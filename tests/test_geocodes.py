@@ -0,0 +1,228 @@
+import openpyxl
+
+import app as application
+from app import cli, geocodes
+from app.models import county as county_model
+from app.models import geocode_checkpoint as geocode_checkpoint_model
+from app.models import place as place_model
+from app.models import state as state_model
+from app.scripts import us_states_prcss
+
+ROWS = [
+    ["010", "00", "000", "00000", "00000", "00000", "United States"],
+    ["040", "01", "000", "00000", "00000", "00000", "Alabama"],
+    ["050", "01", "001", "00000", "00000", "00000", "Autauga County"],
+    ["061", "01", "001", "90171", "00000", "00000", "Autaugaville CCD"],
+    ["050", "01", "003", "00000", "00000", "00000", "Baldwin County"],
+    ["162", "01", "000", "00000", "00124", "00000", "Abbeville city"],
+    ["040", "09", "000", "00000", "00000", "00000", "Connecticut"],
+    ["162", "09", "000", "00000", "01150", "00000", "Ansonia city"],
+    ["170", "09", "000", "00000", "00000", "47500", "Milford city"],
+]
+
+
+def create_workbook(path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+
+    for _ in range(us_states_prcss.FIRST_ROW - 1):
+        ws.append(["header"])
+
+    for row in ROWS:
+        ws.append(row)
+
+    wb.save(path)
+    return str(path)
+
+
+def test_iter_fips_codes(tmp_path):
+    path = create_workbook(tmp_path / "geocodes.xlsx")
+    codes = list(us_states_prcss.iter_fips_codes(path))
+
+    assert [code.kind for code in codes] == [
+        "state", "county", "county_subdivision", "county", "place", "state",
+        "place", "consolidated_city"
+    ]
+    assert codes[2].code == "00190171"
+
+    states = us_states_prcss.process_fips_codes(path)
+    assert list(states["01"]["counties"]) == ["001", "003"]
+    assert states["01"]["counties"]["001"]["subdivisions"] == {
+        "90171": "Autaugaville CCD"
+    }
+    assert states["09"]["consolidated_cities"] == {
+        "47500": {
+            "name": "Milford city"
+        }
+    }
+
+
+def test_import_geocodes(app, tmp_path):
+    path = create_workbook(tmp_path / "geocodes.xlsx")
+
+    with app.app_context():
+        for _ in range(2):
+            counts = geocodes.import_geocodes(path, batch_size=1)
+
+        assert counts == {
+            "state": 2,
+            "county": 2,
+            "place": 2,
+            "consolidated_city": 1
+        }
+
+        alabama = state_model.State.first(fips_code="01")
+        assert alabama.name == "Alabama"
+        assert [county.fips_code for county in alabama.counties] == [
+            "01001", "01003"
+        ]
+        assert county_model.County.query.count() == 2
+        assert place_model.Place.first(
+            fips_code="0901150").state.name == "Connecticut"
+        assert alabama.consolidated_cities.count() == 0
+
+
+def test_resume_import_geocodes(app, tmp_path):
+    path = create_workbook(tmp_path / "geocodes.xlsx")
+
+    with app.app_context():
+        geocodes.import_geocodes(path)
+        GeocodeCheckpoint = geocode_checkpoint_model.GeocodeCheckpoint
+        checkpoint = GeocodeCheckpoint.query.filter_by(state_fips="01").first()
+        assert checkpoint.rows == 3
+
+        application.db.session.delete(checkpoint)
+        application.db.session.commit()
+
+        counts = geocodes.import_geocodes(path, resume=True)
+
+        assert counts == {"state": 1, "county": 2, "place": 1, "skipped": 1}
+        assert geocodes.checkpointed_states() == {"01", "09"}
+        assert state_model.State.query.count() == 2
+        assert county_model.County.query.count() == 2
+
+
+def test_import_geocodes_workers(app, tmp_path):
+    path = create_workbook(tmp_path / "geocodes.xlsx")
+
+    with app.app_context():
+        counts = geocodes.import_geocodes(path, workers=2)
+
+        assert counts["state"] == 2
+        assert place_model.Place.query.count() == 2
+        assert geocodes.checkpointed_states() == {"01", "09"}
+
+
+def test_save_in_database_command(app, tmp_path):
+    path = create_workbook(tmp_path / "geocodes.xlsx")
+    cli.register(app)
+
+    result = app.test_cli_runner().invoke(
+        args=["geocodes", "save_in_database", "--path", path])
+
+    assert result.exit_code == 0
+    assert "2 states, 2 counties, 2 places and 1 consolidated" in result.output
+
+    with app.app_context():
+        assert application.db.session.query(state_model.State).count() == 2
+
+
+def test_lookup(tmp_path):
+    path = create_workbook(tmp_path / "geocodes.xlsx")
+    output = str(tmp_path / "geocodes.fips")
+
+    assert geocodes.lookup.build(path, output) == {
+        "state": 2,
+        "county": 2,
+        "place": 2,
+        "consolidated_city": 1
+    }
+
+    lookup = geocodes.FipsLookup.open(output)
+
+    assert lookup.name("county", "01003") == "Baldwin County"
+    assert lookup.name("place", "0901150") == "Ansonia city"
+    assert lookup.name("county", "01005") is None
+    assert lookup.find("state", " alabama ") == "01"
+    assert lookup.find("county", "Autauga", "01") == "01001"
+    assert lookup.find("county", "autauga county", "01") == "01001"
+    assert lookup.find("county", "Autauga", "09") is None
+    assert lookup.validate_location("Alabama", "Baldwin", "Abbeville") is None
+    assert lookup.validate_location("Connecticut", None, "Milford") is None
+    assert lookup.validate_location("Oregon") == "state Oregon not found"
+    assert lookup.validate_location(
+        "Connecticut", "Baldwin") == "county Baldwin not found in state " \
+        "Connecticut"
+
+    lookup.close()
+
+
+def test_add_location_requirement_validated(app, client, user, colleges,
+                                            tmp_path):
+    path = create_workbook(tmp_path / "geocodes.xlsx")
+    app.config["GEOCODES_LOOKUP_PATH"] = str(tmp_path / "geocodes.fips")
+
+    with app.app_context():
+        geocodes.lookup.build(path, app.config["GEOCODES_LOOKUP_PATH"])
+
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+    location = {
+        "state": "Alabama",
+        "county": "Baldwin County",
+        "place": "Abbeville",
+        "zip_code": None,
+        "blacklist": 0
+    }
+
+    response = client.post(
+        "/api/colleges/1/location_requirements", json=location)
+    assert response.status_code == 201
+
+    location["place"] = "Ansonia"
+    response = client.post(
+        "/api/colleges/1/location_requirements", json=location)
+    assert response.status_code == 400
+    assert "Ansonia" in response.get_json()["message"]
+
+
+def test_locations_api(app, client, user, tmp_path):
+    path = create_workbook(tmp_path / "geocodes.xlsx")
+
+    with app.app_context():
+        geocodes.import_geocodes(path)
+
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    response = client.get("/api/locations/states?per_page=1")
+    assert response.status_code == 200
+    assert "max-age=86400" in response.headers["Cache-Control"]
+    data = response.get_json()
+    assert [state["name"] for state in data["items"]] == ["Alabama"]
+
+    response = client.get(data["links"]["next"])
+    data = response.get_json()
+    assert [state["name"] for state in data["items"]] == ["Connecticut"]
+    assert data["links"]["next"] is None
+
+    response = client.get(data["items"][0]["_links"]["places"])
+    assert [place["fips_code"] for place in response.get_json()["items"]
+            ] == ["0901150"]
+
+    response = client.get(
+        "/api/locations/states/01/counties?search=bald&include_total=1")
+    data = response.get_json()
+    assert [county["name"] for county in data["items"]] == ["Baldwin County"]
+    assert data["meta"]["total_items"] == 1
+
+    response = client.get(
+        "/api/locations/states/01/counties",
+        headers={"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == 200
+
+    etag = response.headers["ETag"]
+    response = client.get(
+        "/api/locations/states/01/counties",
+        headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    assert client.get("/api/locations/states/99").status_code == 404
@@ -1,3 +1,4 @@
+from datetime import datetime
 from decimal import Decimal
 import flask
 import sqlalchemy
@@ -145,4 +146,94 @@ def test_majors_colleges(app, client, auth):
         colleges = College.query.limit(5).all()
 
         for i, college in enumerate(colleges):
-            assert major_colleges[i]["name"] == college.college_details.name
\ No newline at end of file
+            assert major_colleges[i]["name"] == college.college_details.name
+
+
+def test_get_majors_conditional(app, client, user):
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    with app.app_context():
+        for i in range(3):
+            db.session.add(Major(name=f"test major {i}"))
+
+        db.session.commit()
+        major_id = Major.query.first().id
+
+    response = client.get(url)
+    etag = response.headers["ETag"]
+
+    assert response.status_code == 200
+    assert response.headers["Last-Modified"]
+    assert "no-cache" in response.headers["Cache-Control"]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+
+    response = client.get(
+        url + "?page=2&per_page=1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+
+    response = client.get(
+        url + f"/{major_id}",
+        headers={"If-Modified-Since": response.headers["Last-Modified"]})
+
+    assert response.status_code == 304
+
+    with app.app_context():
+        db.session.delete(Major.query.get(major_id))
+        db.session.commit()
+
+    response = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert client.get(url + f"/{major_id}").status_code == 404
+
+
+def test_get_majors_json_cache(app, client, user):
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    with app.app_context():
+        db.session.add(Major(name="test major", description="first"))
+        db.session.commit()
+        major_id = Major.query.first().id
+
+    response = client.get(url + f"/{major_id}")
+
+    assert response.status_code == 200
+    assert response.get_json()["description"] == "first"
+    assert client.get(url).get_json()["items"][0]["name"] == "test major"
+
+    entries = app.extensions["json_cache"]["entries"]
+
+    assert set(entries[("major", (major_id, ))]) == {
+        ("to_dict", ""), ("for_pagination", "")
+    }
+    assert client.get(url + f"/{major_id}").data == response.data
+
+    with app.app_context():
+        Major.query.get(major_id).description = "second"
+        db.session.flush()
+
+        assert ("major", (major_id, )) in entries
+
+        db.session.commit()
+
+    assert ("major", (major_id, )) not in entries
+    assert client.get(
+        url + f"/{major_id}").get_json()["description"] == "second"
+
+    # changed by another process, the cache doesn't hear about it.
+    with app.app_context():
+        db.session.execute(Major.__table__.update().where(
+            Major.id == major_id).values(description="third",
+                                          updated_at=datetime.utcnow()))
+        db.session.commit()
+
+    assert ("major", (major_id, )) in entries
+    assert client.get(
+        url + f"/{major_id}").get_json()["description"] == "third"
@@ -0,0 +1,644 @@
+import app as application
+from app import matching
+from app.models import association_tables
+from app.models import college as college_model
+from app.models import college_details as college_details_model
+from app.models import grade as grade_model
+from app.models import location as location_model
+from app.models import option as option_model
+from app.models import program as program_model
+from app.models import qualification_round as qualification_round_model
+from app.models import question as question_model
+from app.models import scholarship as scholarship_model
+from app.models import scholarship_details as scholarship_details_model
+
+url = "/api/scholarships/match"
+
+
+def create_catalogue():
+    """Creates scholarships with one requirement type each.
+
+    Returns:
+        dict: scholarship ids by name and ids of the related entities.
+    """
+    db = application.db
+    college = college_model.College(
+        college_details=college_details_model.CollegeDetails(
+            name="match college"))
+    db.session.add(college)
+
+    names = [
+        "open", "boolean", "selection", "grade", "location", "program",
+        "chosen college", "needs boolean", "excluded"
+    ]
+    scholarships = {}
+
+    for name in names:
+        scholarship = scholarship_model.Scholarship(
+            scholarship_details=scholarship_details_model.ScholarshipDetails(
+                name=name),
+            college=college,
+            exclude_from_match=name == "excluded")
+        db.session.add(scholarship)
+        scholarships[name] = scholarship
+
+    question = question_model.Question(name="is veteran")
+    select_question = question_model.Question(name="ethnicity")
+    option = option_model.Option(name="hispanic")
+    other_option = option_model.Option(name="other")
+    grade = grade_model.Grade(name="gpa", min=0, max=4)
+    program = program_model.Program(name="honors")
+    qualification_round = qualification_round_model.QualificationRound(
+        name="final round")
+
+    for instance in [
+            question, select_question, option, other_option, grade, program,
+            qualification_round
+    ]:
+        db.session.add(instance)
+
+    db.session.flush()
+
+    scholarships["boolean"].add_boolean_requirement(question, True)
+    scholarships["excluded"].add_boolean_requirement(question, True)
+
+    scholarships["selection"].add_selection_requirement(select_question)
+    scholarships["selection"].selection_requirements.first().add_option(
+        option)
+
+    group = scholarships["grade"].create_grade_requirement_group()
+    db.session.flush()
+    group.add_grade_requirement(grade, 3.0)
+
+    location = location_model.Location(
+        state="Florida", county="Miami-Dade", blacklist=False)
+    blacklisted = location_model.Location(
+        state="Florida", county="Miami-Dade", place="Hialeah", blacklist=True)
+    db.session.add(location)
+    db.session.add(blacklisted)
+    scholarships["location"].add_location_requirement(location)
+    scholarships["location"].add_location_requirement(blacklisted)
+
+    program_requirement = association_tables.ProgramRequirement(
+        program=program)
+    db.session.add(program_requirement)
+    scholarships["program"].programs_requirement.append(program_requirement)
+    program_requirement.qualification_rounds.append(qualification_round)
+
+    scholarships["chosen college"].add_chosen_college_requirement(question)
+
+    scholarships["needs boolean"].add_needed_scholarship(
+        scholarships["boolean"])
+
+    db.session.commit()
+
+    return {
+        "ids": {name: s.id for name, s in scholarships.items()},
+        "question": question.id,
+        "option": option.id,
+        "other_option": other_option.id,
+        "grade": grade.id,
+        "program": program.id,
+        "qualification_round": qualification_round.id,
+        "college": college.id
+    }
+
+
+def test_match_requirements(app):
+    """Matches profiles against every requirement type."""
+
+    with app.app_context():
+        catalogue = create_catalogue()
+        ids = catalogue["ids"]
+
+        empty = matching.match(matching.Profile())
+        assert empty == [ids["open"]]
+
+        profile = matching.Profile.from_dict({
+            "grades": [{
+                "grade_id": catalogue["grade"],
+                "value": 3.5
+            }],
+            "answers": [{
+                "question_id": catalogue["question"],
+                "value": 1
+            }],
+            "options": [catalogue["option"]],
+            "location": {
+                "state": " florida",
+                "county": "MIAMI-DADE",
+                "place": "Miami"
+            },
+            "programs": [{
+                "program_id": catalogue["program"],
+                "qualification_rounds": [catalogue["qualification_round"]]
+            }],
+            "chosen_college": catalogue["college"]
+        })
+
+        assert matching.match(profile) == sorted(
+            id for name, id in ids.items() if name != "excluded")
+
+        profile = matching.Profile.from_dict({
+            "grades": [{
+                "grade_id": catalogue["grade"],
+                "value": 2.5
+            }],
+            "answers": [{
+                "question_id": catalogue["question"],
+                "value": 0
+            }],
+            "options": [catalogue["other_option"]],
+            "location": {
+                "state": "Florida",
+                "county": "Miami-Dade",
+                "place": "Hialeah"
+            },
+            "programs": [{
+                "program_id": catalogue["program"],
+                "qualification_rounds": []
+            }]
+        })
+
+        assert matching.match(profile) == [ids["open"]]
+
+
+def test_engine_invalidated_on_commit(app):
+    """Compiled engine is discarded when requirements change."""
+
+    with app.app_context():
+        catalogue = create_catalogue()
+        engine = matching.get_engine()
+
+        assert matching.get_engine() is engine
+
+        scholarship = scholarship_model.Scholarship.get(
+            catalogue["ids"]["open"])
+        scholarship.exclude_from_match = True
+        application.db.session.commit()
+
+        assert matching.get_engine() is not engine
+        assert catalogue["ids"]["open"] not in matching.match(
+            matching.Profile())
+
+
+def test_caches_expired_by_other_processes(app):
+    """Caches are rebuilt after another process commits their tables."""
+    from app.matching import grade_index
+
+    with app.app_context():
+        catalogue = create_catalogue()
+        engine = matching.get_engine()
+        index = grade_index.get_grade_index()
+
+        grade = grade_model.Grade.query.get(catalogue["grade"])
+        grade.max = 5
+        application.db.session.commit()
+
+        # commits of this process refresh the index in place.
+        assert grade_index.get_grade_index() is index
+        assert matching.get_engine() is not engine
+        engine = matching.get_engine()
+
+        with application.db.engine.begin() as connection:
+            connection.execute(
+                "UPDATE scholarship SET exclude_from_match = 1 WHERE id = ?",
+                catalogue["ids"]["open"])
+            connection.execute(
+                "UPDATE table_version SET version = version + 1 "
+                "WHERE name IN ('scholarship', 'grade')")
+
+        assert matching.get_engine() is not engine
+        assert catalogue["ids"]["open"] not in matching.match(
+            matching.Profile())
+        assert grade_index.get_grade_index() is not index
+
+
+def test_match_endpoint(app, client, user):
+    """Matches profile through the api."""
+
+    with app.app_context():
+        catalogue = create_catalogue()
+
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    response = client.post(url, json=[])
+    assert response.status_code == 400
+    assert response.get_json(
+    )["message"] == "no data provided or bad structure"
+
+    response = client.post(url, json={"grades": [{"value": 1}]})
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "missing fields in profile"
+
+    response = client.post(
+        url, json={"answers": [{
+            "question_id": 1,
+            "value": 3
+        }]})
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "invalid profile"
+
+    response = client.post(
+        url,
+        json={
+            "answers": [{
+                "question_id": catalogue["question"],
+                "value": 1
+            }]
+        })
+    assert response.status_code == 200
+    assert response.get_json()["scholarships"] == sorted([
+        catalogue["ids"]["open"], catalogue["ids"]["boolean"],
+        catalogue["ids"]["needs boolean"]
+    ])
+
+
+def batch_profiles(catalogue):
+    """Creates profiles covering every requirement outcome."""
+    profiles = [matching.Profile()]
+
+    for value in [0, 1]:
+        for grade in [2.5, 3.0, 4.0]:
+            for place in ["Miami", "Hialeah", None]:
+                profiles.append(
+                    matching.Profile.from_dict({
+                        "grades": [{
+                            "grade_id": catalogue["grade"],
+                            "value": grade
+                        }],
+                        "answers": [{
+                            "question_id": catalogue["question"],
+                            "value": value
+                        }],
+                        "options": [catalogue["option"]] if value else [],
+                        "location": {
+                            "state": "Florida",
+                            "county": "Miami-Dade",
+                            "place": place
+                        },
+                        "programs": [{
+                            "program_id":
+                            catalogue["program"],
+                            "qualification_rounds":
+                            [catalogue["qualification_round"]] if value else []
+                        }],
+                        "chosen_college":
+                        catalogue["college"] if place else None
+                    }))
+
+    return profiles
+
+
+def test_match_batch(app, monkeypatch):
+    """Batch match gives the same results as single profile match."""
+    from app.matching import batch
+
+    with app.app_context():
+        catalogue = create_catalogue()
+        profiles = batch_profiles(catalogue)
+        expected = [matching.match(profile) for profile in profiles]
+
+        assert matching.match_batch(profiles) == expected
+        assert matching.match_batch([]) == []
+
+        monkeypatch.setattr(batch, "numpy", None)
+        assert matching.match_batch(profiles) == expected
+
+
+def test_match_batch_endpoint(app, client, user):
+    """Matches batch of profiles through the api."""
+
+    with app.app_context():
+        catalogue = create_catalogue()
+
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    response = client.post(url + "/batch", json={"profiles": {}})
+    assert response.status_code == 400
+    assert response.get_json(
+    )["message"] == "no data provided or bad structure"
+
+    app.config["MATCH_BATCH_SIZE"] = 1
+    response = client.post(url + "/batch", json={"profiles": [{}, {}]})
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "too many profiles, maximum is 1"
+    app.config["MATCH_BATCH_SIZE"] = 10
+
+    response = client.post(
+        url + "/batch", json={"profiles": [{}, {
+            "grades": [{
+                "value": 1
+            }]
+        }]})
+    assert response.status_code == 400
+    assert response.get_json(
+    )["message"] == "missing fields in profile at index 1"
+
+    response = client.post(
+        url + "/batch",
+        json={
+            "profiles": [{}, {
+                "answers": [{
+                    "question_id": catalogue["question"],
+                    "value": 1
+                }]
+            }]
+        })
+    assert response.status_code == 200
+    assert response.get_json()["results"] == [{
+        "scholarships": [catalogue["ids"]["open"]]
+    }, {
+        "scholarships":
+        sorted([
+            catalogue["ids"]["open"], catalogue["ids"]["boolean"],
+            catalogue["ids"]["needs boolean"]
+        ])
+    }]
+
+
+def test_interval_tree():
+    """Interval tree gives the same result as a linear scan."""
+    import random
+    from app.matching import grade_index
+
+    generator = random.Random(0)
+    intervals = []
+
+    for key in range(200):
+        range_min = generator.randint(0, 36)
+        intervals.append((float(range_min),
+                          float(generator.randint(range_min, 36)), key))
+
+    tree = grade_index.IntervalTree(intervals)
+
+    for value in [v / 2 for v in range(-2, 76)]:
+        assert sorted(tree.stab(value)) == [
+            key for range_min, range_max, key in intervals
+            if range_min <= value <= range_max
+        ]
+
+
+def test_grade_index(app, client, user):
+    """Grade index is refreshed when grade requirements change."""
+
+    with app.app_context():
+        catalogue = create_catalogue()
+        scholarship = scholarship_model.Scholarship.get(
+            catalogue["ids"]["open"])
+        group = scholarship.create_grade_requirement_group()
+        application.db.session.commit()
+        grade_group = scholarship_model.Scholarship.get(
+            catalogue["ids"]["grade"]).grade_requirement_groups.first().id
+        group_id = group.id
+
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    url = f"/api/grades/{catalogue['grade']}/grade_requirement_groups"
+
+    response = client.get(url)
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "missing value"
+
+    response = client.get(url + "?value=a")
+    assert response.status_code == 400
+
+    response = client.get(url + "?value=3.5")
+    assert response.get_json()["grade_requirement_groups"] == [grade_group]
+
+    response = client.get(url + "?value=2.9")
+    assert response.get_json()["grade_requirement_groups"] == []
+
+    response = client.post(
+        f"/api/grade_requirement_groups/{group_id}/grade_requirements",
+        json=[{
+            "grade_id": catalogue["grade"],
+            "min": None,
+            "max": 3
+        }])
+    assert response.status_code == 200
+
+    response = client.get(url + "?value=2.9")
+    assert response.get_json()["grade_requirement_groups"] == [group_id]
+
+    response = client.get(url + "?value=3")
+    assert response.get_json()["grade_requirement_groups"] == sorted(
+        [grade_group, group_id])
+
+    response = client.delete(
+        f"/api/grade_requirement_groups/{group_id}/grade_requirements",
+        json=[catalogue["grade"]])
+    assert response.status_code == 200
+
+    response = client.get(url + "?value=3")
+    assert response.get_json()["grade_requirement_groups"] == [grade_group]
+
+    response = client.delete(
+        f"/api/scholarships/{catalogue['ids']['grade']}")
+    assert response.status_code == 200
+
+    response = client.get(url + "?value=3")
+    assert response.get_json()["grade_requirement_groups"] == []
+
+
+def test_location_index():
+    """Location index applies hierarchy, zip codes and blacklist."""
+    from app.matching import location_index
+
+    index = location_index.LocationIndex([
+        (1, "Florida", None, None, None, False),
+        (1, "Florida", "Miami-Dade", "Hialeah", None, True),
+        (2, None, None, None, "33101", False),
+        (3, "Texas", None, None, None, True),
+        (4, "Florida", "Broward", None, None, False),
+    ])
+
+    def address(state=None, county=None, place=None, zip_code=None):
+        return matching.profile.normalize_location(state, county, place,
+                                                   zip_code)
+
+    miami = address("florida", "miami-dade", "miami", "33101-1234")
+    hialeah = address("Florida", "Miami-Dade", "Hialeah", "33010")
+    austin = address("Texas", "Travis", "Austin", "73301")
+
+    assert index.excluded(miami) == {4}
+    assert index.excluded(hialeah) == {1, 2, 4}
+    assert index.excluded(austin) == {1, 2, 3, 4}
+    assert index.excluded(None) == {1, 2, 4}
+    assert index.accepting(miami) == {1, 2}
+    assert index.status(1, hialeah) == {
+        "accepted": False,
+        "blacklisted": True
+    }
+    assert index.status(3, miami) == {"accepted": True, "blacklisted": False}
+
+    index.remove(1)
+    assert index.excluded(hialeah) == {2, 4}
+    assert index.owners() == {2, 3, 4}
+
+
+def test_location_routes(app, client, user):
+    """Location index is refreshed when location requirements change."""
+
+    with app.app_context():
+        catalogue = create_catalogue()
+
+    scholarship_id = catalogue["ids"]["location"]
+    open_id = catalogue["ids"]["open"]
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    status_url = f"/api/scholarships/{scholarship_id}" \
+        "/location_requirements/status"
+    accepting_url = "/api/scholarships/location_requirements/accepting"
+    miami = "?state=Florida&county=Miami-Dade&place=Miami"
+
+    response = client.get(status_url + miami)
+    assert response.get_json() == {"accepted": True, "blacklisted": False}
+
+    response = client.get(status_url + "?state=Florida&county=Miami-Dade"
+                          "&place=Hialeah")
+    assert response.get_json() == {"accepted": False, "blacklisted": True}
+
+    response = client.get(accepting_url + miami)
+    assert response.get_json() == {
+        "accepted": [scholarship_id],
+        "excluded": []
+    }
+
+    response = client.post(
+        f"/api/scholarships/{open_id}/location_requirements",
+        json={
+            "state": None,
+            "county": None,
+            "place": None,
+            "zip_code": "33101",
+            "blacklist": 1
+        })
+    assert response.status_code == 201
+
+    response = client.get(accepting_url + miami + "&zip_code=33101-0001")
+    assert response.get_json() == {
+        "accepted": [scholarship_id],
+        "excluded": [open_id]
+    }
+
+    with app.app_context():
+        location_id = scholarship_model.Scholarship.get(
+            open_id).location_requirements.first().id
+
+    response = client.delete(
+        f"/api/scholarships/{open_id}/location_requirements/{location_id}")
+    assert response.status_code == 200
+
+    response = client.get(accepting_url + miami + "&zip_code=33101-0001")
+    assert response.get_json()["excluded"] == []
+
+    response = client.delete(f"/api/scholarships/{scholarship_id}")
+    assert response.status_code == 200
+
+    response = client.get(accepting_url + miami)
+    assert response.get_json() == {"accepted": [], "excluded": []}
+
+    response = client.get("/api/scholarships/0/location_requirements/status")
+    assert response.status_code == 404
+
+
+def test_dependency_graph():
+    """Dependency closure is maintained on insert and removal."""
+    from app.matching import dependencies
+
+    graph = dependencies.DependencyGraph([(1, 2), (2, 3), (5, 6), (6, 5)])
+
+    assert graph.needed(1) == {2, 3}
+    assert graph.cyclic == {5, 6}
+    assert graph.creates_cycle(3, 1)
+    assert not graph.creates_cycle(1, 3)
+
+    graph.add(4, 1)
+    assert graph.needed(4) == {1, 2, 3}
+    assert graph.needed_by[3] == {1, 2, 4}
+    assert graph.order().index(3) < graph.order().index(1)
+
+    try:
+        graph.add(3, 4)
+        assert False
+    except dependencies.CycleError as err:
+        assert str(err) == "scholarship 4 already needs scholarship 3"
+
+    graph.remove(1, 2)
+    assert graph.needed(4) == {1}
+    assert graph.needed_by[3] == {2}
+
+    graph.discard(1)
+    graph.discard(5)
+    assert graph.needed(4) == set()
+    assert 1 not in graph.needs and 1 not in graph.needed_by
+    assert graph.cyclic == set()
+
+
+def test_scholarships_needed_cycle(app, client, user):
+    """Scholarships needed cycles are rejected at insert."""
+
+    with app.app_context():
+        catalogue = create_catalogue()
+
+    ids = catalogue["ids"]
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    response = client.post(
+        f"/api/scholarships/{ids['open']}/scholarships_needed",
+        json=[ids["needs boolean"]])
+    assert response.status_code == 200
+
+    response = client.post(
+        f"/api/scholarships/{ids['boolean']}/scholarships_needed",
+        json=[ids["grade"], ids["open"]])
+    assert response.status_code == 400
+    assert response.get_json()["message"] == \
+        f"scholarship {ids['open']} already needs scholarship " \
+        f"{ids['boolean']}"
+
+    with app.app_context():
+        assert scholarship_model.Scholarship.get(
+            ids["boolean"]).scholarships_needed.count() == 0
+
+    response = client.delete(
+        f"/api/scholarships/{ids['needs boolean']}/scholarships_needed",
+        json=[ids["boolean"]])
+    assert response.status_code == 200
+
+    response = client.post(
+        f"/api/scholarships/{ids['boolean']}/scholarships_needed",
+        json=[ids["open"]])
+    assert response.status_code == 200
+
+    with app.app_context():
+        profile = matching.Profile.from_dict({
+            "answers": [{
+                "question_id": catalogue["question"],
+                "value": 1
+            }]
+        })
+        assert matching.match(profile) == sorted(
+            [ids["open"], ids["needs boolean"], ids["boolean"]])
+
+    response = client.delete(f"/api/scholarships/{ids['open']}")
+    assert response.status_code == 200
+
+    response = client.post(
+        f"/api/scholarships/{ids['needs boolean']}/scholarships_needed",
+        json=[ids["boolean"]])
+    assert response.status_code == 200
+
+    # committed by another process.
+    with app.app_context():
+        with application.db.engine.begin() as connection:
+            connection.execute(
+                association_tables.scholarships_needed.insert(),
+                needs_id=ids["boolean"],
+                needed_id=ids["grade"])
+
+    response = client.post(
+        f"/api/scholarships/{ids['grade']}/scholarships_needed",
+        json=[ids["needs boolean"]])
+    assert response.status_code == 400
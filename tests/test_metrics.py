@@ -0,0 +1,85 @@
+import pytest
+import sqlalchemy
+
+import app as application
+from app import profiling
+from app.models import user as user_model
+
+
+def test_request_metrics(app, client, user, colleges):
+    """Counts statements per request and aggregates them per endpoint."""
+
+    app.config["SQL_METRICS_HEADERS"] = True
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    response = client.get("/api/colleges")
+    assert response.status_code == 200
+    queries = int(response.headers["X-SQL-Queries"])
+    assert queries > 0
+    assert float(response.headers["X-SQL-Time"]) >= 0
+
+    client.get("/api/colleges")
+
+    response = client.get("/internal/metrics")
+    assert response.status_code == 200
+    endpoints = {
+        item["endpoint"]: item
+        for item in response.get_json()["endpoints"]
+    }
+    stats = endpoints["colleges.get_colleges"]
+    assert stats["requests"] == 2
+    assert stats["queries"] == 2 * queries
+    assert stats["max_queries"] == queries
+    assert 0 < len(stats["slowest"]) <= app.config["SQL_METRICS_SLOWEST"]
+
+    response = client.delete("/internal/metrics")
+    assert response.status_code == 200
+
+    # only the reset request itself is left.
+    with app.test_request_context():
+        assert [item["endpoint"] for item in profiling.get_metrics()] == \
+            ["internal.delete_metrics"]
+
+
+def test_metrics_headers_off(app, client, user):
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    response = client.get("/api/colleges")
+    assert "X-SQL-Queries" not in response.headers
+
+
+def test_metrics_forbidden(app, client):
+    with app.app_context():
+        application.db.session.add(
+            user_model.User(
+                username="basic",
+                email="basic@test.com",
+                password="basic",
+                role="basic"))
+        application.db.session.commit()
+
+    client.post("/auth/login", json={"id": "basic", "password": "basic"})
+
+    response = client.get("/internal/metrics")
+    assert response.status_code == 403
+
+
+def test_query_stats():
+    stats = profiling.QueryStats(size=2)
+
+    for duration in [0.3, 0.1, 0.5, 0.2]:
+        stats.record(f"statement {duration}", duration)
+
+    data = stats.to_dict()
+    assert data["queries"] == 4
+    assert [item["statement"] for item in data["slowest"]] == \
+        ["statement 0.5", "statement 0.3"]
+
+
+def test_failed_statement_timing(app):
+    with app.app_context():
+        with application.db.engine.connect() as connection:
+            with pytest.raises(sqlalchemy.exc.OperationalError):
+                connection.execute("SELECT * FROM missing_table")
+
+            assert "query_start" not in connection.info
@@ -0,0 +1,189 @@
+from urllib import parse
+
+import app as application
+from app.models import major as major_model
+from app.models import scholarship as scholarship_model
+from app.models import scholarship_details as scholarship_details_model
+
+
+def params(url):
+    return dict(parse.parse_qsl(parse.urlsplit(url).query))
+
+
+def test_cursor_pagination(app, client, user):
+    """Walks collection forwards and backwards with cursors."""
+
+    with app.app_context():
+        for name in ["e", "c", "a", "d", "b"]:
+            application.db.session.add(major_model.Major(name=name))
+        application.db.session.commit()
+
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    response = client.get("/api/majors?after=&per_page=2")
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [item["name"] for item in data["items"]] == ["a", "b"]
+    assert data["meta"]["total_items"] is None
+    assert data["links"]["prev"] is None
+
+    response = client.get(data["links"]["next"])
+    data = response.get_json()
+    assert [item["name"] for item in data["items"]] == ["c", "d"]
+
+    response = client.get(data["links"]["next"])
+    data = response.get_json()
+    assert [item["name"] for item in data["items"]] == ["e"]
+    assert data["links"]["next"] is None
+
+    response = client.get(data["links"]["prev"])
+    data = response.get_json()
+    assert [item["name"] for item in data["items"]] == ["c", "d"]
+
+    response = client.get(data["links"]["prev"])
+    data = response.get_json()
+    assert [item["name"] for item in data["items"]] == ["a", "b"]
+    assert data["links"]["prev"] is None
+
+    response = client.get(
+        "/api/majors?after=&per_page=2&include_total=1&search=a")
+    data = response.get_json()
+    assert data["meta"]["total_items"] == 1
+    assert data["meta"]["total_pages"] == 1
+    assert [item["name"] for item in data["items"]] == ["a"]
+    assert data["links"]["self"]["params"]["search"] == "a"
+
+    response = client.get("/api/majors?after=notacursor")
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "invalid cursor"
+
+    response = client.get("/api/majors?page=2&per_page=2")
+    data = response.get_json()
+    assert data["meta"]["page"] == 2
+    assert data["meta"]["total_items"] == 5
+
+
+def test_cursor_pagination_by_id(app, client, user):
+    """Models without CURSOR_KEYS are paginated by id."""
+
+    with app.app_context():
+        for name in ["b", "a", "c"]:
+            application.db.session.add(
+                scholarship_model.Scholarship(
+                    scholarship_details=scholarship_details_model.
+                    ScholarshipDetails(name=name)))
+        application.db.session.commit()
+
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    response = client.get("/api/scholarships?after=&per_page=2")
+    data = response.get_json()
+    assert [item["id"] for item in data["items"]] == [1, 2]
+
+    response = client.get(data["links"]["next"])
+    data = response.get_json()
+    assert [item["id"] for item in data["items"]] == [3]
+    assert params(data["links"]["prev"])["per_page"] == "2"
+
+
+def test_cursor_pagination_null_keys(app, client, user):
+    """Rows with NULL cursor keys are walked first, cursors are checked."""
+    from app import utils
+
+    with app.app_context():
+        for name in ["b", None, "a", None]:
+            application.db.session.add(major_model.Major(name=name))
+        application.db.session.commit()
+
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    pages = []
+    data = client.get("/api/majors?after=&per_page=1").get_json()
+
+    while True:
+        pages.append([item["name"] for item in data["items"]])
+
+        if data["links"]["next"] is None:
+            break
+
+        data = client.get(data["links"]["next"]).get_json()
+
+    assert pages == [[None], [None], ["a"], ["b"]]
+
+    while data["links"]["prev"] is not None:
+        data = client.get(data["links"]["prev"]).get_json()
+        pages.pop()
+        assert [item["name"] for item in data["items"]] == pages[-1]
+
+    assert len(pages) == 1
+
+    for values in [[{"name": "a"}, 1], [["a"], 1]]:
+        response = client.get("/api/majors?after=" +
+                              utils.encode_cursor(values))
+        assert response.status_code == 400
+        assert response.get_json()["message"] == "invalid cursor"
+
+
+def count_selects(app, client, url):
+    """Counts SELECT statements issued while requesting url."""
+    import sqlalchemy
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    with app.app_context():
+        engine = application.db.engine
+
+    sqlalchemy.event.listen(engine, "before_cursor_execute",
+                            before_cursor_execute)
+    try:
+        response = client.get(url)
+    finally:
+        sqlalchemy.event.remove(engine, "before_cursor_execute",
+                                before_cursor_execute)
+
+    assert response.status_code == 200
+    return len(statements)
+
+
+def test_eager_loading(app, client, user):
+    """Page relationships are loaded with the page."""
+    from app.models import college as college_model
+    from app.models import college_details as college_details_model
+
+    with app.app_context():
+        for index in range(10):
+            application.db.session.add(
+                scholarship_model.Scholarship(
+                    scholarship_details=scholarship_details_model.
+                    ScholarshipDetails(name=f"scholarship {index}")))
+            application.db.session.add(
+                college_model.College(
+                    college_details=college_details_model.CollegeDetails(
+                        name=f"college {index}")))
+        application.db.session.commit()
+
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    few = count_selects(app, client, "/api/scholarships?per_page=2")
+    many = count_selects(app, client, "/api/scholarships?per_page=10")
+    assert few == many
+
+    few = count_selects(app, client, "/api/colleges?per_page=2")
+    many = count_selects(app, client, "/api/colleges?per_page=10")
+    assert few == many
+
+    # first search looks up the full text index tokenizer.
+    client.get("/api/scholarships?search=s")
+    few = count_selects(app, client,
+                        "/api/scholarships?after=&per_page=2&search=s")
+    many = count_selects(app, client,
+                         "/api/scholarships?after=&per_page=10&search=s")
+    assert few == many
+
+    response = client.get("/api/scholarships?per_page=10")
+    assert sorted(item["name"] for item in response.get_json()["items"]) == \
+        sorted(f"scholarship {index}" for index in range(10))
@@ -1,4 +1,12 @@
+import sqlalchemy
+
 from app import db
+from app.models.association_tables import ProgramRequirement
+from app.models.location import Location
+from app.models.option import Option
+from app.models.program import Program
+from app.models.qualification_round import QualificationRound
+from app.models.question import Question
 from app.models.scholarship import Scholarship
 from app.models.scholarship_details import ScholarshipDetails
 from app.models.detail import Detail
@@ -216,3 +224,124 @@ def test_scholarships_needed(app, client, auth):
     scholarships_needed = response.get_json()
 
     assert scholarships_needed["meta"]["total_items"] == 0
+
+
+def test_post_scholarships_bulk(app, client, user, colleges):
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    response = client.post(
+        url + "/bulk",
+        json=[{
+            "college_id": 1,
+            "name": "bulk scholarship 0",
+            "amount": "1000",
+            "exclude_from_match": True
+        }, {
+            "college_id": 100,
+            "name": "bulk scholarship 1",
+            "amount": "1000"
+        }, {
+            "college_id": 1,
+            "name": "bulk scholarship 2"
+        }])
+
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert [result["status"] for result in results] == [201, 404, 400]
+
+    with app.app_context():
+        details = ScholarshipDetails.first(name="bulk scholarship 0")
+        assert details.amount == "1000"
+        assert details.scholarship.college_id == 1
+        assert details.scholarship.exclude_from_match
+
+
+def test_get_scholarship_expand(app, client, user):
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    with app.app_context():
+        college = College(college_details=CollegeDetails(name="test college"))
+        scholarship = Scholarship(
+            scholarship_details=ScholarshipDetails(name="test scholarship"),
+            college=college)
+        needed = Scholarship(
+            scholarship_details=ScholarshipDetails(name="needed scholarship"),
+            college=college)
+        question = Question(name="test question")
+        program = Program(name="test program")
+        db.session.add_all([scholarship, needed, question, program])
+        db.session.flush()
+
+        scholarship.scholarships_needed.append(needed)
+        scholarship.chosen_college_requirement.append(question)
+        scholarship.add_boolean_requirement(question, True)
+        scholarship.add_selection_requirement(question)
+        scholarship.create_grade_requirement_group()
+        scholarship.location_requirements.append(
+            Location(state="Texas", blacklist=True))
+        scholarship.programs_requirement.append(
+            ProgramRequirement(program=program))
+        db.session.commit()
+        scholarship_id = scholarship.id
+
+    def add_children():
+        with app.app_context():
+            scholarship = Scholarship.query.get(scholarship_id)
+            requirement = scholarship.selection_requirements.first()
+            program_requirement = scholarship.programs_requirement.first()
+
+            for i in range(3):
+                requirement.options.append(Option(name=f"option {i}"))
+                program_requirement.qualification_rounds.append(
+                    QualificationRound(name=f"round {i}"))
+
+            db.session.commit()
+
+    def count_queries(path):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        sqlalchemy.event.listen(sqlalchemy.engine.Engine,
+                                "before_cursor_execute", before_cursor_execute)
+        try:
+            response = client.get(path)
+        finally:
+            sqlalchemy.event.remove(sqlalchemy.engine.Engine,
+                                    "before_cursor_execute",
+                                    before_cursor_execute)
+
+        return response, len(statements)
+
+    path = url + f"/{scholarship_id}?expand=all"
+    client.get(path)
+    _, queries = count_queries(path)
+    add_children()
+    response, expanded_queries = count_queries(path)
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert expanded_queries == queries
+    assert data["details"]["name"] == "test scholarship"
+    assert data["boolean_requirement"][0]["question_name"] == "test question"
+    assert len(data["selection_requirements"][0]["options"]) == 3
+    assert data["grade_requirement_groups"][0]["grade_requirements"] == []
+    assert data["location_requirements"]["accepted"] == []
+    assert data["location_requirements"]["blacklisted"][0]["state"] == \
+        "Texas"
+    assert len(
+        data["programs_requirement"][0]["qualification_rounds"]) == 3
+    assert data["chosen_college_requirement"][0]["name"] == "test question"
+    assert data["scholarships_needed"][0]["name"] == "needed scholarship"
+
+    response = client.get(
+        url + f"/{scholarship_id}?expand=scholarships_needed")
+    data = response.get_json()
+
+    assert len(data["scholarships_needed"]) == 1
+    assert "boolean_requirement" not in data
+
+    response = client.get(url + f"/{scholarship_id}?expand=unknown")
+
+    assert response.status_code == 400
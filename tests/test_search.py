@@ -0,0 +1,130 @@
+import app as application
+from app import search
+from app.models import college as college_model
+from app.models import college_details as college_details_model
+from app.models import scholarship as scholarship_model
+from app.models import scholarship_details as scholarship_details_model
+
+
+def create_colleges():
+    colleges = [{
+        "name": "university of oregon",
+        "setting": "city"
+    }, {
+        "name": "portland community college",
+        "setting": "urban"
+    }, {
+        "name": "state college",
+        "religious_affiliation": "oregon synod"
+    }]
+
+    for properties in colleges:
+        application.db.session.add(
+            college_model.College(
+                college_details=college_details_model.CollegeDetails(
+                    **properties)))
+
+    application.db.session.commit()
+
+
+def names(response):
+    return [item["name"] for item in response.get_json()["items"]]
+
+
+def test_match_expression():
+    assert search.match_expression("oregon state", "trigram") == \
+        '"oregon" "state"'
+    assert search.match_expression('a"b', "unicode61") == '"a""b"*'
+    assert search.match_expression("or", "trigram") is None
+    assert search.match_expression("  ", "trigram") is None
+
+
+def test_search_colleges(app, client, user):
+    """Searches every indexed field, ranking better matches first."""
+
+    with app.app_context():
+        create_colleges()
+
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    response = client.get("/api/colleges?search=oregon")
+    assert response.status_code == 200
+    assert sorted(names(response)) == ["state college", "university of oregon"]
+
+    response = client.get("/api/colleges?search=college urban")
+    assert names(response) == ["portland community college"]
+
+    # index follows updates and deletes.
+    with app.app_context():
+        details = college_details_model.CollegeDetails.query.filter_by(
+            name="state college").first()
+        details.religious_affiliation = None
+        application.db.session.commit()
+
+    response = client.get("/api/colleges?search=oregon")
+    assert names(response) == ["university of oregon"]
+
+    # too short for the trigram index, falls back to LIKE.
+    response = client.get("/api/colleges?search=po")
+    assert names(response) == ["portland community college"]
+
+
+def test_search_scholarships(app, client, user):
+
+    with app.app_context():
+        for name, description in [("merit award", "for top students"),
+                                  ("need based", "merit not required")]:
+            application.db.session.add(
+                scholarship_model.Scholarship(
+                    scholarship_details=scholarship_details_model.
+                    ScholarshipDetails(name=name, description=description)))
+        application.db.session.commit()
+
+        matches = search.match("scholarship", "merit")
+        assert matches is not None
+        ids = [
+            row.owner_id for row in application.db.session.query(
+                matches.c.owner_id).order_by(matches.c.score)
+        ]
+        assert len(ids) == 2
+
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    response = client.get("/api/scholarships?search=students")
+    assert names(response) == ["merit award"]
+
+
+def test_search_joins_on_owner(app, client, user):
+    """Details are matched through their owner foreign key, not their id."""
+
+    with app.app_context():
+        # shift details ids away from scholarship ids.
+        application.db.session.add(
+            scholarship_details_model.ScholarshipDetails(name="orphan"))
+        application.db.session.commit()
+
+        college = college_model.College(
+            college_details=college_details_model.CollegeDetails(
+                name="college"))
+        scholarships = [
+            scholarship_model.Scholarship(
+                college=college,
+                scholarship_details=scholarship_details_model.
+                ScholarshipDetails(name=name)) for name in ["ab one", "cd two"]
+        ]
+        application.db.session.add_all(scholarships)
+        application.db.session.commit()
+        ids = [scholarship.id for scholarship in scholarships]
+
+    client.post("/auth/login", json={"id": "test", "password": "test"})
+
+    # too short for the trigram index, uses the LIKE filter.
+    response = client.get("/api/scholarships?search=ab")
+    assert names(response) == ["ab one"]
+
+    client.post(
+        f"/api/scholarships/{ids[0]}/scholarships_needed", json=[ids[1]])
+    response = client.get(
+        f"/api/scholarships/{ids[0]}/scholarships_needed?search=cd")
+    assert names(response) == ["cd two"]
+    assert "scholarships_needed" in response.get_json()["links"]["self"]["url"]
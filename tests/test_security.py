@@ -1,9 +1,13 @@
 import app as application
-from app import security, utils
+from app import cli, security, utils
 from app.models import token_blacklist
 from app.models import user as user_model
+from app.security import cache as token_cache
+from app.security import hashing
+import datetime
 import time
 import flask_jwt_extended
+import sqlalchemy
 
 
 def test_token_to_database(app):
@@ -129,4 +133,190 @@ def test_protect_blueprint(app, client):
     url = "/api/colleges/"
     response = client.get(url)
     assert response.status_code == 422
-    assert response.get_json()["message"] == "invalid token"
\ No newline at end of file
+    assert response.get_json()["message"] == "invalid token"
+
+
+def test_is_token_revoked_cached(app, token):
+    """
+    tests revocation states are cached and invalidated on commit
+    """
+    statements = []
+
+    def count(*args):
+        statements.append(args)
+
+    with app.app_context():
+        decoded_token = flask_jwt_extended.decode_token(token)
+        assert security.is_token_revoked(decoded_token) == False
+
+        sqlalchemy.event.listen(application.db.engine,
+                                "before_cursor_execute", count)
+        try:
+            assert security.is_token_revoked(decoded_token) == False
+            assert statements == []
+        finally:
+            sqlalchemy.event.remove(application.db.engine,
+                                    "before_cursor_execute", count)
+
+        token_obj = token_blacklist.TokenBlacklist.query.first()
+        security.revoke_token(token_obj)
+        application.db.session.rollback()
+        assert security.is_token_revoked(decoded_token) == False
+
+        token_obj = token_blacklist.TokenBlacklist.query.first()
+        security.revoke_token(token_obj)
+        application.db.session.commit()
+        assert security.is_token_revoked(decoded_token) == True
+
+
+def test_local_cache():
+    """
+    tests lru eviction and expiration of the local revocation cache
+    """
+    cache = token_cache.LocalCache(maxsize=2, ttl=60)
+    cache.set("a", False)
+    cache.set("b", True)
+    assert cache.get("a") == False
+    cache.set("c", False)
+    assert cache.get("b") is None
+    assert cache.get("a") == False
+    assert cache.get("c") == False
+
+    cache.delete("a")
+    assert cache.get("a") is None
+
+    cache = token_cache.LocalCache(ttl=0)
+    cache.set("a", True)
+    assert cache.get("a") is None
+
+
+def test_redis_cache():
+    """
+    tests shared revocation cache against a redis stand in
+    """
+
+    class Client(object):
+
+        def __init__(self):
+            self.values = {}
+
+        def get(self, key):
+            return self.values.get(key)
+
+        def setex(self, key, ttl, value):
+            self.values[key] = value.encode()
+
+        def delete(self, *keys):
+            for key in keys:
+                self.values.pop(key, None)
+
+    client = Client()
+    cache = token_cache.RedisCache(client)
+    cache.set("a", True)
+    cache.set("b", False)
+    assert client.values["token_revoked:a"] == b"1"
+    assert cache.get("a") == True
+    assert cache.get("b") == False
+    cache.delete("a", "b")
+    assert cache.get("a") is None
+
+
+def add_tokens(expired, valid):
+    now = datetime.datetime.now()
+
+    for i in range(expired + valid):
+        expires = now + datetime.timedelta(
+            hours=-1 if i < expired else 1)
+        application.db.session.add(
+            token_blacklist.TokenBlacklist(
+                jti=f"token {i}", user="test", expires=expires))
+
+    application.db.session.commit()
+
+
+def test_prune_expired_tokens(app):
+    """
+    tests prune_expired_tokens deletes expired tokens in chunks
+    """
+
+    with app.app_context():
+        add_tokens(expired=7, valid=2)
+        assert security.prune_expired_tokens(chunk_size=3) == 7
+        assert token_blacklist.TokenBlacklist.query.count() == 2
+        assert security.prune_expired_tokens(chunk_size=3) == 0
+
+
+def test_prune_command(app):
+    """
+    tests tokens prune command
+    """
+    cli.register(app)
+
+    with app.app_context():
+        add_tokens(expired=3, valid=1)
+
+    result = app.test_cli_runner().invoke(
+        args=["tokens", "prune", "--chunk-size", "2"])
+    assert "3 expired tokens deleted" in result.output
+
+    with app.app_context():
+        assert token_blacklist.TokenBlacklist.query.count() == 1
+
+
+def test_password_hashing(app):
+    """
+    tests password hashes of every method are checked and upgraded
+    """
+    with app.app_context():
+        pbkdf2_hash = hashing.generate_password_hash("secret")
+        assert pbkdf2_hash.startswith("pbkdf2:sha256:150000$")
+        assert hashing.check_password_hash(pbkdf2_hash, "secret")
+        assert not hashing.needs_rehash(pbkdf2_hash)
+
+        app.config["PASSWORD_HASH_METHOD"] = "scrypt"
+        app.config["PASSWORD_HASH_COST"] = 10
+        assert hashing.needs_rehash(pbkdf2_hash)
+        assert hashing.check_password_hash(pbkdf2_hash, "secret")
+
+        scrypt_hash = hashing.generate_password_hash("secret")
+        assert scrypt_hash.startswith("scrypt:10$")
+        assert hashing.check_password_hash(scrypt_hash, "secret")
+        assert not hashing.check_password_hash(scrypt_hash, "wrong")
+        assert not hashing.needs_rehash(scrypt_hash)
+
+        app.config["PASSWORD_HASH_COST"] = 11
+        assert hashing.needs_rehash(scrypt_hash)
+
+
+def test_password_hashing_workers(app):
+    """
+    tests hashes run in the worker pool
+    """
+    app.config["PASSWORD_HASH_WORKERS"] = 1
+
+    with app.app_context():
+        password_hash = hashing.generate_password_hash("secret")
+        assert hashing.check_password_hash(password_hash, "secret")
+        assert "password_hashing" in app.extensions
+
+    app.extensions["password_hashing"].shutdown()
+
+
+def test_login_rehashes_password(app, client, user):
+    """
+    tests login upgrades password hashes made with old parameters
+    """
+    app.config["PASSWORD_HASH_METHOD"] = "scrypt"
+    app.config["PASSWORD_HASH_COST"] = 10
+
+    response = client.post(
+        "/auth/login", json={
+            "id": "test",
+            "password": "test"
+        })
+    assert response.status_code == 200
+
+    with app.app_context():
+        user_obj = user_model.User.query.first()
+        assert user_obj.password_hash.startswith("scrypt:10$")
+        assert user_obj.check_password("test")